@@ -0,0 +1,265 @@
+import copy
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from app.parsers import NDJSONParser
+from app.services import caching, stock
+
+ATOMIC = "atomic"
+PARTIAL = "partial"
+MODES = (ATOMIC, PARTIAL)
+DEFAULT_BULK_MAX_ITEMS = 1000
+
+
+class _Preloaded:
+    """
+    Substitui o queryset de um `PrimaryKeyRelatedField` durante um lote:
+    `get(pk=)` lê de um dicionário carregado com um único `in_bulk`.
+    """
+
+    def __init__(self, model: Any, objects: dict[Any, Any]) -> None:
+        self.model = model
+        self.objects = objects
+
+    def get(self, pk: Any) -> Any:
+        try:
+            key = self.model._meta.pk.to_python(pk)
+        except DjangoValidationError as exc:
+            # O campo relata tipos inválidos a partir de ValueError
+            raise ValueError(pk) from exc
+        try:
+            return self.objects[key]
+        except KeyError:
+            raise self.model.DoesNotExist from None
+
+
+def preload_relations(serializer: Any, items: list[Any]) -> None:
+    """
+    Carrega de uma vez os objetos relacionados citados pelos itens do lote,
+    em vez de uma consulta por item e chave estrangeira na validação.
+    """
+    for name, field in serializer.fields.items():
+        if field.read_only or not isinstance(field, PrimaryKeyRelatedField):
+            continue
+        queryset = field.get_queryset()
+        model = queryset.model
+        keys = set()
+        for item in items:
+            value = item.get(name) if isinstance(item, dict) else None
+            if value is None or isinstance(value, bool):
+                continue
+            try:
+                keys.add(model._meta.pk.to_python(value))
+            except DjangoValidationError:
+                # O próprio campo acusa o valor inválido
+                continue
+        field.queryset = _Preloaded(model, queryset.in_bulk(keys))
+
+
+def _result(index: int, result: str, **extra: Any) -> dict[str, Any]:
+    return {"index": index, "status": result, **extra}
+
+
+class BulkCreateAPIView(generics.GenericAPIView):
+    """
+    Criação em lote. Recebe uma lista (JSON ou NDJSON), valida todos os
+    itens em uma passada e grava os válidos com `bulk_create` e os efeitos
+    de estoque agregados (como na importação), em uma única transação.
+
+    `?mode=atomic` (padrão) não grava nada se algum item falhar e
+    `?mode=partial` grava os válidos. A resposta traz o resultado de cada
+    item, na ordem recebida: 201/200 sem falhas, 207 com falhas parciais,
+    409 se todas as falhas forem de estoque e 400 nos demais casos.
+    """
+
+    parser_classes = (JSONParser, NDJSONParser)
+    pagination_class = None
+    filter_backends = ()
+
+    def get_items(self, request: Any) -> list[Any]:
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError("Envie uma lista de itens (JSON ou NDJSON).")
+        limit = getattr(settings, "API_BULK_MAX_ITEMS", DEFAULT_BULK_MAX_ITEMS)
+        if len(items) > limit:
+            raise ValidationError(f"Máximo de {limit} itens por lote.")
+        return items
+
+    def get_mode(self, request: Any) -> str:
+        mode = request.query_params.get("mode", ATOMIC)
+        if mode not in MODES:
+            raise ValidationError({"mode": f"Use {' ou '.join(MODES)}."})
+        return mode
+
+    def split_accepted(self, objects: list[Any]) -> tuple[list, list]:
+        """
+        Separa os objetos válidos que podem ser gravados dos recusados por
+        regra de negócio (ex: estoque). Chamado dentro da transação.
+        """
+        return objects, []
+
+    def rejection_errors(self, obj: Any) -> dict[str, list[str]]:
+        return {}
+
+    def bulk_response(
+        self,
+        mode: str,
+        results: dict[int, dict],
+        success: str,
+        conflicts: int = 0,
+    ) -> Response:
+        ordered = [results[index] for index in sorted(results)]
+        failed = sum(item["status"] == "error" for item in ordered)
+        succeeded = sum(item["status"] == success for item in ordered)
+        if not failed:
+            code = (
+                status.HTTP_201_CREATED
+                if success == "created"
+                else status.HTTP_200_OK
+            )
+        elif succeeded:
+            code = status.HTTP_207_MULTI_STATUS
+        elif failed == conflicts:
+            code = status.HTTP_409_CONFLICT
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {
+                "mode": mode,
+                success: succeeded,
+                "failed": failed,
+                "results": ordered,
+            },
+            status=code,
+        )
+
+    def post(self, request: Any, *args: Any, **kwargs: Any) -> Response:
+        items = self.get_items(request)
+        mode = self.get_mode(request)
+        model = self.get_queryset().model
+        serializer = self.get_serializer()
+        preload_relations(serializer, items)
+
+        results: dict[int, dict] = {}
+        pending = []
+        for index, item in enumerate(items):
+            try:
+                pending.append((
+                    index,
+                    model(**serializer.run_validation(item)),
+                ))
+            except ValidationError as exc:
+                results[index] = _result(index, "error", errors=exc.detail)
+
+        index_of = {id(obj): index for index, obj in pending}
+        with caching.defer_invalidation(), transaction.atomic():
+            accepted, rejected = self.split_accepted([
+                obj for _, obj in pending
+            ])
+            for obj in rejected:
+                index = index_of[id(obj)]
+                results[index] = _result(
+                    index, "error", errors=self.rejection_errors(obj)
+                )
+            if results and mode == ATOMIC:
+                accepted = []
+            if accepted:
+                model.objects.bulk_create(accepted)
+                stock.apply_bulk_create_effects(model, accepted)
+                caching.invalidate_model(model)
+
+        for obj in accepted:
+            index = index_of[id(obj)]
+            results[index] = _result(index, "created", id=obj.pk)
+        for index, _ in pending:
+            results.setdefault(index, _result(index, "skipped"))
+        return self.bulk_response(mode, results, "created", len(rejected))
+
+
+class BulkUpdateMixin:
+    """
+    Edição em lote via PATCH (itens parciais com `id`), gravada com
+    `bulk_update` e efeitos agregados, com os mesmos modos e formato de
+    resposta da criação em lote.
+    """
+
+    def patch(self, request: Any, *args: Any, **kwargs: Any) -> Response:
+        items = self.get_items(request)
+        mode = self.get_mode(request)
+        model = self.get_queryset().model
+        serializer = self.get_serializer(partial=True)
+        preload_relations(serializer, items)
+
+        results: dict[int, dict] = {}
+        keys = {}
+        for index, item in enumerate(items):
+            try:
+                keys[index] = model._meta.pk.to_python(item["id"])
+            except (TypeError, KeyError, DjangoValidationError):
+                results[index] = _result(
+                    index,
+                    "error",
+                    errors={"id": ["Informe o id do registro."]},
+                )
+
+        with caching.defer_invalidation(), transaction.atomic():
+            instances = (
+                self
+                .get_queryset()
+                .select_for_update()
+                .order_by("pk")
+                .in_bulk(set(keys.values()))
+            )
+            previous = {pk: copy.copy(obj) for pk, obj in instances.items()}
+            updated, fields = [], set()
+            for index, pk in keys.items():
+                instance = instances.get(pk)
+                if instance is None:
+                    results[index] = _result(
+                        index,
+                        "error",
+                        errors={"id": ["Registro não encontrado."]},
+                    )
+                    continue
+                # Um único serializer valida todos os itens (relações
+                # pré-carregadas); só a instância muda entre eles
+                serializer.instance = instance
+                try:
+                    data = serializer.run_validation(items[index])
+                except ValidationError as exc:
+                    results[index] = _result(index, "error", errors=exc.detail)
+                    continue
+                for attr, value in data.items():
+                    setattr(instance, attr, value)
+                fields.update(data)
+                updated.append((index, instance))
+
+            objects = list({id(obj): obj for _, obj in updated}.values())
+            if results and mode == ATOMIC:
+                objects = []
+            if objects and fields:
+                # `bulk_update` não preenche os campos auto_now
+                now = timezone.now()
+                for field in model._meta.concrete_fields:
+                    if getattr(field, "auto_now", False):
+                        fields.add(field.name)
+                        for obj in objects:
+                            setattr(obj, field.attname, now)
+                model.objects.bulk_update(objects, sorted(fields))
+                stock.apply_bulk_update_effects(model, previous, objects)
+                caching.invalidate_model(model)
+
+        for index, obj in updated:
+            results[index] = _result(
+                index, "updated" if objects else "skipped", id=obj.pk
+            )
+        return self.bulk_response(mode, results, "updated")
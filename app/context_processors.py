@@ -0,0 +1,8 @@
+from typing import Any
+
+from app.services import columnar
+
+
+def export_formats(request: Any) -> dict[str, bool]:
+    """Esconde os botões Parquet/Arrow quando falta o pacote `pyarrow`."""
+    return {"columnar_available": columnar.is_available()}
@@ -0,0 +1,231 @@
+from datetime import datetime
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+# Lookups de intervalo para declarar em `filter_fields`
+RANGE_LOOKUPS = ("gt", "gte", "lt", "lte")
+
+
+def requested_fields(request: Any) -> list[str] | None:
+    """
+    Campos pedidos em `?fields=id,title` (sparse fieldset) nas leituras.
+    :return: Lista de nomes ou None quando o parâmetro não foi enviado.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = request.query_params.get(FIELDS_PARAM, "")
+    fields = [name.strip() for name in value.split(",") if name.strip()]
+    return fields or None
+
+
+def expanded_fields(request: Any) -> dict[str, dict]:
+    """
+    Relações pedidas em `?expand=product,product.category` nas leituras,
+    como árvore: `{"product": {"category": {}}}`.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return {}
+    tree: dict[str, dict] = {}
+    for path in request.query_params.get(EXPAND_PARAM, "").split(","):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split("."))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class QueryParamFilter(filters.BaseFilterBackend):
+    """
+    Filtros por query string declarados na view em `filter_fields`:
+    `{"title": ["exact", "icontains"], "created_at": ["gte", "lte"]}`.
+    `?title=x` usa o lookup exact e `?created_at__gte=2026-01-01` o lookup
+    indicado. Os valores são convertidos pelo campo do modelo; lookup não
+    permitido ou valor inválido retornam 400. Parâmetros que não citam um
+    campo declarado (cursor, page_size, ordering, fields...) são ignorados.
+    """
+
+    def _parse(self, field: Any, lookup: str, value: str) -> Any:
+        if field.is_relation:
+            field = field.target_field
+        if lookup == "in":
+            return [
+                self._parse(field, "exact", item)
+                for item in value.split(",")
+                if item
+            ]
+        parsed = field.to_python(value)
+        if isinstance(parsed, datetime) and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def get_filters(
+        self, request: Any, queryset: Any, view: Any
+    ) -> dict[str, Any]:
+        filter_fields = getattr(view, "filter_fields", {})
+        model = queryset.model
+        lookups, errors = {}, {}
+        for param, value in request.query_params.items():
+            name, _, lookup = param.partition("__")
+            if name not in filter_fields:
+                continue
+            lookup = lookup or "exact"
+            if lookup not in filter_fields[name]:
+                allowed = ", ".join(filter_fields[name])
+                errors[param] = f"Filtro não suportado (use: {allowed})."
+                continue
+            try:
+                field = model._meta.get_field(name)
+                lookups[f"{name}__{lookup}"] = self._parse(
+                    field, lookup, value
+                )
+            except (DjangoValidationError, FieldDoesNotExist):
+                errors[param] = f"Valor inválido: {value!r}."
+        if errors:
+            raise ValidationError(errors)
+        return lookups
+
+    def filter_queryset(self, request: Any, queryset: Any, view: Any) -> Any:
+        lookups = self.get_filters(request, queryset, view)
+        return queryset.filter(**lookups) if lookups else queryset
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict]:
+        parameters = []
+        for name, lookups in getattr(view, "filter_fields", {}).items():
+            for lookup in lookups:
+                parameters.append({
+                    "name": name if lookup == "exact" else f"{name}__{lookup}",
+                    "required": False,
+                    "in": "query",
+                    "description": f"Filtro {lookup} em {name}",
+                    "schema": {"type": "string"},
+                })
+        return parameters
+
+
+class OrderingFilter(filters.OrderingFilter):
+    """
+    `?ordering=` restrito aos campos de `ordering_fields` da view (sem a
+    lista, nenhuma ordenação é aceita). A paginação completa a ordenação com
+    o `id` para formar a chave do cursor.
+    """
+
+    def get_valid_fields(
+        self, queryset: Any, view: Any, context: Any = None
+    ) -> list[tuple[str, str]]:
+        return [
+            (field, field) for field in getattr(view, "ordering_fields", ())
+        ]
+
+
+class SparseFieldsetFilter(filters.BaseFilterBackend):
+    """
+    Com `?fields=`, busca no banco apenas as colunas pedidas (mais a chave
+    primária e os campos de ordenação usados pelo cursor). A remoção dos
+    campos da resposta fica a cargo de `FlexFieldsSerializer`.
+    """
+
+    def filter_queryset(self, request: Any, queryset: Any, view: Any) -> Any:
+        fields = requested_fields(request)
+        if not fields:
+            return queryset
+        model = queryset.model
+        concrete = {
+            field.name
+            for field in model._meta.concrete_fields
+            if field.name in fields
+        }
+        if not concrete:
+            return queryset
+        ordering = [
+            field.lstrip("-")
+            for field in [
+                *model._meta.ordering,
+                *getattr(view, "ordering_fields", ()),
+            ]
+        ]
+        return queryset.only(model._meta.pk.name, *concrete, *ordering)
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict]:
+        return [
+            {
+                "name": FIELDS_PARAM,
+                "required": False,
+                "in": "query",
+                "description": "Campos da resposta, separados por vírgula",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class ExpandFilter(filters.BaseFilterBackend):
+    """
+    Com `?expand=`, valida as relações contra os `expandable_fields` dos
+    serializers e as carrega junto da página: `select_related` para
+    cadeias de chaves estrangeiras e `prefetch_related` para o resto. O
+    número de consultas não depende do tamanho da página.
+    """
+
+    def _paths(
+        self, serializer_class: Any, tree: dict, prefix: str = ""
+    ) -> list[str]:
+        paths = []
+        expandable = getattr(serializer_class, "expandable_fields", {})
+        for name, subtree in tree.items():
+            if name not in expandable:
+                raise ValidationError({
+                    EXPAND_PARAM: f"Campo não expansível: {prefix}{name}."
+                })
+            path = f"{prefix}{name}"
+            paths.append(path.replace(".", "__"))
+            paths += self._paths(expandable[name], subtree, f"{path}.")
+        return paths
+
+    @staticmethod
+    def _is_single(model: Any, path: str) -> bool:
+        for name in path.split("__"):
+            field = model._meta.get_field(name)
+            if not (field.many_to_one or field.one_to_one):
+                return False
+            model = field.related_model
+        return True
+
+    def filter_queryset(self, request: Any, queryset: Any, view: Any) -> Any:
+        paths = self._paths(
+            view.get_serializer_class(), expanded_fields(request)
+        )
+        fields = requested_fields(request)
+        if fields:
+            # Relações fora do sparse fieldset não aparecem na resposta
+            paths = [path for path in paths if path.split("__")[0] in fields]
+        if not paths:
+            return queryset
+        single = [
+            path for path in paths if self._is_single(queryset.model, path)
+        ]
+        many = [path for path in paths if path not in single]
+        if single:
+            queryset = queryset.select_related(*single)
+        if many:
+            queryset = queryset.prefetch_related(*many)
+        return queryset
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict]:
+        return [
+            {
+                "name": EXPAND_PARAM,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Relações incluídas na resposta, separadas por vírgula "
+                    "(ex: product,product.category)"
+                ),
+                "schema": {"type": "string"},
+            }
+        ]
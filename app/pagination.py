@@ -0,0 +1,157 @@
+import json
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import remove_query_param
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGE_SIZE = 500
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Paginação por chave (keyset) das APIs de listagem.
+
+    A página seguinte é buscada com `WHERE (chave) > (última chave)` sobre
+    a ordenação do modelo completada pelo `id` (ex: `(title, id)`,
+    `(-created_at, -id)`), que é única e coberta por um índice. Ao
+    contrário do OFFSET, o custo de cada página não cresce com a posição na
+    tabela. O cursor guarda todos os valores da chave, então empates no
+    primeiro campo não dependem de deslocamentos.
+    """
+
+    page_size_query_param = "page_size"
+    ordering = ("-id",)
+
+    def __init__(self) -> None:
+        self.page_size = getattr(settings, "API_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+        self.max_page_size = getattr(
+            settings, "API_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE
+        )
+
+    def get_ordering(self, request: Any, queryset: Any, view: Any) -> tuple:
+        """
+        Ordenação do filtro de ordenação da view, se houver, ou a do modelo;
+        sempre terminada pelo `id` (no sentido do primeiro campo) para que a
+        chave seja única.
+        """
+        model_ordering = queryset.model._meta.ordering
+        if model_ordering:
+            self.ordering = tuple(model_ordering)
+        ordering = tuple(
+            "-id" if field == "-pk" else "id" if field == "pk" else field
+            for field in super().get_ordering(request, queryset, view)
+        )
+        if not {"id", "-id"} & set(ordering):
+            descending = ordering[0].startswith("-")
+            ordering = (*ordering, "-id" if descending else "id")
+        return ordering
+
+    @staticmethod
+    def _after(ordering: tuple, values: list[Any]) -> Q:
+        """
+        Linhas posteriores à chave `values` na `ordering`, expandindo a
+        comparação de tuplas: `a > x OR (a = x AND b > y) OR ...`.
+
+        O limite isolado `a >= x` combinado com AND é redundante, mas dá ao
+        PostgreSQL o início do intervalo no índice `(a, id)`; só com o OR ele
+        percorre o índice desde o começo.
+        """
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                f.lstrip("-"): value
+                for f, value in zip(ordering[:index], values, strict=False)
+            }
+            condition |= Q(**equal, **{f"{name}__{lookup}": values[index]})
+        if len(ordering) > 1:
+            leading = ordering[0]
+            lookup = "lte" if leading.startswith("-") else "gte"
+            condition = (
+                Q(**{f"{leading.lstrip('-')}__{lookup}": values[0]})
+                & condition
+            )
+        return condition
+
+    @staticmethod
+    def _reversed(ordering: tuple) -> tuple:
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in ordering
+        )
+
+    def _position(self, instance: Any) -> str:
+        values = [
+            getattr(instance, field.lstrip("-")) for field in self.ordering
+        ]
+        # isoformat preserva os microssegundos (o DjangoJSONEncoder os
+        # trunca, o que faria a chave pular ou repetir linhas)
+        return json.dumps(
+            values,
+            default=lambda value: (
+                value.isoformat()
+                if hasattr(value, "isoformat")
+                else str(value)
+            ),
+        )
+
+    def _filter_after(self, queryset: Any, ordering: tuple) -> Any:
+        try:
+            values = json.loads(self.cursor.position)
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            return queryset.filter(self._after(ordering, values))
+        except (TypeError, ValueError, ValidationError) as exc:
+            # Cursor adulterado ou de outra ordenação
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def paginate_queryset(
+        self, queryset: Any, request: Any, view: Any = None
+    ) -> list[Any] | None:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        ordering = self._reversed(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = self._filter_after(queryset, ordering)
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_previous = self.cursor is not None
+            self.has_next = has_more
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Voltou além do início: a próxima página é a primeira
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        position = self._position(self.page[-1])
+        return self.encode_cursor(Cursor(0, False, position))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        position = self._position(self.page[0])
+        return self.encode_cursor(Cursor(0, True, position))
@@ -0,0 +1,31 @@
+import json
+from typing import Any
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """Corpo NDJSON (um objeto JSON por linha), lido como uma lista."""
+
+    media_type = "application/x-ndjson"
+
+    def parse(
+        self,
+        stream: Any,
+        media_type: str | None = None,
+        parser_context: dict | None = None,
+    ) -> list[Any]:
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        items = []
+        for number, line in enumerate(stream, start=1):
+            line = line.decode(encoding).strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(
+                    f"NDJSON inválido na linha {number}: {exc}"
+                ) from exc
+        return items
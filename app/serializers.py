@@ -0,0 +1,46 @@
+from typing import Any
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+from app.filters import FIELDS_PARAM, expanded_fields, requested_fields
+
+
+class FlexFieldsSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer que molda a resposta das leituras pela query string:
+    `?fields=id,title` devolve apenas os campos pedidos (campo desconhecido
+    retorna 400) e `?expand=product,product.category` troca o id das
+    chaves estrangeiras de `expandable_fields` pelo objeto serializado.
+    """
+
+    # Chave estrangeira -> serializer usado quando ela é expandida
+    expandable_fields: dict[str, type[serializers.Serializer]] = {}
+
+    def __init__(
+        self, *args: Any, expand: dict | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        # Serializers aninhados recebem a sua parte da árvore do `expand`
+        nested = expand is not None
+        request = self.context.get("request")
+        if not nested:
+            expand = expanded_fields(request)
+        for name, subtree in expand.items():
+            if name in self.expandable_fields:
+                self.fields[name] = self.expandable_fields[name](
+                    read_only=True, expand=subtree
+                )
+
+        fields = None if nested else requested_fields(request)
+        if not fields:
+            return
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise ValidationError({
+                FIELDS_PARAM: (
+                    f"Campos desconhecidos: {', '.join(sorted(unknown))}."
+                )
+            })
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
@@ -0,0 +1,93 @@
+import hashlib
+import json
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+
+from app.services.export_data import DataExportService, export_select_related
+from notifications.models import TaskNotification
+
+# Quantos artefatos com a mesma impressão digital verificar no storage
+# antes de desistir de reaproveitar (arquivos podem ter sido removidos).
+REUSE_CANDIDATES = 3
+
+
+def export_tables(model: Any) -> list[Any]:
+    """
+    Modelos cujos dados aparecem na exportação de `model`: ele mesmo e os
+    alcançados pelos joins (o `__str__` das relações é exportado).
+    """
+    tables = [model]
+    for path in export_select_related(model):
+        related = model
+        for name in path.split("__"):
+            related = related._meta.get_field(name).related_model
+        if related not in tables:
+            tables.append(related)
+    return tables
+
+
+def table_version(model: Any) -> list[Any]:
+    """
+    Versão do conteúdo de uma tabela: (linhas, maior pk, última alteração).
+    Inserções mudam a contagem e o maior pk, exclusões a contagem e
+    edições o `updated_at` (inclusive os `UPDATE`s de estoque, que o
+    atualizam explicitamente).
+    """
+    aggregates = {"rows": Count("pk"), "last_pk": Max("pk")}
+    field_names = {field.name for field in model._meta.fields}
+    if "updated_at" in field_names:
+        aggregates["last_update"] = Max("updated_at")
+    totals = model._default_manager.order_by().aggregate(**aggregates)
+    return [totals.get(key) for key in ("rows", "last_pk", "last_update")]
+
+
+def export_fingerprint(model: Any, file_format: str, codec: str = "") -> str:
+    """
+    Impressão digital de uma exportação: (modelo, formato, compressão,
+    colunas e versão de cada tabela envolvida). Duas exportações com a
+    mesma impressão digital produzem o mesmo arquivo.
+    """
+    payload = {
+        "model": model._meta.label,
+        "format": file_format,
+        "codec": codec,
+        "fields": [
+            field.name
+            for field in DataExportService._export_fields(
+                model._default_manager.none()
+            )
+        ],
+        "tables": {
+            table._meta.label: table_version(table)
+            for table in export_tables(model)
+        },
+    }
+    encoded = json.dumps(payload, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def find_reusable_export(
+    fingerprint: str, exclude_pk: Any = None
+) -> TaskNotification | None:
+    """
+    Exportação concluída com a mesma impressão digital cujo arquivo ainda
+    existe no storage.
+    """
+    candidates = (
+        TaskNotification.objects
+        .filter(
+            task_type="export",
+            status="completed",
+            fingerprint=fingerprint,
+        )
+        .exclude(file_path="")
+        .exclude(file_path__isnull=True)
+        .exclude(pk=exclude_pk)
+        .order_by("-completed_at")[:REUSE_CANDIDATES]
+    )
+    for candidate in candidates:
+        if candidate.file_path.storage.exists(candidate.file_path.name):
+            return candidate
+    return None
@@ -0,0 +1,195 @@
+import random
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Tempo (s) em que um valor é considerado fresco.
+DEFAULT_TTL = 60 * 5
+# Janela extra (s) em que um valor vencido ainda é servido enquanto um
+# único processo o recalcula (stale-while-revalidate).
+STALE_TTL = 60 * 10
+# Variação aleatória aplicada ao TTL para que as chaves não expirem juntas.
+TTL_JITTER = 0.1
+# Duração máxima do lock de recálculo (s), caso o processo dono morra.
+LOCK_TIMEOUT = 60
+# Quanto tempo (s) esperar pelo recálculo de outro processo em um miss.
+WAIT_TIMEOUT = 5
+WAIT_INTERVAL = 0.05
+
+# Namespaces de cache afetados por escritas em cada modelo. Cada namespace
+# tem uma versão que faz parte das suas chaves; incrementá-la invalida
+# todas as chaves do namespace em O(1), sem tocar em chaves de terceiros.
+METRICS_INVENTORY = "metrics.inventory"
+METRICS_SALES = "metrics.sales"
+METRICS_CATALOG = "metrics.catalog"
+MODEL_NAMESPACES: dict[str, tuple[str, ...]] = {
+    "brands.Brand": ("brands", METRICS_CATALOG),
+    "categories.Category": ("categories", METRICS_CATALOG),
+    "product_models.ProductModel": (METRICS_CATALOG,),
+    "products.Product": (METRICS_INVENTORY, METRICS_CATALOG),
+    "inflows.Inflows": (METRICS_INVENTORY,),
+    "outflows.Outflows": (METRICS_INVENTORY, METRICS_SALES),
+}
+
+_deferred = threading.local()
+
+
+def jittered(ttl: int) -> int:
+    """Aplica a variação aleatória de `TTL_JITTER` ao TTL."""
+    return max(1, round(ttl * random.uniform(1 - TTL_JITTER, 1 + TTL_JITTER)))
+
+
+def _version_key(namespace: str) -> str:
+    return f"ns:{namespace}"
+
+
+def namespace_version(namespace: str) -> int:
+    """Retorna a versão atual do namespace, inicializando-a se preciso."""
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        # Inicializa com o relógio (ms) e não com 1: se a chave de versão
+        # for despejada do cache, a nova versão nunca colide com uma antiga.
+        cache.add(_version_key(namespace), time.time_ns() // 1_000_000, None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def namespaced_key(namespace: str, key: str) -> str:
+    """Monta a chave versionada `<namespace>:v<versão>:<key>`."""
+    return f"{namespace}:v{namespace_version(namespace)}:{key}"
+
+
+def bump_namespaces(*namespaces: str) -> None:
+    """
+    Invalida os namespaces incrementando suas versões.
+
+    Dentro de uma transação, o incremento fica para o commit: antes dele,
+    uma leitura recalcularia a partir dos dados antigos e gravaria o
+    resultado já sob a versão nova. Como os callbacks de commit rodam na
+    ordem de registro, os incrementos dos consolidados (`rollups`),
+    registrados antes pelos mesmos signals, já foram aplicados.
+    """
+    pending = getattr(_deferred, "namespaces", None)
+    if pending is not None:
+        pending.update(namespaces)
+        return
+
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(_bump, namespaces))
+    else:
+        _bump(namespaces)
+
+
+def _bump(namespaces: tuple[str, ...]) -> None:
+    for namespace in namespaces:
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            # Versão ainda não existe (ou foi despejada)
+            namespace_version(namespace)
+
+
+def invalidate_model(model: Any) -> None:
+    """Invalida os namespaces afetados por escritas em `model`."""
+    bump_namespaces(*MODEL_NAMESPACES.get(model._meta.label, ()))
+
+
+@contextmanager
+def defer_invalidation() -> Iterator[None]:
+    """
+    Agrupa as invalidações feitas dentro do bloco e aplica cada namespace
+    uma única vez na saída (útil para importações com milhares de linhas).
+    """
+    if getattr(_deferred, "namespaces", None) is not None:
+        yield
+        return
+
+    _deferred.namespaces = set()
+    try:
+        yield
+    finally:
+        namespaces = _deferred.namespaces
+        _deferred.namespaces = None
+        bump_namespaces(*namespaces)
+
+
+def set_cached(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+    """
+    Grava `value` no envelope usado por `get_or_compute`.
+
+    O envelope guarda o instante até o qual o valor é fresco, o que permite
+    servir valores vencidos e armazenar resultados falsy (ex: `{}`).
+    """
+    fresh_ttl = jittered(ttl)
+    cache.set(
+        key,
+        {"value": value, "fresh_until": time.time() + fresh_ttl},
+        fresh_ttl + STALE_TTL,
+    )
+
+
+def _acquire_lock(key: str) -> str | None:
+    token = uuid.uuid4().hex
+    if cache.add(f"lock:{key}", token, LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def _release_lock(key: str, token: str) -> None:
+    # Só remove o lock se ainda for o dono (ele pode ter expirado)
+    if cache.get(f"lock:{key}") == token:
+        cache.delete(f"lock:{key}")
+
+
+def _recompute(key: str, compute: Callable[[], Any], ttl: int) -> Any:
+    value = compute()
+    set_cached(key, value, ttl)
+    return value
+
+
+def get_or_compute(
+    key: str, compute: Callable[[], Any], ttl: int = DEFAULT_TTL
+) -> Any:
+    """
+    Cache read-through com recálculo single-flight.
+
+    - Hit fresco: retorna o valor do cache.
+    - Hit vencido: um único processo recalcula (lock distribuído via
+      `cache.add`); os demais recebem o valor vencido sem esperar.
+    - Miss: um único processo recalcula; os demais aguardam o resultado
+      por até `WAIT_TIMEOUT` segundos antes de calcular por conta própria.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry["fresh_until"] > time.time():
+        return entry["value"]
+
+    token = _acquire_lock(key)
+    if token:
+        try:
+            # Outro processo pode ter terminado o recálculo antes do lock
+            current = cache.get(key)
+            if current is not None and current["fresh_until"] > time.time():
+                return current["value"]
+            return _recompute(key, compute, ttl)
+        finally:
+            _release_lock(key, token)
+
+    if entry is not None:
+        return entry["value"]
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["value"]
+
+    # O dono do lock demorou demais (ou morreu): calcula sem gravar
+    return compute()
@@ -0,0 +1,156 @@
+from collections.abc import Iterable, Iterator
+from functools import cache
+from itertools import islice
+from typing import Any
+
+# Formatos colunares; o Arrow usa o formato de arquivo IPC (`.arrow`).
+# Dependem do `pyarrow`, opcional (`uv sync --extra columnar`): sem ele só
+# esses formatos falham, com uma mensagem clara.
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+INTEGER_FIELDS = (
+    "AutoField",
+    "BigAutoField",
+    "SmallAutoField",
+    "IntegerField",
+    "BigIntegerField",
+    "SmallIntegerField",
+    "PositiveIntegerField",
+    "PositiveBigIntegerField",
+    "PositiveSmallIntegerField",
+)
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ValueError(
+            "Os formatos Parquet/Arrow requerem o pacote 'pyarrow'."
+        ) from e
+    return pyarrow
+
+
+@cache
+def is_available() -> bool:
+    """Indica se o `pyarrow` pode ser importado (botões e validações)."""
+    try:
+        _pyarrow()
+    except ValueError:
+        return False
+    return True
+
+
+def arrow_type(field: Any) -> Any:
+    """
+    Tipo Arrow de um campo do modelo. Relações são exportadas como texto
+    (o `__str__` do objeto), como nos demais formatos.
+    """
+    pa = _pyarrow()
+    internal_type = field.get_internal_type()
+    if field.is_relation:
+        return pa.string()
+    if internal_type in INTEGER_FIELDS:
+        return pa.int64()
+    if internal_type == "DecimalField":
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if internal_type == "DateTimeField":
+        return pa.timestamp("us", tz="UTC")
+    if internal_type == "DateField":
+        return pa.date32()
+    if internal_type == "TimeField":
+        return pa.time64("us")
+    if internal_type == "BooleanField":
+        return pa.bool_()
+    if internal_type == "FloatField":
+        return pa.float64()
+    return pa.string()
+
+
+def arrow_schema(fields: list[Any]) -> Any:
+    pa = _pyarrow()
+    return pa.schema([
+        pa.field(field.name, arrow_type(field), nullable=field.null)
+        for field in fields
+    ])
+
+
+def _to_arrow_value(value: Any, is_string: bool) -> Any:
+    if value is None or not is_string:
+        return value
+    # Arquivos/imagens e demais objetos: mesmo texto do CSV
+    return str(value)
+
+
+def write_batches(
+    rows: Iterable[dict[str, Any]],
+    fields: list[Any],
+    file: Any,
+    file_format: str,
+    batch_size: int,
+) -> int:
+    """
+    Grava `rows` em `file` (binário) como Parquet ou Arrow IPC, um lote de
+    `batch_size` linhas por vez, com colunas tipadas pelo modelo.
+    :return: Número de linhas gravadas.
+    """
+    pa = _pyarrow()
+    schema = arrow_schema(fields)
+    strings = {
+        field.name: pa.types.is_string(schema.field(field.name).type)
+        for field in fields
+    }
+
+    if file_format == "parquet":
+        writer = pa.parquet.ParquetWriter(file, schema)
+    elif file_format == "arrow":
+        writer = pa.ipc.new_file(file, schema)
+    else:
+        raise ValueError(f"Formato não suportado: {file_format}")
+
+    count = 0
+    rows = iter(rows)
+    try:
+        while batch := list(islice(rows, batch_size)):
+            writer.write_batch(
+                pa.RecordBatch.from_pylist(
+                    [
+                        {
+                            name: _to_arrow_value(value, strings[name])
+                            for name, value in row.items()
+                        }
+                        for row in batch
+                    ],
+                    schema=schema,
+                )
+            )
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def iter_records(
+    file: Any, file_format: str, batch_size: int
+) -> Iterator[dict[str, Any]]:
+    """
+    Lê um arquivo Parquet/Arrow lote a lote, gerando um dicionário por
+    linha com os tipos Python das colunas (Decimal, datetime...).
+    """
+    pa = _pyarrow()
+    if file_format == "parquet":
+        batches = pa.parquet.ParquetFile(file).iter_batches(
+            batch_size=batch_size
+        )
+    elif file_format == "arrow":
+        reader = pa.ipc.open_file(file)
+        batches = (
+            reader.get_batch(i) for i in range(reader.num_record_batches)
+        )
+    else:
+        raise ValueError(f"Formato não suportado: {file_format}")
+
+    for batch in batches:
+        yield from batch.to_pylist()
@@ -0,0 +1,96 @@
+import gzip
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any, BinaryIO
+
+from django.conf import settings
+
+# Codecs aceitos em `settings.EXPORT_COMPRESSION` e o sufixo do arquivo. O
+# nome do codec é também o valor do cabeçalho `Content-Encoding`.
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+DEFAULT_CODEC = "gzip"
+# Formatos de texto comprimidos na gravação; Parquet/Arrow e PDF já são
+# comprimidos internamente.
+COMPRESSIBLE_FORMATS = ("csv", "ndjson", "json", "xml")
+
+logger = logging.getLogger(__name__)
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def export_codec(file_format: str) -> str:
+    """
+    Codec usado ao gravar exportações em `file_format` ("" = sem
+    compressão). Sem o pacote opcional `zstandard`, "zstd" recorre ao gzip.
+    """
+    if file_format not in COMPRESSIBLE_FORMATS:
+        return ""
+    codec = getattr(settings, "EXPORT_COMPRESSION", DEFAULT_CODEC)
+    if codec == "zstd" and _zstandard() is None:
+        logger.warning("zstandard não instalado; usando gzip nas exportações")
+        return "gzip"
+    if codec and codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Compressão não suportada: {codec}")
+    return codec
+
+
+def suffix(codec: str) -> str:
+    return CODEC_SUFFIXES.get(codec, "")
+
+
+@contextmanager
+def open_writer(file: BinaryIO, codec: str) -> Iterator[BinaryIO]:
+    """
+    Envolve `file` (binário) em um stream que comprime o que for gravado.
+    O arquivo subjacente não é fechado na saída.
+    """
+    if not codec:
+        with nullcontext(file) as raw:
+            yield raw
+    elif codec == "gzip":
+        with gzip.GzipFile(fileobj=file, mode="wb") as stream:
+            yield stream
+    elif codec == "zstd":
+        compressor = _zstandard().ZstdCompressor()
+        with compressor.stream_writer(file, closefd=False) as stream:
+            yield stream
+    else:
+        raise ValueError(f"Compressão não suportada: {codec}")
+
+
+def compress_bytes(content: bytes, codec: str) -> bytes:
+    """Comprime um conteúdo já em memória (exportações JSON/XML)."""
+    if not codec:
+        return content
+    if codec == "gzip":
+        return gzip.compress(content)
+    if codec == "zstd":
+        return _zstandard().ZstdCompressor().compress(content)
+    raise ValueError(f"Compressão não suportada: {codec}")
+
+
+def open_reader(file: BinaryIO, codec: str) -> BinaryIO:
+    """Stream que descomprime `file` durante a leitura."""
+    if not codec:
+        return file
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=file, mode="rb")
+    if codec == "zstd":
+        return _zstandard().ZstdDecompressor().stream_reader(file)
+    raise ValueError(f"Compressão não suportada: {codec}")
+
+
+def accepts(accept_encoding: str, codec: str) -> bool:
+    """Indica se o cabeçalho `Accept-Encoding` do cliente aceita `codec`."""
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() in (codec, "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
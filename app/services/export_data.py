@@ -1,37 +1,249 @@
+import csv
+import io
+import json
+import tempfile
+from collections.abc import Iterator
+from functools import cache
+from itertools import islice
 from typing import Any
 
 import pandas as pd
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpResponse
 from django.template.loader import render_to_string
+from pypdf import PdfWriter
 from weasyprint import HTML
 
+from app.services import columnar, compression
+
+# Linhas lidas do banco por vez nas exportações em streaming.
+EXPORT_CHUNK_SIZE = 2000
+# Formatos gravados linha a linha, sem montar um DataFrame.
+STREAMING_FORMATS = ("csv", "ndjson")
+# Formatos gravados direto no storage (em streaming, em lotes colunares ou
+# em seções de PDF).
+STORAGE_FORMATS = (*STREAMING_FORMATS, *columnar.COLUMNAR_FORMATS, "pdf")
+
+PDF_TEMPLATE = "generic_list_pdf.html"
+# Linhas por seção do PDF (cada seção é renderizada separadamente).
+PDF_SECTION_ROWS = 500
+# Limite padrão de linhas de uma exportação em PDF.
+DEFAULT_PDF_MAX_ROWS = 20_000
+
+
+class ExportRowLimitError(ValueError):
+    """A exportação excede o limite de linhas do formato."""
+
+
+class _RelationProbe:
+    """
+    Objeto colocado no cache de relações de uma instância de teste para
+    descobrir, sem consultar o banco, quais relações o `__str__` usa.
+    """
+
+    def __init__(self) -> None:
+        self.used = False
+
+    def _use(self) -> str:
+        self.used = True
+        return ""
+
+    def __str__(self) -> str:
+        return self._use()
+
+    def __format__(self, format_spec: str) -> str:
+        return self._use()
+
+    def __getattr__(self, name: str) -> Any:
+        self._use()
+        return self
+
+
+@cache
+def str_dependencies(model: Any) -> tuple[str, ...]:
+    """
+    Caminhos de relações (`brand`, `product__category`...) lidos pelo
+    `__str__` do modelo, descobertos chamando-o em uma instância em memória
+    cujas relações são substituídas por sondas.
+    """
+    instance = model()
+    probes = {}
+    for field in model._meta.fields:
+        if field.is_relation and field.many_to_one:
+            probes[field.name] = _RelationProbe()
+            field.set_cached_value(instance, probes[field.name])
+
+    try:
+        str(instance)
+    except Exception:
+        # Usa as relações acessadas até a falha
+        pass
+
+    paths = []
+    for name, probe in probes.items():
+        if probe.used:
+            related_model = model._meta.get_field(name).related_model
+            paths.append(name)
+            paths.extend(
+                f"{name}__{path}" for path in str_dependencies(related_model)
+            )
+    return tuple(paths)
+
+
+@cache
+def export_select_related(model: Any) -> tuple[str, ...]:
+    """
+    Joins necessários para exportar `model` sem N+1: cada FK (exportada
+    como `__str__`) mais as relações que o `__str__` do alvo usa.
+    """
+    paths = []
+    for field in model._meta.fields:
+        if field.is_relation and field.many_to_one:
+            paths.append(field.name)
+            paths.extend(
+                f"{field.name}__{path}"
+                for path in str_dependencies(field.related_model)
+            )
+    return tuple(paths)
+
 
 class DataExportService:
     @staticmethod
-    def _prepare_data(queryset: Any) -> Any:
-        """Prepara os dados do queryset, convertendo relações para strings."""
-        data = []
-        for obj in queryset:
+    def _export_fields(queryset: Any) -> list[Any]:
+        return list(queryset.model._meta.fields)
+
+    @staticmethod
+    def iter_rows(
+        queryset: Any, chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Gera as linhas da exportação (relações como `__str__`) lendo o
+        queryset em blocos, sem carregar a tabela inteira em memória.
+        """
+        fields = DataExportService._export_fields(queryset)
+        rows = queryset.select_related(
+            *export_select_related(queryset.model)
+        ).iterator(chunk_size=chunk_size)
+        for obj in rows:
             item = {}
-            for field in obj._meta.fields:
+            for field in fields:
                 value = getattr(obj, field.name)
-                # Se for uma relação (ForeignKey),
-                # usa a representação em string (__str__)
                 if field.is_relation and value:
                     item[field.name] = str(value)
                 else:
                     item[field.name] = value
-            data.append(item)
-        return pd.DataFrame(data)
+            yield item
+
+    @staticmethod
+    def write_csv(
+        queryset: Any,
+        file: Any,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        header: bool = True,
+    ) -> int:
+        """Grava o queryset como CSV em `file`, linha a linha."""
+        writer = csv.writer(file)
+        if header:
+            writer.writerow(
+                field.name
+                for field in DataExportService._export_fields(queryset)
+            )
+        count = 0
+        for row in DataExportService.iter_rows(queryset, chunk_size):
+            writer.writerow(row.values())
+            count += 1
+        return count
+
+    @staticmethod
+    def write_ndjson(
+        queryset: Any, file: Any, chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> int:
+        """Grava o queryset como NDJSON (um objeto JSON por linha)."""
+        count = 0
+        for row in DataExportService.iter_rows(queryset, chunk_size):
+            file.write(
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+            )
+            file.write("\n")
+            count += 1
+        return count
+
+    @staticmethod
+    def write_columnar(
+        queryset: Any,
+        file: Any,
+        file_format: str,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Grava o queryset como Parquet ou Arrow IPC em `file` (binário), um
+        lote por bloco lido, com colunas tipadas (decimal128, timestamp
+        UTC...).
+        """
+        return columnar.write_batches(
+            DataExportService.iter_rows(queryset, chunk_size),
+            DataExportService._export_fields(queryset),
+            file,
+            file_format,
+            chunk_size,
+        )
+
+    @staticmethod
+    def export_to_storage(
+        queryset: Any,
+        file_format: str,
+        file_field: Any,
+        name: str,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        codec: str = "",
+    ) -> int:
+        """
+        Exporta em streaming para um arquivo temporário em disco e o salva
+        no storage de `file_field` (copiado em blocos). A memória usada
+        não depende do número de linhas.
+        :param codec: Compressão aplicada na gravação ("gzip", "zstd").
+        :return: Número de registros exportados.
+        """
+        writers = {
+            "csv": DataExportService.write_csv,
+            "ndjson": DataExportService.write_ndjson,
+        }
+        if file_format not in STORAGE_FORMATS:
+            raise ValueError(f"Formato não suportado: {file_format}")
+
+        with tempfile.TemporaryFile() as tmp:
+            with compression.open_writer(tmp, codec) as stream:
+                if file_format in columnar.COLUMNAR_FORMATS:
+                    count = DataExportService.write_columnar(
+                        queryset, stream, file_format, chunk_size
+                    )
+                elif file_format == "pdf":
+                    count = DataExportService.write_pdf(queryset, stream)
+                else:
+                    text = io.TextIOWrapper(
+                        stream, encoding="utf-8", newline=""
+                    )
+                    count = writers[file_format](queryset, text, chunk_size)
+                    text.flush()
+                    text.detach()
+            tmp.seek(0)
+            file_field.save(name, File(tmp), save=False)
+        return count
+
+    @staticmethod
+    def _prepare_data(queryset: Any) -> Any:
+        """Prepara os dados do queryset, convertendo relações para strings."""
+        return pd.DataFrame(list(DataExportService.iter_rows(queryset)))
 
     @staticmethod
     def export_to_csv(queryset: Any, filename: str) -> Any:
-        df = DataExportService._prepare_data(queryset)
         response = HttpResponse(content_type="text/csv")
         response["Content-Disposition"] = (
             f'attachment; filename="{filename}.csv"'  # noqa: E501
         )
-        df.to_csv(path_or_buf=response, index=False)
+        DataExportService.write_csv(queryset, response)
         return response
 
     @staticmethod
@@ -71,6 +283,85 @@ class DataExportService:
             )
         return response
 
+    @staticmethod
+    def _pdf_sections(
+        queryset: Any,
+        template_name: str,
+        context: dict[str, Any],
+        section_rows: int,
+    ) -> Iterator[bytes]:
+        """
+        Renderiza o PDF em seções de `section_rows` linhas: cada seção é um
+        HTML pequeno com layout próprio, em vez de um único documento com a
+        tabela inteira. Cada uma é devolvida já como PDF, de modo que o
+        layout do WeasyPrint (a parte cara em memória) existe para uma seção
+        por vez.
+        """
+        headers = [
+            field.name for field in DataExportService._export_fields(queryset)
+        ]
+        rows = DataExportService.iter_rows(queryset, section_rows)
+        section = list(islice(rows, section_rows))
+        first = True
+        while True:
+            following = list(islice(rows, section_rows))
+            html_string = render_to_string(
+                template_name,
+                {
+                    **context,
+                    "headers": headers,
+                    "rows": [list(row.values()) for row in section],
+                    "first_section": first,
+                    "last_section": not following,
+                },
+            )
+            yield HTML(string=html_string).write_pdf()
+            if not following:
+                return
+            section, first = following, False
+
+    @staticmethod
+    def write_pdf(
+        queryset: Any,
+        file: Any,
+        template_name: str = PDF_TEMPLATE,
+        context: dict[str, Any] | None = None,
+        section_rows: int = PDF_SECTION_ROWS,
+        max_rows: int | None = None,
+    ) -> int:
+        """
+        Gera o PDF por seções e grava em `file` (binário) um único
+        documento com as páginas de todas elas, juntando as seções à medida
+        que são renderizadas.
+        :raises ExportRowLimitError: Se o queryset tiver mais linhas que o
+        limite (`settings.PDF_EXPORT_MAX_ROWS`), antes de renderizar.
+        :return: Número de registros exportados.
+        """
+        if max_rows is None:
+            max_rows = getattr(
+                settings, "PDF_EXPORT_MAX_ROWS", DEFAULT_PDF_MAX_ROWS
+            )
+        count = queryset.count()
+        if count > max_rows:
+            raise ExportRowLimitError(
+                f"A exportação em PDF é limitada a {max_rows} registros "
+                f"({count} encontrados). Use CSV, NDJSON ou Parquet."
+            )
+
+        meta = queryset.model._meta
+        context = {
+            "model_name": meta.verbose_name,
+            "model_name_plural": meta.verbose_name_plural,
+            **(context or {}),
+        }
+        merged = PdfWriter()
+        for section in DataExportService._pdf_sections(
+            queryset, template_name, context, section_rows
+        ):
+            merged.append(io.BytesIO(section))
+        merged.write(file)
+        return count
+
     @staticmethod
     def export_to_pdf(
         queryset: Any,
@@ -78,10 +369,14 @@ class DataExportService:
         context: dict[str, Any],
         filename: str,
     ) -> Any:
-        html_string = render_to_string(template_name, context)
+        buffer = io.BytesIO()
         try:
-            html = HTML(string=html_string)
-            pdf = html.write_pdf()
+            DataExportService.write_pdf(
+                queryset, buffer, template_name, context
+            )
+            pdf = buffer.getvalue()
+        except ExportRowLimitError:
+            raise
         except Exception:
             # Fallback or simple error message if weasyprint fails
             return HttpResponse(
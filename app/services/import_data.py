@@ -1,14 +1,105 @@
+import xml.etree.ElementTree as ET
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from operator import itemgetter
 from typing import Any
 
 import pandas as pd
-from django.core.exceptions import ValidationError
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import transaction
+from openpyxl import load_workbook
+
+from app.services import caching, columnar, stock
+from app.services.validation import ColumnValidator, map_distinct
+
+# Linhas inseridas por `bulk_create` no carregamento em lote.
+DEFAULT_BATCH_SIZE = 1000
+# Linhas lidas do arquivo por vez na extração em streaming.
+DEFAULT_CHUNK_SIZE = 5000
+# Formatos lidos em blocos sem carregar o arquivo inteiro em memória.
+STREAMING_FILE_TYPES = (
+    "csv",
+    "ndjson",
+    "jsonl",
+    "xlsx",
+    "xml",
+    *columnar.COLUMNAR_FORMATS,
+)
+
+# Campos usados para encontrar um relacionamento pelo nome, em ordem.
+SEARCH_FIELDS = ("name", "title", "nome", "titulo")
+# Linhas lidas por vez ao carregar o índice de um modelo relacionado.
+LOOKUP_CHUNK_SIZE = 5000
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+class ForeignKeyIndex:
+    """
+    Índice em memória (nome normalizado -> pks) de um modelo relacionado.
+
+    É carregado uma única vez por importação, com uma query lida em blocos,
+    e resolve todas as linhas sem novas consultas ao banco.
+    """
+
+    def __init__(self, related_model: Any) -> None:
+        self.related_model = related_model
+        field_names = {
+            field.name for field in related_model._meta.get_fields()
+        }
+        self.search_fields = [f for f in SEARCH_FIELDS if f in field_names]
+        self.pks: set[Any] = set()
+        self.names: list[dict[str, list[Any]]] = [
+            {} for _ in self.search_fields
+        ]
+
+        rows = (
+            related_model.objects
+            .order_by()
+            .values_list("pk", *self.search_fields)
+            .iterator(chunk_size=LOOKUP_CHUNK_SIZE)
+        )
+        for pk, *values in rows:
+            self.pks.add(pk)
+            for names, name in zip(self.names, values, strict=True):
+                if name is not None:
+                    names.setdefault(_normalize(name), []).append(pk)
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Retorna o pk correspondente a `value` (pk ou nome).
+        :raises ValidationError: Se o nome não existir ou for ambíguo.
+        """
+        key = _normalize(value)
+        if key.isdigit() and int(key) in self.pks:
+            return int(key)
+
+        model_name = self.related_model.__name__
+        for names in self.names:
+            pks = names.get(key)
+            if not pks:
+                continue
+            if len(pks) > 1:
+                raise ValidationError(
+                    f"Relacionamento '{value}' é ambíguo no modelo "
+                    f"{model_name} ({len(pks)} registros com esse nome)."
+                )
+            return pks[0]
+
+        raise ValidationError(
+            f"Relacionamento '{value}' não encontrado no modelo {model_name}."
+        )
 
 
 class DataImportService:
     def __init__(self, file_obj: Any, file_type: str) -> None:
         self.file = file_obj
         self.file_type = file_type
+        # Índices dos modelos relacionados, criados sob demanda e
+        # reaproveitados por todas as linhas da importação.
+        self._indexes: dict[Any, ForeignKeyIndex] = {}
 
     def extract(self) -> Any:
         """Extrai os dados do arquivo para um DataFrame do Pandas."""
@@ -24,6 +115,12 @@ class DataImportService:
                     return pd.read_xml(self.file, parser="lxml")
                 except Exception:
                     return pd.read_xml(self.file)
+            elif self.file_type in columnar.COLUMNAR_FORMATS:
+                return pd.DataFrame(
+                    columnar.iter_records(
+                        self.file, self.file_type, DEFAULT_CHUNK_SIZE
+                    )
+                )
             else:
                 raise ValueError(
                     f"Formato de arquivo '{self.file_type}' não suportado."
@@ -33,36 +130,107 @@ class DataImportService:
                 f"Erro ao ler arquivo: {str(e)}"
             )
 
-    def _resolve_foreign_key(
-        self, model_class: Any, field_name: str, value: Any
-    ) -> Any:
-        if value is None or value == "":
-            return value
+    def _iter_xml_records(self) -> Iterator[dict[str, Any]]:
+        """
+        Lê o XML com `iterparse`: cada filho da raiz é um registro, com
+        seus atributos e os textos dos elementos filhos como colunas.
+        """
+        depth = 0
+        root = None
+        for event, elem in ET.iterparse(self.file, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = elem
+                continue
 
-        field = model_class._meta.get_field(field_name)
-        if not (field.is_relation and field.many_to_one):
-            return value
+            depth -= 1
+            if depth == 1:
+                record = dict(elem.attrib)
+                for child in elem:
+                    record[child.tag.rsplit("}", 1)[-1]] = child.text
+                yield record
+                # Descarta os registros já lidos para manter a memória fixa
+                root.clear()
 
-        if str(value).isdigit():
-            return value
+    def _iter_xlsx_records(self) -> Iterator[dict[str, Any]]:
+        """Lê a planilha ativa linha a linha (openpyxl em `read_only`)."""
+        workbook = load_workbook(self.file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [
+                str(name) if name is not None else f"Unnamed: {i}"
+                for i, name in enumerate(header)
+            ]
+            for values in rows:
+                if all(value is None for value in values):
+                    continue
+                yield dict(zip(columns, values, strict=False))
+        finally:
+            workbook.close()
 
-        related_model = field.related_model
-        search_fields = ["name", "title", "nome", "titulo"]
-        for s_field in search_fields:
-            try:
-                related_model._meta.get_field(s_field)
-                related_obj = related_model.objects.filter(**{
-                    f"{s_field}__iexact": str(value).strip()
-                }).first()
-                if related_obj:
-                    return related_obj
-            except Exception:
-                continue
+    @staticmethod
+    def _records_to_chunks(
+        records: Iterable[dict[str, Any]], chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
+        records = iter(records)
+        offset = 0
+        while chunk := list(islice(records, chunk_size)):
+            yield pd.DataFrame(chunk, index=range(offset, offset + len(chunk)))
+            offset += len(chunk)
 
-        raise ValidationError(
-            f"Relacionamento '{value}' não encontrado "
-            f"no modelo {related_model.__name__}."
-        )
+    def _read_chunks(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        if self.file_type == "csv":
+            yield from pd.read_csv(self.file, chunksize=chunk_size)
+        elif self.file_type in ("ndjson", "jsonl"):
+            yield from pd.read_json(
+                self.file, lines=True, chunksize=chunk_size
+            )
+        elif self.file_type == "xlsx":
+            yield from self._records_to_chunks(
+                self._iter_xlsx_records(), chunk_size
+            )
+        elif self.file_type == "xml":
+            yield from self._records_to_chunks(
+                self._iter_xml_records(), chunk_size
+            )
+        elif self.file_type in columnar.COLUMNAR_FORMATS:
+            yield from self._records_to_chunks(
+                columnar.iter_records(self.file, self.file_type, chunk_size),
+                chunk_size,
+            )
+        else:
+            # JSON (array/objeto) e XLS não têm leitura incremental
+            df = self.extract()
+            for start in range(0, len(df), chunk_size):
+                yield df.iloc[start : start + chunk_size]
+
+    def extract_chunks(
+        self, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Extrai os dados em DataFrames de até `chunk_size` linhas.
+
+        CSV, NDJSON, XLSX, XML, Parquet e Arrow são lidos em streaming, com
+        memória limitada ao bloco atual; o índice de cada DataFrame continua
+        a numeração das linhas do arquivo.
+        """
+        try:
+            yield from self._read_chunks(chunk_size)
+        except ValidationError:
+            raise
+        except Exception as e:
+            raise ValidationError(  # noqa: B904
+                f"Erro ao ler arquivo: {str(e)}"
+            )
+
+    def _foreign_key_index(self, related_model: Any) -> ForeignKeyIndex:
+        if related_model not in self._indexes:
+            self._indexes[related_model] = ForeignKeyIndex(related_model)
+        return self._indexes[related_model]
 
     def _prepare_row_data(
         self,
@@ -77,60 +245,258 @@ class DataImportService:
                 for csv_col, model_field in mapping_dict.items()
             }
 
+        prepared = {}
         for field_name, value in data.items():
-            data[field_name] = self._resolve_foreign_key(
-                model_class, field_name, value
+            field = model_class._meta.get_field(field_name)
+            if (
+                field.is_relation
+                and field.many_to_one
+                and value is not None
+                and value != ""
+            ):
+                # Relacionamentos são resolvidos para o pk pelo índice em
+                # memória e atribuídos diretamente a `<campo>_id`
+                related_model = field.related_model
+                prepared[field.attname] = self._foreign_key_index(
+                    related_model
+                ).resolve(value)
+            else:
+                prepared[field_name] = value
+
+        return prepared
+
+    @staticmethod
+    def _normalize_chunk(df: pd.DataFrame) -> pd.DataFrame:
+        # Otimização: Normalização de nomes de colunas
+        df.columns = [
+            str(c).strip().lower().replace(" ", "_") for c in df.columns
+        ]
+        # Células vazias (NaN) viram None, como um campo não preenchido
+        df = df.astype(object)
+        return df.where(df.notna(), None)
+
+    def _prepare_chunk(
+        self,
+        model_class: Any,
+        df: pd.DataFrame,
+        mapping_dict: dict[str, str] | None,
+    ) -> tuple[pd.DataFrame, dict[Any, str]] | None:
+        """
+        Versão por colunas de `_prepare_row_data`: aplica o mapeamento e
+        resolve os relacionamentos uma vez por valor distinto.
+        :return: DataFrame com uma coluna por `attname` e a primeira falha
+        de cada linha (coluna inexistente ou relacionamento não resolvido),
+        ou None se alguma coluna exigir o caminho linha a linha.
+        """
+        if mapping_dict:
+            df = pd.DataFrame(
+                {
+                    model_field: df[csv_col] if csv_col in df else None
+                    for csv_col, model_field in mapping_dict.items()
+                },
+                index=df.index,
             )
 
-        return data
+        failures: dict[Any, str] = {}
+        columns = {}
+        for name in df.columns:
+            try:
+                field = model_class._meta.get_field(name)
+            except FieldDoesNotExist as e:
+                for index in df.index:
+                    failures.setdefault(index, str(e))
+                continue
+            if not field.concrete:
+                return None
 
-    def transform_and_load(
-        self, model_class: Any, mapping_dict: dict[str, str] | None = None
-    ) -> int:
+            column = df[name]
+            if field.is_relation and field.many_to_one:
+                index = self._foreign_key_index(field.related_model)
+
+                def resolve(value: Any, index: Any = index) -> tuple[Any, Any]:
+                    if value is None or value == "":
+                        return value, None
+                    try:
+                        return index.resolve(value), None
+                    except ValidationError as e:
+                        return None, str(e)
+
+                results = map_distinct(column, resolve)
+                for row, (_, error) in results.items():
+                    if error is not None:
+                        failures.setdefault(row, error)
+                column = results.map(itemgetter(0))
+            columns[field.attname] = column
+
+        return pd.DataFrame(columns, index=df.index), failures
+
+    def _validate_chunk(
+        self,
+        model_class: Any,
+        df: pd.DataFrame,
+        mapping_dict: dict[str, str] | None,
+        errors: list[str],
+    ) -> list[Any] | None:
         """
-        Transforma e carrega os dados no modelo especificado.
-        :param model_class: A classe do modelo Django (ex: Product).
-        :param mapping_dict: Dicionário opcional mapeando colunas do arquivo
-        para campos do modelo.
+        Valida um bloco por colunas (`ColumnValidator`) e instancia os
+        objetos válidos, acumulando os erros em `errors` no mesmo formato
+        do `full_clean()`.
+        :return: Objetos do bloco, ou None se o modelo/colunas exigirem a
+        validação linha a linha.
         """
-        df = self.extract()
+        validator = ColumnValidator(model_class)
+        if not validator.supported():
+            return None
+        prepared = self._prepare_chunk(model_class, df, mapping_dict)
+        if prepared is None:
+            return None
 
-        # Otimização: Normalização de nomes de colunas
-        df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
+        data, failures = prepared
+        valid_rows = data.drop(index=list(failures))
+        converted, row_errors = validator.validate(valid_rows)
+
+        for index in df.index:
+            if index in failures:
+                errors.append(f"Linha {index + 1}: {failures[index]}")
+            elif index in row_errors:
+                message = str(ValidationError(row_errors[index]))
+                errors.append(f"Linha {index + 1}: {message}")
 
-        objects_to_create = []
-        errors = []
+        return [
+            model_class(**values)
+            for index, values in zip(
+                converted.index,
+                converted.to_dict("records"),
+                strict=True,
+            )
+            if index not in row_errors
+        ]
+
+    def _build_objects(
+        self,
+        model_class: Any,
+        df: pd.DataFrame,
+        mapping_dict: dict[str, str] | None,
+        errors: list[str],
+        validate: bool,
+    ) -> list[Any]:
+        """
+        Instancia os objetos de um bloco, acumulando os erros em `errors`.
 
-        # Itera sobre as linhas do DataFrame
-        for index, row in df.iterrows():
+        Usa a validação por colunas quando possível e recorre ao
+        `full_clean()` linha a linha (modelos com validadores customizados).
+        :param validate: Executa `full_clean()` no caminho linha a linha; se
+        False, apenas converte os valores (o bloco já foi validado na
+        primeira passada).
+        """
+        df = self._normalize_chunk(df)
+        objects = self._validate_chunk(model_class, df, mapping_dict, errors)
+        if objects is not None:
+            return objects
+
+        relations = [
+            field.name
+            for field in model_class._meta.concrete_fields
+            if field.is_relation
+        ]
+
+        objects = []
+        # `to_dict("records")` preserva os None (iterrows os converte em NaN)
+        rows = zip(df.index, df.to_dict("records"), strict=True)
+        for index, row in rows:
             try:
-                data = self._prepare_row_data(
-                    model_class, row.to_dict(), mapping_dict
-                )
+                data = self._prepare_row_data(model_class, row, mapping_dict)
 
                 # Instancia o modelo (sem salvar ainda) para validar
                 obj = model_class(**data)
-                obj.full_clean()
-                objects_to_create.append(obj)
+                if validate:
+                    obj.full_clean()
+                else:
+                    # Os pks já foram resolvidos pelo índice
+                    obj.clean_fields(exclude=relations)
+                objects.append(obj)
             except Exception as e:
                 errors.append(f"Linha {index + 1}: {str(e)}")
 
-        if errors:
-            raise ValidationError(errors)
+        return objects
 
-        # Usar save() em vez de bulk_create para garantir que Signals
-        # (estoque) sejam disparados
-        created_count = 0
-        if objects_to_create:
-            with transaction.atomic():
-                for obj in objects_to_create:
-                    obj.save()
-                    created_count += 1
+    def _load_with_signals(self, objects: list[Any]) -> None:
+        """Salva objeto por objeto, disparando os signals de cada um."""
+        for obj in objects:
+            obj.save()
 
-            # Limpa o cache para garantir que
-            # a UI mostre os novos dados imediatamente
-            from django.core.cache import cache
+    def _bulk_load(
+        self, model_class: Any, objects: list[Any], batch_size: int
+    ) -> None:
+        """
+        Insere os objetos com `bulk_create` em lotes e aplica os efeitos
+        dos signals (estoque e consolidados) de forma agregada por lote.
+        """
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start : start + batch_size]
+            model_class.objects.bulk_create(batch)
+            stock.apply_bulk_create_effects(model_class, batch)
 
-            cache.clear()
+    def transform_and_load(
+        self,
+        model_class: Any,
+        mapping_dict: dict[str, str] | None = None,
+        bulk: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Callable[[str, int], None] | None = None,
+    ) -> int:
+        """
+        Transforma e carrega os dados no modelo especificado.
+
+        O arquivo é percorrido em blocos de `chunk_size` linhas duas vezes:
+        a primeira valida todas as linhas sem gravar nada (reportando todos
+        os erros de uma vez) e a segunda carrega os blocos em uma única
+        transação. A memória usada é limitada ao bloco atual.
+        :param model_class: A classe do modelo Django (ex: Product).
+        :param mapping_dict: Dicionário opcional mapeando colunas do arquivo
+        para campos do modelo.
+        :param bulk: Usa `bulk_create` em lotes com atualização agregada do
+        estoque; se False, salva linha a linha disparando os signals.
+        :param batch_size: Tamanho dos lotes do carregamento em lote.
+        :param chunk_size: Linhas lidas do arquivo por vez.
+        :param progress: Callback chamado a cada bloco com a etapa
+        ("validating" ou "loading") e o total de linhas processadas.
+        """
+        errors: list[str] = []
+        validated = 0
+        for df in self.extract_chunks(chunk_size):
+            self._build_objects(
+                model_class, df, mapping_dict, errors, validate=True
+            )
+            validated += len(df)
+            if progress:
+                progress("validating", validated)
+
+        if errors:
+            raise ValidationError(errors)
+        if not validated:
+            return 0
+
+        self.file.seek(0)
+        loaded = 0
+        # Invalida apenas os namespaces afetados pelo modelo importado,
+        # uma única vez ao final, em vez de limpar o cache inteiro
+        with caching.defer_invalidation(), transaction.atomic():
+            for df in self.extract_chunks(chunk_size):
+                objects = self._build_objects(
+                    model_class, df, mapping_dict, errors, validate=False
+                )
+                if errors:
+                    # O arquivo mudou entre as passadas
+                    raise ValidationError(errors)
+                if bulk:
+                    self._bulk_load(model_class, objects, batch_size)
+                else:
+                    self._load_with_signals(objects)
+                loaded += len(objects)
+                if progress:
+                    progress("loading", loaded)
+            caching.invalidate_model(model_class)
 
-        return created_count
+        return loaded
@@ -0,0 +1,237 @@
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import transaction
+from django.db.models import Exists, F, Max, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
+
+from app.services import caching, rollups
+from products.models import Product, StockMovement
+
+# Tipo de movimentação no livro-razão para cada modelo de movimentação.
+MOVEMENT_KINDS = {
+    "inflows.Inflows": StockMovement.INFLOW,
+    "outflows.Outflows": StockMovement.OUTFLOW,
+}
+# Produtos bloqueados e verificados por transação nos checkpoints.
+DEFAULT_CHECKPOINT_BATCH_SIZE = 500
+
+
+def record_movements(
+    movements: Iterable[Any], label: str, direction: int
+) -> None:
+    """
+    Grava no livro-razão as entradas/saídas recém-criadas. Deve ser chamado
+    na mesma transação do `UPDATE` do estoque, depois dele: o bloqueio da
+    linha do produto ordena as gravações em relação aos checkpoints.
+    """
+    StockMovement.objects.bulk_create(
+        StockMovement(
+            product_id=movement.product_id,
+            kind=MOVEMENT_KINDS[label],
+            quantity=direction * movement.quantity,
+            source_id=movement.pk,
+            created_at=Now(),
+        )
+        for movement in movements
+        if movement.quantity > 0
+    )
+
+
+def record_adjustments(deltas: dict[int, int]) -> None:
+    """Grava ajustes diretos do estoque (cadastro, edição, importação)."""
+    StockMovement.objects.bulk_create(
+        StockMovement(
+            product_id=pk,
+            kind=StockMovement.ADJUSTMENT,
+            quantity=delta,
+            created_at=Now(),
+        )
+        for pk, delta in deltas.items()
+        if delta
+    )
+
+
+def _movements(product: Any, at: Any = None) -> Any:
+    movements = StockMovement.objects.filter(product=product)
+    return movements if at is None else movements.filter(created_at__lte=at)
+
+
+def on_hand(product_id: int, at: Any = None) -> int:
+    """
+    Saldo do produto no instante `at` (padrão: agora): o último checkpoint
+    até `at` mais as variações posteriores a ele. As duas consultas usam o
+    índice (produto, id), sem somar o histórico inteiro.
+
+    "Posterior" é decidido pelo pk e não pela data: o checkpoint guarda em
+    `source_id` a última movimentação que incluiu, e uma movimentação com
+    pk maior nunca foi contada, mesmo que sua data (gravada antes do
+    commit) seja anterior à do checkpoint.
+    """
+    checkpoint = (
+        _movements(product_id, at)
+        .filter(kind=StockMovement.CHECKPOINT)
+        .order_by("-pk")
+        .values_list("balance", "source_id")
+        .first()
+    )
+    balance, upto = checkpoint or (0, 0)
+    delta = (
+        _movements(product_id, at)
+        .filter(pk__gt=upto)
+        .aggregate(total=Sum("quantity"))["total"]
+    )
+    return balance + (delta or 0)
+
+
+def annotate_balances(
+    queryset: Any, at: Any = None, upto: int | None = None
+) -> Any:
+    """
+    Anota `ledger_balance` (saldo segundo o livro-razão em `at`, ou agora)
+    e `checkpoint_upto` (pk da última movimentação do checkpoint usado) em
+    uma consulta de produtos.
+    :param upto: Considera apenas as movimentações com pk até este valor.
+    """
+    checkpoints = (
+        _movements(OuterRef("pk"), at)
+        .filter(kind=StockMovement.CHECKPOINT)
+        .order_by("-pk")
+    )
+    queryset = queryset.annotate(
+        checkpoint_balance=Coalesce(
+            Subquery(checkpoints.values("balance")[:1]), 0
+        ),
+        checkpoint_upto=Coalesce(
+            Subquery(checkpoints.values("source_id")[:1]), 0
+        ),
+    )
+    deltas = _movements(OuterRef("pk"), at).filter(
+        pk__gt=OuterRef("checkpoint_upto")
+    )
+    if upto is not None:
+        deltas = deltas.filter(pk__lte=upto)
+    deltas = (
+        deltas
+        .order_by()
+        .values("product")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    return queryset.annotate(
+        ledger_balance=F("checkpoint_balance") + Coalesce(Subquery(deltas), 0)
+    )
+
+
+def _product_batches(batch_size: int) -> Iterable[list[int]]:
+    pks = list(Product.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(pks), batch_size):
+        yield pks[start : start + batch_size]
+
+
+def create_checkpoints(batch_size: int = DEFAULT_CHECKPOINT_BATCH_SIZE) -> int:
+    """
+    Grava um checkpoint para cada produto com movimentações desde o último.
+    As linhas dos produtos ficam bloqueadas durante o cálculo, o que espera
+    as transações que alteram o estoque terminarem (elas gravam o
+    livro-razão sob o mesmo bloqueio). O checkpoint cobre as movimentações
+    até o maior pk lido sob o bloqueio, e não até um horário: movimentações
+    desses produtos gravadas depois recebem pks maiores.
+    :return: Número de checkpoints criados.
+    """
+    created = 0
+    for pks in _product_batches(batch_size):
+        with transaction.atomic():
+            list(
+                Product.objects
+                .select_for_update()
+                .filter(pk__in=pks)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            upto = StockMovement.objects.aggregate(upto=Max("pk"))["upto"]
+            if upto is None:
+                return created
+            pending = StockMovement.objects.filter(
+                product=OuterRef("pk"),
+                pk__gt=OuterRef("checkpoint_upto"),
+                pk__lte=upto,
+            ).exclude(kind=StockMovement.CHECKPOINT)
+            balances = (
+                annotate_balances(
+                    Product.objects.filter(pk__in=pks), upto=upto
+                )
+                .filter(Exists(pending))
+                .values_list("pk", "ledger_balance")
+            )
+            checkpoints = StockMovement.objects.bulk_create(
+                StockMovement(
+                    product_id=pk,
+                    kind=StockMovement.CHECKPOINT,
+                    balance=balance,
+                    source_id=upto,
+                    created_at=Now(),
+                )
+                for pk, balance in balances
+            )
+            created += len(checkpoints)
+    return created
+
+
+def drifted_products(queryset: Any = None) -> Any:
+    """Produtos cujo `quantity` diverge do saldo do livro-razão."""
+    queryset = Product.objects.all() if queryset is None else queryset
+    return (
+        annotate_balances(queryset)
+        .exclude(quantity=F("ledger_balance"))
+        .order_by("pk")
+    )
+
+
+def check_ledger() -> list[str]:
+    """
+    Compara o estoque de cada produto com o livro-razão.
+    :return: Lista de divergências encontradas (vazia se consistente).
+    """
+    return [
+        f"{product.title} (id {product.pk}): estoque {product.quantity}, "
+        f"livro-razão {product.ledger_balance}"
+        for product in drifted_products()
+    ]
+
+
+@transaction.atomic
+def repair_ledger(trust: str = "ledger") -> int:
+    """
+    Corrige as divergências entre produtos e livro-razão.
+    :param trust: "ledger" regrava `Product.quantity` com o saldo do
+    livro-razão; "product" grava ajustes no livro-razão para que ele passe
+    a refletir o estoque atual dos produtos.
+    :return: Número de produtos corrigidos.
+    """
+    drifted = list(drifted_products(Product.objects.select_for_update()))
+    if trust == "product":
+        record_adjustments({
+            product.pk: product.quantity - product.ledger_balance
+            for product in drifted
+        })
+        return len(drifted)
+    if trust != "ledger":
+        raise ValueError(f"Origem não suportada: {trust}")
+
+    now = timezone.now()
+    for product in drifted:
+        Product.objects.filter(pk=product.pk).update(
+            quantity=product.ledger_balance, updated_at=now
+        )
+        rollups.apply_inventory_delta(
+            *rollups.stock_position(
+                product.ledger_balance - product.quantity,
+                product.cost_price,
+                product.sell_price,
+            )
+        )
+    if drifted:
+        caching.invalidate_model(Product)
+    return len(drifted)
@@ -1,28 +1,71 @@
 # ========== RAW FUNCTIONS (SEM CACHE) ==========
+from datetime import date, timedelta
+from decimal import Decimal
 from typing import Any
 
-from django.core.cache import cache
-from django.db.models import F, Sum
+from django.db.models import Count, DateField, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce, Trunc
 from django.utils import timezone
 from django.utils.formats import number_format
 
+from app.services import caching
 from brands.models import Brand
 from categories.models import Category
-from outflows.models import Outflows
-from products.models import Product
+from dashboard.models import DailySalesRollup, InventorySnapshot
 
+# Somas monetárias (preço x quantidade) podem exceder os 10 dígitos dos
+# campos de preço, por isso o resultado usa um campo mais largo.
+MONEY_FIELD = DecimalField(max_digits=20, decimal_places=2)
+ZERO = Value(Decimal("0.00"), output_field=MONEY_FIELD)
 
-def get_product_metrics_raw() -> dict[str, Any]:
-    """Calcula métricas de produtos (sem cache) - otimizado."""
-    products = Product.objects.all()
+# Janelas (em dias) e granularidades aceitas pelos gráficos de vendas.
+SALES_PERIODS = (7, 30, 90, 365)
+SALES_GRANULARITIES = ("day", "week", "month")
+DEFAULT_SALES_PERIOD = 30
+DEFAULT_SALES_GRANULARITY = "day"
 
-    total_products = sum(product.quantity for product in products)
-    total_cost_price = sum(
-        product.cost_price * product.quantity for product in products
-    )
-    total_sell_price = sum(
-        product.sell_price * product.quantity for product in products
+# TTL do cache das métricas: 2x o intervalo do beat (5 min) para que o
+# valor seja renovado pelo beat antes de vencer.
+CACHE_TTL = 60 * 10
+
+# Gráficos de distribuição exibem no máximo N fatias + "Outros".
+CHART_TOP_N = 10
+OTHERS_LABEL = "Outros"
+
+
+# Chaves de cache (nome, namespace); o namespace define quais escritas
+# invalidam cada métrica (ver `caching.MODEL_NAMESPACES`).
+PRODUCT_METRICS_KEY = ("product", caching.METRICS_INVENTORY)
+SALES_METRICS_KEY = ("sales", caching.METRICS_SALES)
+PRODUCTS_BY_CATEGORY_KEY = ("products_by_category", caching.METRICS_CATALOG)
+PRODUCTS_BY_BRAND_KEY = ("products_by_brand", caching.METRICS_CATALOG)
+
+
+def cache_key(name: str, namespace: str) -> str:
+    """Retorna a chave versionada de uma métrica."""
+    return caching.namespaced_key(namespace, f"metrics:{name}")
+
+
+def sales_time_series_cache_key(days: int, granularity: str) -> str:
+    return cache_key(
+        f"sales_time_series:{days}:{granularity}", caching.METRICS_SALES
     )
+
+
+def get_product_metrics_raw() -> dict[str, Any]:
+    """
+    Calcula métricas de produtos (sem cache).
+
+    Lê a posição consolidada (`InventorySnapshot`), mantida em tempo real
+    pelos signals de estoque, em vez de varrer a tabela de produtos.
+    """
+    # Linha única: lê os campos direto; sem a linha, o estoque está vazio.
+    total_products, total_cost_price, total_sell_price = (
+        InventorySnapshot.objects
+        .filter(pk=InventorySnapshot.SINGLETON_PK)
+        .values_list("total_quantity", "total_cost_price", "total_sell_price")
+        .first()
+    ) or (0, Decimal("0.00"), Decimal("0.00"))
     total_profit = total_sell_price - total_cost_price
 
     return {
@@ -49,31 +92,26 @@ def get_product_metrics_raw() -> dict[str, Any]:
 
 
 def get_sales_metrics_raw() -> dict[str, Any]:
-    """Calcula métricas de vendas (sem cache) - otimizado."""
-    # Otimização: select_related para evitar N+1 queries
-    outflows = Outflows.objects.select_related("product").all()
-
-    total_sales = outflows.count()
-    total_product_sold = (
-        Outflows.objects.aggregate(total_product_sold=Sum("quantity"))[
-            "total_product_sold"
-        ]
-        or 0
+    """
+    Calcula métricas de vendas (sem cache).
+
+    Soma os consolidados diários (`DailySalesRollup`): O(dias) linhas em
+    vez de O(histórico) saídas.
+    """
+    totals = DailySalesRollup.objects.aggregate(
+        total_sales=Coalesce(Sum("sales_count"), 0),
+        total_product_sold=Coalesce(Sum("quantity"), 0),
+        total_cost_price=Coalesce(Sum("total_cost_price"), ZERO),
+        total_sell_price=Coalesce(Sum("total_sell_price"), ZERO),
     )
 
-    total_cost_price = sum(
-        outflow.product.cost_price * outflow.quantity
-        for outflow in Outflows.objects.all()
-    )
-    total_sell_price = sum(
-        outflow.product.sell_price * outflow.quantity
-        for outflow in Outflows.objects.all()
-    )
+    total_cost_price = totals["total_cost_price"]
+    total_sell_price = totals["total_sell_price"]
     total_profit = total_sell_price - total_cost_price
 
     return {
-        "total_sales": total_sales,
-        "total_product_sold": total_product_sold,
+        "total_sales": totals["total_sales"],
+        "total_product_sold": totals["total_product_sold"],
         "total_cost_price": number_format(
             total_cost_price,
             decimal_pos=2,
@@ -95,71 +133,110 @@ def get_sales_metrics_raw() -> dict[str, Any]:
     }
 
 
-def get_daily_sales_data_raw() -> dict[str, Any]:
-    """Calcula dados de vendas diárias (sem cache)."""
-    today = timezone.now().date()
-    # Import datetime directly if timezone.timedelta is failing
-    import datetime
-
-    dates = [
-        str(today - datetime.timedelta(days=i)) for i in range(30, -1, -1)
-    ]
-    values = []
-
-    for date in dates:
-        sales_total = (
-            Outflows.objects.filter(created_at__date=date).aggregate(
-                total_sales=Sum(F("product__sell_price") * F("quantity"))
-            )["total_sales"]
-            or 0
+def _bucket_start(day: date, granularity: str) -> date:
+    """Retorna o início do bucket (dia, semana ou mês) que contém `day`."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day + timedelta(weeks=1)
+    if granularity == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def get_sales_time_series_raw(
+    days: int = DEFAULT_SALES_PERIOD,
+    granularity: str = DEFAULT_SALES_GRANULARITY,
+) -> dict[str, Any]:
+    """
+    Calcula a série temporal de vendas (sem cache) em uma única query.
+
+    Agrupa os consolidados diários por dia/semana/mês com `GROUP BY` e
+    preenche os buckets sem vendas com zero. Para semana/mês, a janela
+    recua até o início do bucket que contém o seu primeiro dia, para que
+    o primeiro ponto não mostre um período parcial como se fosse inteiro.
+    :param days: Janela em dias contados a partir de hoje.
+    :param granularity: "day", "week" ou "month".
+    :return: Dicionário com `dates` (início de cada bucket), `values`
+    (valor vendido em R$) e `counts` (número de vendas).
+    """
+    if granularity not in SALES_GRANULARITIES:
+        raise ValueError(f"Granularidade inválida: {granularity}")
+
+    today = timezone.localdate()
+    start = _bucket_start(today - timedelta(days=days), granularity)
+
+    rows = (
+        DailySalesRollup.objects
+        .filter(date__gte=start)
+        .annotate(bucket=Trunc("date", granularity, output_field=DateField()))
+        .values("bucket")
+        .annotate(
+            total=Sum("total_sell_price"),
+            count=Sum("sales_count"),
         )
-        values.append(float(sales_total))
+        .order_by("bucket")
+    )
+    totals = {row["bucket"]: (row["total"], row["count"]) for row in rows}
+
+    dates, values, counts = [], [], []
+    bucket = start
+    while bucket <= today:
+        total, count = totals.get(bucket, (0, 0))
+        dates.append(str(bucket))
+        values.append(float(total or 0))
+        counts.append(count)
+        bucket = _next_bucket(bucket, granularity)
 
     return {
         "dates": dates,
         "values": values,
+        "counts": counts,
     }
 
 
-def get_daily_sales_quantity_data_raw() -> dict[str, Any]:
-    """Calcula quantidades de vendas diárias (sem cache)."""
-    today = timezone.now().date()
-    import datetime
+def _bucket_top_n(counts: dict[str, int], top_n: int | None) -> dict[str, int]:
+    """Mantém os `top_n` maiores grupos e soma o restante em "Outros"."""
+    if top_n is None or len(counts) <= top_n:
+        return counts
 
-    dates = [
-        str(today - datetime.timedelta(days=i)) for i in range(30, -1, -1)
-    ]
-    quantities = []
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    bucketed = dict(ranked[:top_n])
+    others = sum(count for _, count in ranked[top_n:])
+    bucketed[OTHERS_LABEL] = bucketed.get(OTHERS_LABEL, 0) + others
+    return bucketed
 
-    for date in dates:
-        sales_quantity = Outflows.objects.filter(created_at__date=date).count()
-        quantities.append(sales_quantity)
-
-    return {
-        "dates": dates,
-        "values": quantities,
-    }
-
-
-def get_products_by_category_raw() -> dict[str, Any]:
-    """Calcula produtos por categoria (sem cache) - otimizado."""
-    # Otimização: select_related para evitar N+1 queries
-    categories = Category.objects.all()
-    return {
-        category.name: Product.objects.filter(category=category).count()
-        for category in categories
-    }
 
+def get_products_by_category_raw(
+    top_n: int | None = None,
+) -> dict[str, Any]:
+    """Calcula produtos por categoria (sem cache) - um único GROUP BY."""
+    rows = (
+        Category.objects
+        .values("name")
+        .annotate(total=Count("products"))
+        .order_by("name")
+    )
+    counts = {row["name"]: row["total"] for row in rows}
+    return _bucket_top_n(counts, top_n)
 
-def get_products_by_brand_raw() -> dict[str, Any]:
-    """Calcula produtos por marca (sem cache) - otimizado."""
-    # Otimização: select_related para evitar N+1 nas queries de brand
-    brands = Brand.objects.all()
 
-    return {
-        brand.name: Product.objects.filter(product_model__brand=brand).count()
-        for brand in brands
-    }
+def get_products_by_brand_raw(top_n: int | None = None) -> dict[str, Any]:
+    """Calcula produtos por marca (sem cache) - um único GROUP BY."""
+    rows = (
+        Brand.objects
+        .values("name")
+        .annotate(total=Count("productmodel__products"))
+        .order_by("name")
+    )
+    counts = {row["name"]: row["total"] for row in rows}
+    return _bucket_top_n(counts, top_n)
 
 
 # ========== CACHED FUNCTIONS (COM CACHE) ==========
@@ -167,53 +244,43 @@ def get_products_by_brand_raw() -> dict[str, Any]:
 
 def get_product_metrics() -> dict[str, Any]:
     """Retorna métricas de produtos (com cache)."""
-    cached = cache.get("metrics:product")
-    if cached:
-        return cached
-    # Fallback se cache miss
-    return get_product_metrics_raw()
+    return caching.get_or_compute(
+        cache_key(*PRODUCT_METRICS_KEY), get_product_metrics_raw, CACHE_TTL
+    )
 
 
 def get_sales_metrics() -> dict[str, Any]:
     """Retorna métricas de vendas (com cache)."""
-    cached = cache.get("metrics:sales")
-    if cached:
-        return cached
-    # Fallback se cache miss
-    return get_sales_metrics_raw()
-
-
-def get_daily_sales_data() -> dict[str, Any]:
-    """Retorna dados de vendas diárias (com cache)."""
-    cached = cache.get("metrics:daily_sales")
-    if cached:
-        return cached
-    # Fallback se cache miss
-    return get_daily_sales_data_raw()
+    return caching.get_or_compute(
+        cache_key(*SALES_METRICS_KEY), get_sales_metrics_raw, CACHE_TTL
+    )
 
 
-def get_daily_sales_quantity_data() -> dict[str, Any]:
-    """Retorna quantidades de vendas diárias (com cache)."""
-    cached = cache.get("metrics:daily_sales_quantity")
-    if cached:
-        return cached
-    # Fallback se cache miss
-    return get_daily_sales_quantity_data_raw()
+def get_sales_time_series(
+    days: int = DEFAULT_SALES_PERIOD,
+    granularity: str = DEFAULT_SALES_GRANULARITY,
+) -> dict[str, Any]:
+    """Retorna a série temporal de vendas (com cache)."""
+    return caching.get_or_compute(
+        sales_time_series_cache_key(days, granularity),
+        lambda: get_sales_time_series_raw(days, granularity),
+        CACHE_TTL,
+    )
 
 
 def get_products_by_category() -> dict[str, Any]:
     """Retorna produtos por categoria (com cache)."""
-    cached = cache.get("metrics:products_by_category")
-    if cached:
-        return cached
-    # Fallback se cache miss
-    return get_products_by_category_raw()
+    return caching.get_or_compute(
+        cache_key(*PRODUCTS_BY_CATEGORY_KEY),
+        lambda: get_products_by_category_raw(CHART_TOP_N),
+        CACHE_TTL,
+    )
 
 
 def get_products_by_brand() -> dict[str, Any]:
     """Retorna produtos por marca (com cache)."""
-    cached = cache.get("metrics:products_by_brand")
-    if cached:
-        return cached
-    # Fallback se cache miss
-    return get_products_by_brand_raw()
+    return caching.get_or_compute(
+        cache_key(*PRODUCTS_BY_BRAND_KEY),
+        lambda: get_products_by_brand_raw(CHART_TOP_N),
+        CACHE_TTL,
+    )
@@ -0,0 +1,220 @@
+import os
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django_celery_results.models import GroupResult, TaskResult
+
+from notifications.models import TaskNotification
+
+# Prazos padrão de retenção (sobrescritos pelos settings de mesmo nome).
+DEFAULT_EXPORT_RETENTION_DAYS = 7
+DEFAULT_NOTIFICATION_RETENTION_DAYS = 30
+DEFAULT_TASK_RESULT_RETENTION_DAYS = 7
+DEFAULT_TEMP_FILE_RETENTION_HOURS = 24
+# Linhas apagadas por comando DELETE, para não travar as tabelas.
+DEFAULT_CLEANUP_BATCH_SIZE = 500
+
+FINISHED_STATUSES = ("completed", "failed")
+RUNNING_STATUSES = ("pending", "processing")
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default)
+
+
+def _delete_files(notifications: list[TaskNotification]) -> tuple[int, int]:
+    """
+    Remove do storage os arquivos das notificações dadas que não são usados
+    por nenhuma outra (exportações reaproveitadas compartilham o arquivo).
+    :return: (arquivos removidos, bytes liberados)
+    """
+    names = {n.file_path.name for n in notifications if n.file_path}
+    if not names:
+        return 0, 0
+
+    in_use = set(
+        TaskNotification.objects
+        .filter(file_path__in=names)
+        .exclude(pk__in=[n.pk for n in notifications])
+        .values_list("file_path", flat=True)
+    )
+    storage = TaskNotification._meta.get_field("file_path").storage
+    files = reclaimed = 0
+    for name in names - in_use:
+        try:
+            size = storage.size(name)
+        except OSError:
+            continue  # Já removido
+        storage.delete(name)
+        files += 1
+        reclaimed += size
+    return files, reclaimed
+
+
+def delete_expired_exports(
+    now: Any = None, days: int | None = None, batch_size: int | None = None
+) -> dict[str, int]:
+    """
+    Remove os arquivos de exportações concluídas há mais de `days` dias,
+    em lotes; a notificação é mantida, sem arquivo.
+    """
+    now = now or timezone.now()
+    days = days or _setting(
+        "EXPORT_RETENTION_DAYS", DEFAULT_EXPORT_RETENTION_DAYS
+    )
+    batch_size = batch_size or _setting(
+        "CLEANUP_BATCH_SIZE", DEFAULT_CLEANUP_BATCH_SIZE
+    )
+    expired = (
+        TaskNotification.objects
+        .filter(
+            task_type="export",
+            completed_at__lt=now - timedelta(days=days),
+        )
+        .exclude(file_path="")
+        .exclude(file_path__isnull=True)
+        .order_by("pk")
+    )
+
+    totals = {"files": 0, "bytes": 0}
+    while batch := list(expired[:batch_size]):
+        files, reclaimed = _delete_files(batch)
+        totals["files"] += files
+        totals["bytes"] += reclaimed
+        TaskNotification.objects.filter(pk__in=[n.pk for n in batch]).update(
+            file_path=""
+        )
+    return totals
+
+
+def prune_notifications(
+    now: Any = None, days: int | None = None, batch_size: int | None = None
+) -> dict[str, int]:
+    """
+    Apaga, em lotes, notificações finalizadas há mais de `days` dias (e os
+    arquivos que só elas usavam).
+    """
+    now = now or timezone.now()
+    days = days or _setting(
+        "NOTIFICATION_RETENTION_DAYS", DEFAULT_NOTIFICATION_RETENTION_DAYS
+    )
+    batch_size = batch_size or _setting(
+        "CLEANUP_BATCH_SIZE", DEFAULT_CLEANUP_BATCH_SIZE
+    )
+    cutoff = now - timedelta(days=days)
+    # Inclui tarefas que nunca terminaram (worker morto) criadas antes do
+    # prazo
+    old = TaskNotification.objects.filter(
+        Q(status__in=FINISHED_STATUSES, completed_at__lt=cutoff)
+        | Q(completed_at__isnull=True, created_at__lt=cutoff)
+    ).order_by("pk")
+
+    totals = {"rows": 0, "files": 0, "bytes": 0}
+    while batch := list(old[:batch_size]):
+        files, reclaimed = _delete_files(batch)
+        deleted, _ = TaskNotification.objects.filter(
+            pk__in=[n.pk for n in batch]
+        ).delete()
+        totals["rows"] += deleted
+        totals["files"] += files
+        totals["bytes"] += reclaimed
+    return totals
+
+
+def _delete_in_batches(queryset: Any, batch_size: int) -> int:
+    deleted = 0
+    queryset = queryset.order_by("pk")
+    while pks := list(queryset.values_list("pk", flat=True)[:batch_size]):
+        count, _ = queryset.model.objects.filter(pk__in=pks).delete()
+        deleted += count
+    return deleted
+
+
+def prune_task_results(
+    now: Any = None, days: int | None = None, batch_size: int | None = None
+) -> dict[str, int]:
+    """Apaga resultados de tasks (django_celery_results) antigos, em lotes."""
+    now = now or timezone.now()
+    days = days or _setting(
+        "TASK_RESULT_RETENTION_DAYS", DEFAULT_TASK_RESULT_RETENTION_DAYS
+    )
+    batch_size = batch_size or _setting(
+        "CLEANUP_BATCH_SIZE", DEFAULT_CLEANUP_BATCH_SIZE
+    )
+    cutoff = now - timedelta(days=days)
+    return {
+        "rows": _delete_in_batches(
+            TaskResult.objects.filter(date_done__lt=cutoff), batch_size
+        )
+        + _delete_in_batches(
+            GroupResult.objects.filter(date_done__lt=cutoff), batch_size
+        )
+    }
+
+
+def remove_orphan_temp_files(
+    now: float | None = None, hours: int | None = None
+) -> dict[str, int]:
+    """
+    Remove de `MEDIA_ROOT/temp` uploads e partes de exportação esquecidos
+    (ex: o worker morreu antes do `os.remove`): arquivos sem modificação há
+    mais de `hours` horas. Partes de exportações ainda em andamento são
+    preservadas.
+    """
+    now = now or time.time()
+    hours = hours or _setting(
+        "TEMP_FILE_RETENTION_HOURS", DEFAULT_TEMP_FILE_RETENTION_HOURS
+    )
+    temp_dir = os.path.join(settings.MEDIA_ROOT, "temp")
+    cutoff = now - hours * 3600
+    running = set(
+        TaskNotification.objects.filter(
+            status__in=RUNNING_STATUSES
+        ).values_list("task_id", flat=True)
+    )
+
+    totals = {"files": 0, "bytes": 0}
+    for root, _, files in os.walk(temp_dir, topdown=False):
+        if os.path.basename(root) in running:
+            continue
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime >= cutoff:
+                    continue
+                os.remove(path)
+            except OSError:
+                continue  # Removido por outro processo
+            totals["files"] += 1
+            totals["bytes"] += stat.st_size
+        if root != temp_dir:
+            try:
+                os.rmdir(root)  # Só remove diretórios vazios
+            except OSError:
+                pass
+    return totals
+
+
+def run_cleanup() -> dict[str, Any]:
+    """
+    Executa todas as etapas de retenção.
+    :return: Relatório por etapa e o total de bytes e linhas liberados.
+    """
+    report: dict[str, Any] = {
+        "exports": delete_expired_exports(),
+        "temp_files": remove_orphan_temp_files(),
+        "notifications": prune_notifications(),
+        "task_results": prune_task_results(),
+    }
+    report["bytes_reclaimed"] = sum(
+        step.get("bytes", 0) for step in list(report.values())
+    )
+    report["rows_deleted"] = (
+        report["notifications"]["rows"] + report["task_results"]["rows"]
+    )
+    return report
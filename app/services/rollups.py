@@ -0,0 +1,251 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from app.services.metrics import MONEY_FIELD, ZERO
+from dashboard.models import DailySalesRollup, InventorySnapshot
+from outflows.models import Outflows
+from products.models import Product
+
+# Campos comparados pelo verificador de consistência. Os valores
+# monetários das vendas são gravados com o preço do momento da venda e
+# não podem ser reconstruídos a partir do histórico (as saídas não
+# guardam preço), por isso apenas contagens e quantidades são conferidas.
+SALES_CHECK_FIELDS = ("sales_count", "quantity")
+INVENTORY_FIELDS = ("total_quantity", "total_cost_price", "total_sell_price")
+
+
+def _increment(model: Any, lookup: dict[str, Any], **deltas: Any) -> None:
+    """
+    Agenda os incrementos para depois do commit da transação atual (ou os
+    aplica na hora, fora de transação). As linhas consolidadas (o dia e a
+    posição do estoque) são disputadas por todas as movimentações: travá-las
+    na transação do chamador serializaria o sistema inteiro e uma
+    importação longa bloquearia as vendas até o commit.
+
+    Se o processo cair entre o commit e o incremento, ou se o incremento
+    falhar (`robust=True` apenas registra o erro), a divergência é
+    corrigida por `check_metrics_rollups --fix`.
+    """
+    transaction.on_commit(
+        partial(_apply_increment, model, lookup, deltas), robust=True
+    )
+
+
+def _apply_increment(
+    model: Any, lookup: dict[str, Any], deltas: dict[str, Any]
+) -> None:
+    """Aplica incrementos atômicos (F()) criando a linha se necessário."""
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    updates["updated_at"] = timezone.now()
+
+    if model.objects.filter(**lookup).update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Outra transação criou a linha entre o UPDATE e o INSERT
+        model.objects.filter(**lookup).update(**updates)
+
+
+def stock_position(
+    quantity: Any = 0, cost_price: Any = 0, sell_price: Any = 0
+) -> tuple[int, Decimal, Decimal]:
+    """Retorna (quantidade, valor de custo, valor de venda) de um produto."""
+    quantity = int(quantity or 0)
+    return (
+        quantity,
+        Decimal(str(cost_price or 0)) * quantity,
+        Decimal(str(sell_price or 0)) * quantity,
+    )
+
+
+def apply_sales_delta(
+    day: date,
+    sales_count: int,
+    quantity: int,
+    cost: Decimal,
+    revenue: Decimal,
+) -> None:
+    """Soma (ou subtrai, com valores negativos) vendas ao consolidado."""
+    _increment(
+        DailySalesRollup,
+        {"date": day},
+        sales_count=sales_count,
+        quantity=quantity,
+        total_cost_price=cost,
+        total_sell_price=revenue,
+    )
+
+
+def apply_inventory_delta(
+    quantity: int, cost: Decimal, revenue: Decimal
+) -> None:
+    """Soma (ou subtrai) uma variação à posição consolidada do estoque."""
+    if not (quantity or cost or revenue):
+        return
+
+    _increment(
+        InventorySnapshot,
+        {"pk": InventorySnapshot.SINGLETON_PK},
+        total_quantity=quantity,
+        total_cost_price=cost,
+        total_sell_price=revenue,
+    )
+
+
+def record_outflow(
+    outflow: Outflows, quantity: int, sales_count: int = 1
+) -> None:
+    """Registra `quantity` unidades da saída no consolidado do seu dia."""
+    product = outflow.product
+    _, cost, revenue = stock_position(
+        quantity, product.cost_price, product.sell_price
+    )
+    apply_sales_delta(
+        timezone.localdate(outflow.created_at),
+        sales_count,
+        quantity,
+        cost,
+        revenue,
+    )
+
+
+def record_outflows(
+    outflows: Iterable[Outflows], prices: dict[int, tuple[Decimal, Decimal]]
+) -> None:
+    """
+    Registra várias saídas recém-criadas (ex: `bulk_create`, que não
+    dispara signals) com um único incremento por dia.
+    :param prices: (preço de custo, preço de venda) por id de produto.
+    """
+    days: dict[date, list[Any]] = defaultdict(
+        lambda: [0, 0, Decimal("0"), Decimal("0")]
+    )
+    for outflow in outflows:
+        _, cost, revenue = stock_position(
+            outflow.quantity, *prices[outflow.product_id]
+        )
+        totals = days[timezone.localdate(outflow.created_at)]
+        totals[0] += 1
+        totals[1] += outflow.quantity
+        totals[2] += cost
+        totals[3] += revenue
+
+    for day, totals in days.items():
+        apply_sales_delta(day, *totals)
+
+
+def aggregate_daily_sales() -> dict[date, dict[str, Any]]:
+    """Recalcula os totais diários de vendas a partir do histórico."""
+    cost = F("product__cost_price") * F("quantity")
+    revenue = F("product__sell_price") * F("quantity")
+
+    rows = (
+        Outflows.objects
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            sales_count=Count("id"),
+            total_quantity=Sum("quantity"),
+            total_cost=Sum(cost, output_field=MONEY_FIELD),
+            total_revenue=Sum(revenue, output_field=MONEY_FIELD),
+        )
+        .order_by("day")
+    )
+    return {
+        row["day"]: {
+            "sales_count": row["sales_count"],
+            "quantity": row["total_quantity"],
+            "total_cost_price": row["total_cost"],
+            "total_sell_price": row["total_revenue"],
+        }
+        for row in rows
+    }
+
+
+def aggregate_inventory() -> dict[str, Any]:
+    """Recalcula a posição do estoque a partir da tabela de produtos."""
+    return Product.objects.aggregate(
+        total_quantity=Coalesce(Sum("quantity"), 0),
+        total_cost_price=Coalesce(
+            Sum(F("cost_price") * F("quantity"), output_field=MONEY_FIELD),
+            ZERO,
+        ),
+        total_sell_price=Coalesce(
+            Sum(F("sell_price") * F("quantity"), output_field=MONEY_FIELD),
+            ZERO,
+        ),
+    )
+
+
+@transaction.atomic
+def rebuild_rollups() -> dict[str, int]:
+    """Reconstrói todos os consolidados a partir do histórico."""
+    daily_sales = aggregate_daily_sales()
+
+    DailySalesRollup.objects.all().delete()
+    DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(date=day, **totals)
+            for day, totals in daily_sales.items()
+        ],
+        batch_size=1000,
+    )
+    InventorySnapshot.objects.update_or_create(
+        pk=InventorySnapshot.SINGLETON_PK,
+        defaults=aggregate_inventory(),
+    )
+
+    return {"days": len(daily_sales)}
+
+
+def check_rollups() -> list[str]:
+    """
+    Compara os consolidados com o recálculo a partir do histórico.
+    :return: Lista de divergências encontradas (vazia se consistente).
+    """
+    problems = []
+
+    expected_sales = aggregate_daily_sales()
+    actual_sales = {
+        rollup["date"]: rollup
+        for rollup in DailySalesRollup.objects.values(
+            "date", *SALES_CHECK_FIELDS
+        )
+    }
+    for day in sorted(set(expected_sales) | set(actual_sales)):
+        expected = expected_sales.get(day, {})
+        actual = actual_sales.get(day, {})
+        for field in SALES_CHECK_FIELDS:
+            if expected.get(field, 0) != actual.get(field, 0):
+                problems.append(
+                    f"{day} {field}: esperado {expected.get(field, 0)}, "
+                    f"encontrado {actual.get(field, 0)}"
+                )
+
+    expected_inventory = aggregate_inventory()
+    actual_inventory = (
+        InventorySnapshot.objects
+        .filter(pk=InventorySnapshot.SINGLETON_PK)
+        .values(*INVENTORY_FIELDS)
+        .first()
+    ) or dict.fromkeys(INVENTORY_FIELDS, 0)
+    for field in INVENTORY_FIELDS:
+        if expected_inventory[field] != actual_inventory[field]:
+            problems.append(
+                f"estoque {field}: esperado {expected_inventory[field]}, "
+                f"encontrado {actual_inventory[field]}"
+            )
+
+    return problems
@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+from typing import Any
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from app.services import compression
+from app.services.export_data import EXPORT_CHUNK_SIZE, DataExportService
+from notifications.models import TaskNotification
+
+# Quantas linhas cada shard exporta, no mínimo, antes de valer a pena
+# dividir a tabela, e em quantos shards (no máximo) ela é dividida.
+DEFAULT_SHARD_ROWS = 100_000
+DEFAULT_MAX_SHARDS = 8
+
+
+def shard_ranges(
+    queryset: Any,
+    shard_rows: int | None = None,
+    max_shards: int | None = None,
+) -> list[tuple[Any, Any]]:
+    """
+    Divide o queryset em faixas de chave primária `[início, fim)` com
+    aproximadamente o mesmo número de linhas. As extremidades são `None`
+    (faixa aberta), de modo que linhas criadas durante a exportação não
+    ficam de fora de nenhum shard.
+    :return: Lista de faixas; uma única faixa quando não vale a pena dividir.
+    """
+    shard_rows = shard_rows or getattr(
+        settings, "EXPORT_SHARD_ROWS", DEFAULT_SHARD_ROWS
+    )
+    max_shards = max_shards or getattr(
+        settings, "EXPORT_MAX_SHARDS", DEFAULT_MAX_SHARDS
+    )
+
+    total = queryset.count()
+    shards = min(max_shards, -(-total // shard_rows))
+    if shards <= 1:
+        return [(None, None)]
+
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    bounds = [pks[total * k // shards] for k in range(1, shards)]
+    return list(zip([None, *bounds], [*bounds, None], strict=True))
+
+
+def shard_queryset(queryset: Any, start: Any, end: Any) -> Any:
+    """Restringe o queryset à faixa `[start, end)`, em ordem de pk."""
+    if start is not None:
+        queryset = queryset.filter(pk__gte=start)
+    if end is not None:
+        queryset = queryset.filter(pk__lt=end)
+    return queryset.order_by("pk")
+
+
+def shard_dir(task_id: str) -> str:
+    """Diretório (no volume compartilhado) com as partes de uma exportação."""
+    return os.path.join(settings.MEDIA_ROOT, "temp", "exports", task_id)
+
+
+def shard_path(task_id: str, index: int, file_format: str) -> str:
+    return os.path.join(shard_dir(task_id), f"part-{index:04d}.{file_format}")
+
+
+def write_shard(
+    queryset: Any,
+    file_format: str,
+    path: str,
+    index: int,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> int:
+    """
+    Exporta um shard para `path`. Só o primeiro shard grava o cabeçalho do
+    CSV, então as partes podem ser simplesmente concatenadas.
+    :return: Número de registros exportados.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if file_format == "csv":
+            return DataExportService.write_csv(
+                queryset, file, chunk_size, header=index == 0
+            )
+        if file_format == "ndjson":
+            return DataExportService.write_ndjson(queryset, file, chunk_size)
+    raise ValueError(f"Formato não suportado: {file_format}")
+
+
+def combine_shards(
+    paths: list[str], file_field: Any, name: str, codec: str = ""
+) -> None:
+    """
+    Concatena as partes (na ordem dada), comprimindo com `codec`, e salva o
+    resultado no storage.
+    """
+    with tempfile.TemporaryFile() as tmp:
+        with compression.open_writer(tmp, codec) as stream:
+            for path in paths:
+                with open(path, "rb") as part:
+                    shutil.copyfileobj(part, stream)
+        tmp.seek(0)
+        file_field.save(name, File(tmp), save=False)
+
+
+def remove_shards(task_id: str) -> None:
+    shutil.rmtree(shard_dir(task_id), ignore_errors=True)
+
+
+def init_progress(notification_id: int, shards: int) -> None:
+    TaskNotification.objects.filter(pk=notification_id).update(
+        progress={
+            "stage": "exporting",
+            "shards": [
+                {"status": "pending", "rows": 0} for _ in range(shards)
+            ],
+        }
+    )
+
+
+def update_shard_progress(
+    notification_id: int, index: int, status: str, rows: int = 0
+) -> None:
+    """
+    Atualiza o andamento de um shard. Os shards rodam em paralelo, então a
+    leitura e a escrita do JSON são feitas com a linha bloqueada.
+    """
+    with transaction.atomic():
+        notification = TaskNotification.objects.select_for_update().get(
+            pk=notification_id
+        )
+        shards = notification.progress.get("shards", [])
+        if index < len(shards):
+            shards[index] = {"status": status, "rows": rows}
+        notification.save(update_fields=["progress", "updated_at"])
@@ -0,0 +1,223 @@
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from decimal import Decimal
+from typing import Any
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app.services import caching, ledger, rollups
+from products.models import Product
+
+# Sentido do efeito de cada movimentação sobre o estoque do produto.
+STOCK_DIRECTIONS = {
+    "inflows.Inflows": 1,
+    "outflows.Outflows": -1,
+}
+
+
+class InsufficientStockError(Exception):
+    """Saída maior que o estoque disponível do produto no momento."""
+
+    def __init__(self, product_id: int, requested: int) -> None:
+        self.product_id = product_id
+        self.requested = requested
+        title, available = (
+            Product.objects
+            .filter(pk=product_id)
+            .values_list("title", "quantity")
+            .first()
+        ) or ("", 0)
+        self.available = available
+        super().__init__(insufficient_stock_message(title, available))
+
+
+def insufficient_stock_message(title: str, available: int) -> str:
+    return (
+        "A quantidade de saída não pode ser maior que "
+        "a quantidade em estoque. "
+        f"Produto: {title}. "
+        f"Quantidade em estoque: {available}. "
+    )
+
+
+def product_prices(
+    product_ids: Iterable[int],
+) -> dict[int, tuple[Decimal, Decimal]]:
+    """Retorna (preço de custo, preço de venda) por id de produto."""
+    return {
+        pk: (cost_price, sell_price)
+        for pk, cost_price, sell_price in Product.objects.filter(
+            pk__in=set(product_ids)
+        ).values_list("pk", "cost_price", "sell_price")
+    }
+
+
+def stock_deltas(movements: Iterable[Any], direction: int) -> dict[int, int]:
+    """Soma as quantidades das movimentações por produto."""
+    deltas: dict[int, int] = defaultdict(int)
+    for movement in movements:
+        # Mesmo critério dos signals: quantidade zero não altera o estoque
+        if movement.quantity > 0:
+            deltas[movement.product_id] += direction * movement.quantity
+    return deltas
+
+
+def apply_stock_deltas(
+    deltas: dict[int, int],
+    prices: dict[int, tuple[Decimal, Decimal]] | None = None,
+) -> None:
+    """
+    Aplica variações de estoque com um `UPDATE quantity = quantity + delta`
+    por produto e atualiza a posição consolidada do estoque.
+
+    Baixas são condicionais (`WHERE quantity >= -delta`): o banco decide,
+    de forma atômica mesmo com saídas simultâneas, se há estoque. Sem
+    estoque, levanta `InsufficientStockError`; o chamador deve estar em uma
+    transação para desfazer a movimentação (e as baixas já aplicadas).
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    if prices is None:
+        prices = product_prices(deltas)
+
+    now = timezone.now()
+    totals = [0, Decimal("0"), Decimal("0")]
+    # Sempre na ordem das chaves: duas importações (ou lotes) simultâneas
+    # travam as linhas na mesma sequência e não entram em deadlock
+    for pk in sorted(deltas):
+        delta = deltas[pk]
+        products = Product.objects.filter(pk=pk)
+        if delta < 0:
+            products = products.filter(quantity__gte=-delta)
+        if not products.update(quantity=F("quantity") + delta, updated_at=now):
+            raise InsufficientStockError(pk, -delta)
+        position = rollups.stock_position(delta, *prices[pk])
+        totals = [
+            total + value
+            for total, value in zip(totals, position, strict=True)
+        ]
+
+    rollups.apply_inventory_delta(*totals)
+
+
+def apply_movement(movement: Any) -> None:
+    """
+    Aplica ao estoque uma movimentação recém-criada (usado pelos signals).
+    O `UPDATE quantity = quantity ± n` é resolvido pelo banco, sem
+    ler-modificar-gravar o produto: movimentações simultâneas do mesmo
+    produto não perdem atualizações nem regravam as demais colunas.
+    """
+    direction = STOCK_DIRECTIONS[movement._meta.label]
+    if movement.quantity <= 0:
+        return
+
+    product = movement.product
+    # O livro-razão é gravado sob o bloqueio da linha do produto
+    with transaction.atomic():
+        apply_stock_deltas(
+            {product.pk: direction * movement.quantity},
+            {product.pk: (product.cost_price, product.sell_price)},
+        )
+        ledger.record_movements([movement], movement._meta.label, direction)
+    # O UPDATE não dispara os signals do produto
+    caching.invalidate_model(Product)
+    product.refresh_from_db(fields=["quantity", "updated_at"])
+
+
+def apply_bulk_create_effects(
+    model_class: Any, objects: Sequence[Any]
+) -> None:
+    """
+    Reproduz, em lote, os efeitos que os signals de criação teriam para
+    objetos inseridos com `bulk_create` (que não dispara signals).
+    """
+    label = model_class._meta.label
+
+    if label == "products.Product":
+        totals = [0, Decimal("0"), Decimal("0")]
+        for product in objects:
+            position = rollups.stock_position(
+                product.quantity, product.cost_price, product.sell_price
+            )
+            totals = [
+                total + value
+                for total, value in zip(totals, position, strict=True)
+            ]
+        rollups.apply_inventory_delta(*totals)
+        ledger.record_adjustments({
+            product.pk: product.quantity for product in objects
+        })
+        return
+
+    if label not in STOCK_DIRECTIONS:
+        return
+
+    prices = product_prices(obj.product_id for obj in objects)
+    apply_stock_deltas(stock_deltas(objects, STOCK_DIRECTIONS[label]), prices)
+    ledger.record_movements(objects, label, STOCK_DIRECTIONS[label])
+    if label == "outflows.Outflows":
+        rollups.record_outflows(objects, prices)
+
+
+def split_by_stock(outflows: Sequence[Any]) -> tuple[list[Any], list[Any]]:
+    """
+    Separa, na ordem recebida, as saídas (ainda não gravadas) que cabem no
+    estoque das que não cabem. Bloqueia os produtos até o fim da transação
+    (em ordem de id, evitando deadlocks entre lotes), então a baixa das
+    aceitas em seguida não falha.
+    :return: (aceitas, recusadas); cada recusada recebe `available` com o
+    estoque restante do produto naquele ponto do lote.
+    """
+    available = dict(
+        Product.objects
+        .select_for_update()
+        .filter(pk__in={outflow.product_id for outflow in outflows})
+        .order_by("pk")
+        .values_list("pk", "quantity")
+    )
+    accepted, rejected = [], []
+    for outflow in outflows:
+        if outflow.quantity <= available[outflow.product_id]:
+            available[outflow.product_id] -= outflow.quantity
+            accepted.append(outflow)
+        else:
+            outflow.available = available[outflow.product_id]
+            rejected.append(outflow)
+    return accepted, rejected
+
+
+def apply_bulk_update_effects(
+    model_class: Any, previous: dict[int, Any], objects: Sequence[Any]
+) -> None:
+    """
+    Reproduz, em lote, os efeitos que os signals de edição teriam para
+    objetos gravados com `bulk_update`. Para produtos: a variação da
+    posição consolidada do estoque e os ajustes de quantidade no
+    livro-razão.
+    :param previous: Cópia de cada objeto (por id) antes da edição, lida
+    sob bloqueio na mesma transação.
+    """
+    if model_class._meta.label != "products.Product":
+        return
+
+    totals = [0, Decimal("0"), Decimal("0")]
+    for product in objects:
+        before = previous[product.pk]
+        current = rollups.stock_position(
+            product.quantity, product.cost_price, product.sell_price
+        )
+        old = rollups.stock_position(
+            before.quantity, before.cost_price, before.sell_price
+        )
+        totals = [
+            total + new - value
+            for total, new, value in zip(totals, current, old, strict=True)
+        ]
+    rollups.apply_inventory_delta(*totals)
+    ledger.record_adjustments({
+        product.pk: product.quantity - previous[product.pk].quantity
+        for product in objects
+    })
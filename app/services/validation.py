@@ -0,0 +1,199 @@
+from collections.abc import Callable
+from operator import itemgetter
+from typing import Any
+
+import pandas as pd
+from django.core.exceptions import ValidationError
+from django.core.validators import (
+    DecimalValidator,
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinValueValidator,
+    ProhibitNullCharactersValidator,
+)
+from django.db import models
+
+# Validadores que sabemos aplicar por coluna. Campos com qualquer outro
+# validador (customizado) fazem a importação recorrer ao `full_clean()`.
+VECTORIZED_VALIDATORS = (
+    DecimalValidator,
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinValueValidator,
+    ProhibitNullCharactersValidator,
+)
+
+
+def map_distinct(column: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """Aplica `func` uma única vez por valor distinto da coluna."""
+    results: dict[Any, Any] = {}
+
+    def apply(value: Any) -> Any:
+        try:
+            # O tipo faz parte da chave: 1, 1.0 e True são iguais em dict
+            key = (type(value), value)
+            if key not in results:
+                results[key] = func(value)
+            return results[key]
+        except TypeError:  # valor não hashable (ex: lista em um JSON)
+            return func(value)
+
+    return column.map(apply)
+
+
+def _limit(validator: Any) -> Any:
+    limit = validator.limit_value
+    return limit() if callable(limit) else limit
+
+
+def _empty_mask(values: pd.Series) -> pd.Series:
+    return values.isna() | values.isin([""])
+
+
+class ColumnValidator:
+    """
+    Validação por coluna equivalente ao `clean_fields()` do modelo.
+
+    As regras são derivadas de `_meta.fields` (null/blank, choices,
+    max_length, dígitos/casas decimais, faixas de inteiros) e aplicadas como
+    máscaras do pandas sobre a coluna inteira; a conversão (`to_python`) é
+    feita uma vez por valor distinto. Só as células sinalizadas pelas
+    máscaras passam por `field.clean()`, que produz a mensagem de erro, de
+    modo que as mensagens são idênticas às do `full_clean()`.
+    """
+
+    def __init__(self, model_class: Any) -> None:
+        self.model_class = model_class
+        self.fields = [
+            field
+            for field in model_class._meta.fields
+            if not getattr(field, "generated", False)
+        ]
+
+    def supported(self) -> bool:
+        """
+        Indica se o modelo pode ser validado por coluna. Validadores
+        customizados, `clean()` sobrescrito e restrições de unicidade
+        (que exigem consultas) recorrem ao `full_clean()` linha a linha.
+        """
+        meta = self.model_class._meta
+        if self.model_class.clean is not models.Model.clean:
+            return False
+        if meta.unique_together or meta.constraints:
+            return False
+        for field in self.fields:
+            if field.unique and not field.primary_key:
+                return False
+            if field.unique_for_date or field.unique_for_month:
+                return False
+            if field.unique_for_year:
+                return False
+            if not all(
+                isinstance(validator, VECTORIZED_VALIDATORS)
+                for validator in field.validators
+            ):
+                return False
+        return True
+
+    @staticmethod
+    def _to_python(field: Any, value: Any) -> tuple[Any, Any]:
+        try:
+            return field.to_python(value), None
+        except ValidationError as e:
+            return None, e.error_list
+
+    def _flag(self, field: Any, values: pd.Series) -> pd.Series:
+        """Marca as células que podem violar alguma regra do campo."""
+        empty = _empty_mask(values)
+        flagged = pd.Series(False, index=values.index)
+
+        if not field.editable:
+            return flagged
+        if field.choices is not None:
+            choices = [choice for choice, _ in field.flatchoices]
+            flagged |= ~empty & ~values.isin(choices)
+        if not field.null:
+            flagged |= values.isna()
+        if not field.blank:
+            flagged |= empty
+
+        filled = values[~empty]
+        if filled.empty:
+            return flagged
+
+        for validator in field.validators:
+            if isinstance(validator, MaxLengthValidator):
+                mask = filled.astype(str).str.len() > _limit(validator)
+            elif isinstance(validator, MinValueValidator):
+                mask = filled < _limit(validator)
+            elif isinstance(validator, MaxValueValidator):
+                mask = filled > _limit(validator)
+            elif isinstance(validator, ProhibitNullCharactersValidator):
+                mask = filled.astype(str).str.contains("\x00", regex=False)
+            else:
+                # Dígitos/casas decimais dependem do expoente de cada valor
+                mask = map_distinct(
+                    filled, lambda value, v=validator: _fails(v, value)
+                )
+            flagged |= mask.reindex(values.index, fill_value=False).astype(
+                bool
+            )
+
+        return flagged
+
+    def validate(
+        self, df: pd.DataFrame
+    ) -> tuple[pd.DataFrame, dict[Any, dict[str, list[ValidationError]]]]:
+        """
+        Valida e converte as colunas de `df` (uma por `attname`).
+        :return: DataFrame com os valores convertidos e os erros por linha,
+        no formato de `full_clean()` ({campo: [erros]}).
+        """
+        errors: dict[Any, dict[str, list[ValidationError]]] = {}
+        converted = {}
+
+        for field in self.fields:
+            if field.attname in df:
+                raw = df[field.attname]
+            else:
+                # Campo ausente do arquivo: o modelo usará o valor padrão
+                raw = pd.Series(
+                    [field.get_default()] * len(df),
+                    index=df.index,
+                    dtype=object,
+                )
+
+            # `clean_fields()` ignora campos opcionais vazios
+            checked = raw[~_empty_mask(raw)] if field.blank else raw
+            results = map_distinct(
+                checked, lambda value, f=field: self._to_python(f, value)
+            )
+            values = results.map(itemgetter(0))
+            failures = results.map(itemgetter(1))
+
+            invalid = failures.notna()
+            for index in invalid[invalid].index:
+                errors.setdefault(index, {})[field.name] = failures[index]
+
+            valid = values[~invalid]
+            flagged = self._flag(field, valid)
+            for index in flagged[flagged].index:
+                try:
+                    field.clean(raw[index], None)
+                except ValidationError as e:
+                    errors.setdefault(index, {})[field.name] = e.error_list
+
+            if field.attname in df:
+                column = raw.copy()
+                column[valid.index] = valid
+                converted[field.attname] = column
+
+        return pd.DataFrame(converted, index=df.index), errors
+
+
+def _fails(validator: Any, value: Any) -> bool:
+    try:
+        validator(value)
+    except ValidationError:
+        return True
+    return False
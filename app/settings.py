@@ -15,6 +15,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import sentry_sdk
+from celery.schedules import crontab
 from dotenv import load_dotenv
 from sentry_sdk.integrations.django import DjangoIntegration
 
@@ -76,6 +77,7 @@ INSTALLED_APPS = [
     "products",
     "inflows",
     "outflows",
+    "dashboard",
 ]
 
 LOGIN_URL = "login"
@@ -106,6 +108,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "app.context_processors.export_formats",
             ],
         },
     },
@@ -148,6 +151,36 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Sao_Paulo"
 
+# Exportações CSV/NDJSON acima de EXPORT_SHARD_ROWS linhas são divididas em
+# faixas de pk exportadas em paralelo (até EXPORT_MAX_SHARDS shards).
+EXPORT_SHARD_ROWS = int(os.getenv("EXPORT_SHARD_ROWS", "100000"))
+EXPORT_MAX_SHARDS = int(os.getenv("EXPORT_MAX_SHARDS", "8"))
+# Exportações em PDF acima deste número de linhas falham (use CSV/Parquet).
+PDF_EXPORT_MAX_ROWS = int(os.getenv("PDF_EXPORT_MAX_ROWS", "20000"))
+# Compressão das exportações CSV/NDJSON/JSON/XML: "gzip", "zstd" (requer o
+# pacote zstandard) ou "" para desativar.
+EXPORT_COMPRESSION = os.getenv("EXPORT_COMPRESSION", "gzip")
+
+# Retenção (tarefa `cleanup_expired_data`, diária via beat)
+EXPORT_RETENTION_DAYS = int(os.getenv("EXPORT_RETENTION_DAYS", "7"))
+NOTIFICATION_RETENTION_DAYS = int(
+    os.getenv("NOTIFICATION_RETENTION_DAYS", "30")
+)
+TASK_RESULT_RETENTION_DAYS = int(os.getenv("TASK_RESULT_RETENTION_DAYS", "7"))
+TEMP_FILE_RETENTION_HOURS = int(os.getenv("TEMP_FILE_RETENTION_HOURS", "24"))
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", "500"))
+
+CELERY_BEAT_SCHEDULE = {
+    "cleanup-expired-data": {
+        "task": "app.tasks.cleanup_expired_data",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "create-stock-checkpoints": {
+        "task": "app.tasks.create_stock_checkpoints",
+        "schedule": crontab(hour=2, minute=0),
+    },
+}
+
 # Cache Configuration (Redis)
 if os.getenv("POSTGRES_DB"):
     CACHES = {
@@ -240,8 +273,23 @@ REST_FRAMEWORK = {
         "auth": "5/min",
     },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "app.pagination.KeysetPagination",
+    "DEFAULT_FILTER_BACKENDS": (
+        "app.filters.QueryParamFilter",
+        "app.filters.OrderingFilter",
+        "app.filters.SparseFieldsetFilter",
+        "app.filters.ExpandFilter",
+    ),
 }
 
+# Paginação das APIs de listagem (o cliente pode pedir ?page_size= até o
+# máximo).
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+# Itens aceitos por requisição nos endpoints de lote (/bulk/).
+API_BULK_MAX_ITEMS = int(os.getenv("API_BULK_MAX_ITEMS", "1000"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -1,14 +1,25 @@
 import logging
 import os
 
-from celery import shared_task
+from celery import chord, shared_task
 from django.apps import apps
-from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.utils import timezone
 
-from app.services import metrics
-from app.services.export_data import DataExportService
+from app.services import (
+    artifacts,
+    caching,
+    compression,
+    ledger,
+    metrics,
+    retention,
+    sharded_export,
+)
+from app.services.export_data import (
+    STORAGE_FORMATS,
+    STREAMING_FORMATS,
+    DataExportService,
+)
 from app.services.import_data import DataImportService
 from notifications.models import TaskNotification
 
@@ -59,28 +70,80 @@ def export_data_async(self, notification_id):
         timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{model_name.lower()}_{timestamp}"
 
+        codec = compression.export_codec(file_format)
+        file_name = f"{filename}.{file_format}{compression.suffix(codec)}"
+
+        # Dados inalterados desde uma exportação idêntica: reaproveita o
+        # arquivo já gerado em vez de exportar de novo
+        notification.fingerprint = artifacts.export_fingerprint(
+            model_class, file_format, codec
+        )
+        notification.content_encoding = codec
+        artifact = artifacts.find_reusable_export(
+            notification.fingerprint, exclude_pk=notification.pk
+        )
+        if artifact is not None:
+            notification.file_path.name = artifact.file_path.name
+            notification.content_encoding = artifact.content_encoding
+            notification.record_count = artifact.record_count
+            notification.status = "completed"
+            notification.completed_at = timezone.now()
+            notification.save()
+            return {
+                "status": "success",
+                "count": artifact.record_count,
+                "reused": True,
+            }
+        notification.save(update_fields=["fingerprint", "content_encoding"])
+
+        # CSV/NDJSON/Parquet/Arrow/PDF: gravados direto no storage
+        if file_format in STORAGE_FORMATS:
+            # Tabelas grandes: faixas de pk exportadas em paralelo (só os
+            # formatos de texto podem ser concatenados)
+            ranges = [(None, None)]
+            if file_format in STREAMING_FORMATS:
+                ranges = sharded_export.shard_ranges(queryset)
+            if len(ranges) > 1:
+                sharded_export.init_progress(notification.pk, len(ranges))
+                chord(
+                    export_shard.s(
+                        notification.pk,
+                        model_class._meta.label,
+                        file_format,
+                        index,
+                        start,
+                        end,
+                    )
+                    for index, (start, end) in enumerate(ranges)
+                )(combine_export_shards.s(notification.pk, file_name))
+                return {"status": "sharded", "shards": len(ranges)}
+
+            count = DataExportService.export_to_storage(
+                queryset,
+                file_format,
+                notification.file_path,
+                file_name,
+                codec=codec,
+            )
+            notification.record_count = count
+            notification.status = "completed"
+            notification.completed_at = timezone.now()
+            notification.save()
+            return {"status": "success", "count": count}
+
         # Gerar conteúdo baseado no formato
-        if file_format == "csv":
-            response = DataExportService.export_to_csv(queryset, filename)
-        elif file_format == "json":
+        if file_format == "json":
             response = DataExportService.export_to_json(queryset, filename)
         elif file_format == "xml":
             response = DataExportService.export_to_xml(queryset, filename)
-        elif file_format == "pdf":
-            context = {
-                "queryset": queryset,
-                "model_name": model_class._meta.verbose_name,
-            }
-            response = DataExportService.export_to_pdf(
-                queryset, "generic_list_pdf.html", context, filename
-            )
         else:
             raise ValueError(f"Formato não suportado: {file_format}")
 
         # Salvar arquivo
-        file_name = f"{filename}.{file_format}"
         notification.file_path.save(
-            file_name, ContentFile(response.content), save=False
+            file_name,
+            ContentFile(compression.compress_bytes(response.content, codec)),
+            save=False,
         )
         notification.record_count = queryset.count()
         notification.status = "completed"
@@ -93,7 +156,81 @@ def export_data_async(self, notification_id):
         notification.status = "failed"
         notification.error_message = str(e)
         notification.completed_at = timezone.now()
+        # Não sobrescreve o progresso gravado pelos shards
+        notification.save(
+            update_fields=[
+                "status",
+                "error_message",
+                "completed_at",
+                "updated_at",
+            ]
+        )
+        raise
+
+
+def _fail_notification(notification_id, error):
+    TaskNotification.objects.filter(pk=notification_id).update(
+        status="failed",
+        error_message=str(error),
+        completed_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+@shared_task(name="app.tasks.export_shard")
+def export_shard(notification_id, model_label, file_format, index, start, end):
+    """Exporta uma faixa de pk `[start, end)` para um arquivo parcial."""
+    try:
+        sharded_export.update_shard_progress(
+            notification_id, index, "processing"
+        )
+        queryset = sharded_export.shard_queryset(
+            apps.get_model(model_label).objects.all(), start, end
+        )
+        task_id = TaskNotification.objects.values_list(
+            "task_id", flat=True
+        ).get(pk=notification_id)
+        path = sharded_export.shard_path(task_id, index, file_format)
+        count = sharded_export.write_shard(queryset, file_format, path, index)
+        sharded_export.update_shard_progress(
+            notification_id, index, "completed", count
+        )
+        return {"index": index, "path": path, "count": count}
+
+    except Exception as e:
+        sharded_export.update_shard_progress(notification_id, index, "failed")
+        _fail_notification(notification_id, e)
+        raise
+
+
+@shared_task(name="app.tasks.combine_export_shards")
+def combine_export_shards(results, notification_id, file_name):
+    """Concatena os shards (callback do chord) no arquivo final."""
+    try:
+        notification = TaskNotification.objects.get(pk=notification_id)
+        results = sorted(results, key=lambda result: result["index"])
+        sharded_export.combine_shards(
+            [result["path"] for result in results],
+            notification.file_path,
+            file_name,
+            notification.content_encoding,
+        )
+        sharded_export.remove_shards(notification.task_id)
+
+        count = sum(result["count"] for result in results)
+        notification.record_count = count
+        notification.progress = {
+            **notification.progress,
+            "stage": "completed",
+            "rows": count,
+        }
+        notification.status = "completed"
+        notification.completed_at = timezone.now()
         notification.save()
+        return {"status": "success", "count": count}
+
+    except Exception as e:
+        _fail_notification(notification_id, e)
         raise
 
 
@@ -137,16 +274,26 @@ def import_data_async(self, notification_id, file_path, mapping_dict=None):
         # Detectar tipo
         file_type = file_path.split(".")[-1].lower()
 
-        # Importar
+        def report_progress(stage, rows):
+            # update() direto: não sobrescreve os demais campos da notificação
+            TaskNotification.objects.filter(pk=notification.pk).update(
+                progress={"stage": stage, "rows": rows},
+                updated_at=timezone.now(),
+            )
+
+        # Importar (em blocos, com memória limitada)
         with open(file_path, "rb") as f:
             service = DataImportService(f, file_type)
-            count = service.transform_and_load(model_class, mapping_dict)
+            count = service.transform_and_load(
+                model_class, mapping_dict, progress=report_progress
+            )
 
         # Limpar arquivo temporário
         os.remove(file_path)
 
         # Atualizar notificação
         notification.record_count = count
+        notification.progress = {"stage": "completed", "rows": count}
         notification.status = "completed"
         notification.completed_at = timezone.now()
         notification.save()
@@ -171,38 +318,35 @@ def import_data_async(self, notification_id, file_path, mapping_dict=None):
 def update_dashboard_metrics_cache():
     """Atualiza cache de métricas do dashboard periodicamente."""
     try:
-        # Cache TTL de 10 minutos (2x o intervalo do beat para segurança)
-        cache_ttl = 60 * 10
+        cache_ttl = metrics.CACHE_TTL
 
         # Atualizar cada métrica no cache
-        cache.set(
-            "metrics:product",
+        caching.set_cached(
+            metrics.cache_key(*metrics.PRODUCT_METRICS_KEY),
             metrics.get_product_metrics_raw(),
             cache_ttl,
         )
-        cache.set(
-            "metrics:sales",
+        caching.set_cached(
+            metrics.cache_key(*metrics.SALES_METRICS_KEY),
             metrics.get_sales_metrics_raw(),
             cache_ttl,
         )
-        cache.set(
-            "metrics:daily_sales",
-            metrics.get_daily_sales_data_raw(),
-            cache_ttl,
-        )
-        cache.set(
-            "metrics:daily_sales_quantity",
-            metrics.get_daily_sales_quantity_data_raw(),
-            cache_ttl,
-        )
-        cache.set(
-            "metrics:products_by_category",
-            metrics.get_products_by_category_raw(),
+        # Séries temporais: todas as janelas/granularidades da home
+        for days in metrics.SALES_PERIODS:
+            for granularity in metrics.SALES_GRANULARITIES:
+                caching.set_cached(
+                    metrics.sales_time_series_cache_key(days, granularity),
+                    metrics.get_sales_time_series_raw(days, granularity),
+                    cache_ttl,
+                )
+        caching.set_cached(
+            metrics.cache_key(*metrics.PRODUCTS_BY_CATEGORY_KEY),
+            metrics.get_products_by_category_raw(metrics.CHART_TOP_N),
             cache_ttl,
         )
-        cache.set(
-            "metrics:products_by_brand",
-            metrics.get_products_by_brand_raw(),
+        caching.set_cached(
+            metrics.cache_key(*metrics.PRODUCTS_BY_BRAND_KEY),
+            metrics.get_products_by_brand_raw(metrics.CHART_TOP_N),
             cache_ttl,
         )
 
@@ -214,3 +358,31 @@ def update_dashboard_metrics_cache():
     except Exception as e:
         logging.error(f"Erro ao atualizar cache de métricas: {e}")
         raise
+
+
+@shared_task(name="app.tasks.cleanup_expired_data")
+def cleanup_expired_data():
+    """
+    Aplica a retenção de arquivos e registros (agendada no beat): arquivos
+    de exportações vencidas, uploads temporários órfãos, notificações e
+    resultados de tasks antigos.
+    """
+    report = retention.run_cleanup()
+    logging.info(
+        "Limpeza concluída: %s bytes e %s linhas liberados",
+        report["bytes_reclaimed"],
+        report["rows_deleted"],
+    )
+    return report
+
+
+@shared_task(name="app.tasks.create_stock_checkpoints")
+def create_stock_checkpoints():
+    """
+    Grava checkpoints do livro-razão do estoque (agendada no beat), para
+    que o saldo em qualquer data seja calculado a partir do checkpoint
+    anterior em vez de todo o histórico.
+    """
+    created = ledger.create_checkpoints()
+    logging.info("Checkpoints de estoque criados: %s", created)
+    return {"checkpoints": created}
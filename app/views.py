@@ -11,20 +11,56 @@ from django.http import JsonResponse
 from django.shortcuts import redirect, render
 from django.views import View
 
-from app.services import metrics
+from app.services import columnar, metrics
 from app.tasks import export_data_async, import_data_async
 from notifications.models import TaskNotification
 
+SALES_GRANULARITY_LABELS = {
+    "day": "Diárias",
+    "week": "Semanais",
+    "month": "Mensais",
+}
+
+
+def _get_sales_chart_options(request) -> tuple[int, str]:
+    """Lê janela e granularidade dos gráficos de vendas da querystring."""
+    try:
+        days = int(request.GET.get("period", metrics.DEFAULT_SALES_PERIOD))
+    except ValueError:
+        days = metrics.DEFAULT_SALES_PERIOD
+    if days not in metrics.SALES_PERIODS:
+        days = metrics.DEFAULT_SALES_PERIOD
+
+    granularity = request.GET.get(
+        "granularity", metrics.DEFAULT_SALES_GRANULARITY
+    )
+    if granularity not in metrics.SALES_GRANULARITIES:
+        granularity = metrics.DEFAULT_SALES_GRANULARITY
+
+    return days, granularity
+
 
 @login_required(login_url="login")
 def home(request):
+    sales_period, sales_granularity = _get_sales_chart_options(request)
+
     product_metrics = metrics.get_product_metrics()
     sales_metrics = metrics.get_sales_metrics()
-    daily_sales_data = metrics.get_daily_sales_data()
-    daily_sales_quantity_data = metrics.get_daily_sales_quantity_data()
+    sales_time_series = metrics.get_sales_time_series(
+        sales_period, sales_granularity
+    )
     products_by_category = metrics.get_products_by_category()
     products_by_brand = metrics.get_products_by_brand()
 
+    daily_sales_data = {
+        "dates": sales_time_series["dates"],
+        "values": sales_time_series["values"],
+    }
+    daily_sales_quantity_data = {
+        "dates": sales_time_series["dates"],
+        "values": sales_time_series["counts"],
+    }
+
     context = {
         "product_metrics": product_metrics,
         "sales_metrics": sales_metrics,
@@ -32,6 +68,11 @@ def home(request):
         "daily_sales_quantity_data": json.dumps(daily_sales_quantity_data),
         "products_by_category": json.dumps(products_by_category),
         "products_by_brand": json.dumps(products_by_brand),
+        "sales_period": sales_period,
+        "sales_granularity": sales_granularity,
+        "sales_periods": metrics.SALES_PERIODS,
+        "sales_granularities": SALES_GRANULARITY_LABELS,
+        "sales_granularity_label": SALES_GRANULARITY_LABELS[sales_granularity],
     }
 
     return render(request, "home.html", context)
@@ -48,12 +89,29 @@ class ExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
 
     def get(self, request, *args, **kwargs):
         file_format = request.GET.get("format", "csv")
-        valid_formats = ["csv", "json", "xml", "pdf"]
+        valid_formats = [
+            "csv",
+            "json",
+            "ndjson",
+            "parquet",
+            "arrow",
+            "xml",
+            "pdf",
+        ]
 
         if file_format not in valid_formats:
             messages.error(request, "Formato de exportação inválido.")
             return redirect(request.META.get("HTTP_REFERER", "/"))
 
+        if (
+            file_format in columnar.COLUMNAR_FORMATS
+            and not columnar.is_available()
+        ):
+            messages.error(
+                request, "Exportação Parquet/Arrow indisponível no servidor."
+            )
+            return redirect(request.META.get("HTTP_REFERER", "/"))
+
         # Enfileirar task assíncrona PRIMEIRO para obter o task_id
         task = export_data_async.apply_async(
             args=[None]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brands", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="brand",
+            index=models.Index(fields=["name", "id"], name="brand_keyset_idx"),
+        ),
+    ]
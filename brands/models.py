@@ -12,6 +12,10 @@ class Brand(models.Model):
         ordering = ["name"]
         verbose_name = "Marca"
         verbose_name_plural = "Marcas"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(fields=["name", "id"], name="brand_keyset_idx"),
+        ]
 
     def __str__(self):
         return self.name
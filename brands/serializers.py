@@ -1,9 +1,8 @@
-from rest_framework import serializers
-
+from app.serializers import FlexFieldsSerializer
 from brands.models import Brand
 
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(FlexFieldsSerializer):
     class Meta:
         model = Brand
         fields = "__all__"
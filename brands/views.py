@@ -2,7 +2,6 @@ from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     PermissionRequiredMixin,
 )
-from django.core.cache import cache
 from django.urls import reverse_lazy
 from django.views.generic import (
     CreateView,
@@ -14,6 +13,7 @@ from django.views.generic import (
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 
+from app.services import caching
 from app.views import ExportView, ImportView
 from brands import forms, models, serializers
 
@@ -41,17 +41,12 @@ class BrandListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
             queryset = queryset.filter(name__icontains=name)
             return queryset
 
-        key = "brands_list_queryset"
-        cached_qs = cache.get(key)
-
-        if cached_qs:
-            return cached_qs
-
-        # Force evaluation to cache the result
-        qs_list = list(queryset)
-        cache.set(key, qs_list, 60 * 15)
-
-        return qs_list
+        # Chave versionada: invalidada por qualquer escrita em Brand
+        return caching.get_or_compute(
+            caching.namespaced_key("brands", "list"),
+            lambda: list(queryset),
+            60 * 15,
+        )
 
 
 class BrandCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView):
@@ -98,6 +93,8 @@ class BrandImportView(ImportView):
 class BrandListCreateAPIView(generics.ListCreateAPIView):
     queryset = models.Brand.objects.all()
     serializer_class = serializers.BrandSerializer
+    filter_fields = {"id": ["exact", "in"], "name": ["exact", "icontains"]}
+    ordering_fields = ("name", "id")
 
     @extend_schema(
         tags=["Brands"],
@@ -12,6 +12,10 @@ class Category(models.Model):
         ordering = ["name"]
         verbose_name = "Categoria"
         verbose_name_plural = "Categorias"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(fields=["name", "id"], name="category_keyset_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -1,9 +1,8 @@
-from rest_framework import serializers
-
+from app.serializers import FlexFieldsSerializer
 from categories.models import Category
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(FlexFieldsSerializer):
     class Meta:
         model = Category
         fields = "__all__"
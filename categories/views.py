@@ -120,6 +120,8 @@ class CategoryListCreateAPIView(
 ):
     queryset = models.Category.objects.all()
     serializer_class = serializers.CategorySerializer
+    filter_fields = {"id": ["exact", "in"], "name": ["exact", "icontains"]}
+    ordering_fields = ("name", "id")
 
     @extend_schema(
         tags=["Categories"],
@@ -0,0 +1,29 @@
+from django.contrib import admin
+
+from dashboard import models
+
+
+# Register your models here.
+class DailySalesRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "date",
+        "sales_count",
+        "quantity",
+        "total_cost_price",
+        "total_sell_price",
+        "updated_at",
+    )
+    list_filter = ("date",)
+
+
+class InventorySnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "total_quantity",
+        "total_cost_price",
+        "total_sell_price",
+        "updated_at",
+    )
+
+
+admin.site.register(models.DailySalesRollup, DailySalesRollupAdmin)
+admin.site.register(models.InventorySnapshot, InventorySnapshotAdmin)
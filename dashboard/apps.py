@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class DashboardConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "dashboard"
+
+    def ready(self):
+        import importlib
+
+        importlib.import_module("dashboard.signals")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services import rollups
+
+
+class Command(BaseCommand):
+    help = "Verifica se os consolidados do dashboard batem com o histórico."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Reconstrói os consolidados quando houver divergências.",
+        )
+
+    def handle(self, *args, **options):
+        problems = rollups.check_rollups()
+        if not problems:
+            self.stdout.write(self.style.SUCCESS("Consolidados consistentes."))
+            return
+
+        for problem in problems:
+            self.stderr.write(problem)
+
+        if options["fix"]:
+            rollups.rebuild_rollups()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{len(problems)} divergência(s) corrigida(s)."
+                )
+            )
+            return
+
+        raise CommandError(
+            f"{len(problems)} divergência(s) encontrada(s). "
+            "Execute com --fix para reconstruir."
+        )
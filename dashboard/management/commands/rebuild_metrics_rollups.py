@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app.services import rollups
+
+
+class Command(BaseCommand):
+    help = "Reconstrói os consolidados do dashboard a partir do histórico."
+
+    def handle(self, *args, **options):
+        result = rollups.rebuild_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Consolidados reconstruídos: {result['days']} dia(s) "
+                "de vendas e posição de estoque."
+            )
+        )
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("sales_count", models.IntegerField(default=0)),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "total_cost_price",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=20
+                    ),
+                ),
+                (
+                    "total_sell_price",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=20
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Consolidado Diário de Vendas",
+                "verbose_name_plural": "Consolidados Diários de Vendas",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="InventorySnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_quantity", models.IntegerField(default=0)),
+                (
+                    "total_cost_price",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=20
+                    ),
+                ),
+                (
+                    "total_sell_price",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=20
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Posição de Estoque",
+                "verbose_name_plural": "Posição de Estoque",
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDate
+
+MONEY_FIELD = DecimalField(max_digits=20, decimal_places=2)
+
+
+def build_initial_rollups(apps, schema_editor):
+    """Popula os consolidados com o histórico já existente."""
+    Outflows = apps.get_model("outflows", "Outflows")
+    Product = apps.get_model("products", "Product")
+    DailySalesRollup = apps.get_model("dashboard", "DailySalesRollup")
+    InventorySnapshot = apps.get_model("dashboard", "InventorySnapshot")
+
+    rows = (
+        Outflows.objects
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(
+            sales_count=Count("id"),
+            total_quantity=Sum("quantity"),
+            total_cost=Sum(
+                F("product__cost_price") * F("quantity"),
+                output_field=MONEY_FIELD,
+            ),
+            total_revenue=Sum(
+                F("product__sell_price") * F("quantity"),
+                output_field=MONEY_FIELD,
+            ),
+        )
+        .order_by("day")
+    )
+    DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(
+                date=row["day"],
+                sales_count=row["sales_count"],
+                quantity=row["total_quantity"],
+                total_cost_price=row["total_cost"],
+                total_sell_price=row["total_revenue"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+    inventory = Product.objects.aggregate(
+        total_quantity=Sum("quantity"),
+        total_cost_price=Sum(
+            F("cost_price") * F("quantity"), output_field=MONEY_FIELD
+        ),
+        total_sell_price=Sum(
+            F("sell_price") * F("quantity"), output_field=MONEY_FIELD
+        ),
+    )
+    InventorySnapshot.objects.create(
+        pk=1, **{field: value or 0 for field, value in inventory.items()}
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dashboard", "0001_initial"),
+        ("outflows", "0001_initial"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_initial_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+from django.db import models
+
+
+class DailySalesRollup(models.Model):
+    """Totais diários de vendas, mantidos incrementalmente pelas saídas."""
+
+    date = models.DateField(unique=True)
+    sales_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    total_cost_price = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    total_sell_price = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name = "Consolidado Diário de Vendas"
+        verbose_name_plural = "Consolidados Diários de Vendas"
+
+    def __str__(self):
+        return str(self.date)
+
+
+class InventorySnapshot(models.Model):
+    """Posição consolidada do estoque (linha única, pk=1)."""
+
+    SINGLETON_PK = 1
+
+    total_quantity = models.IntegerField(default=0)
+    total_cost_price = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    total_sell_price = models.DecimalField(
+        max_digits=20, decimal_places=2, default=0
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Posição de Estoque"
+        verbose_name_plural = "Posição de Estoque"
+
+    def __str__(self):
+        return f"Estoque: {self.total_quantity} itens"
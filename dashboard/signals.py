@@ -0,0 +1,74 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from app.services import caching, rollups
+from outflows.models import Outflows
+from products.models import Product
+from products.signals import previous_row
+
+
+@receiver(post_save, sender=Product)
+def update_inventory_snapshot(sender, instance, **kwargs):
+    # A linha anterior é lida uma vez no pre_save de `products.signals`
+    previous = rollups.stock_position(*previous_row(instance))
+    current = rollups.stock_position(
+        instance.quantity, instance.cost_price, instance.sell_price
+    )
+    rollups.apply_inventory_delta(
+        *(new - old for new, old in zip(current, previous, strict=True))
+    )
+
+
+@receiver(post_delete, sender=Product)
+def remove_from_inventory_snapshot(sender, instance, **kwargs):
+    position = rollups.stock_position(
+        instance.quantity, instance.cost_price, instance.sell_price
+    )
+    rollups.apply_inventory_delta(*(-value for value in position))
+
+
+@receiver(pre_save, sender=Outflows)
+def remember_outflow_quantity(sender, instance, **kwargs):
+    instance._previous_quantity = 0
+    if instance.pk:
+        instance._previous_quantity = (
+            Outflows.objects
+            .filter(pk=instance.pk)
+            .values_list("quantity", flat=True)
+            .first()
+        ) or 0
+
+
+@receiver(post_save, sender=Outflows)
+def update_daily_sales_rollup(sender, instance, created, **kwargs):
+    if created:
+        rollups.record_outflow(instance, instance.quantity)
+        return
+
+    delta = instance.quantity - getattr(instance, "_previous_quantity", 0)
+    if delta:
+        rollups.record_outflow(instance, delta, sales_count=0)
+
+
+@receiver(post_delete, sender=Outflows)
+def remove_from_daily_sales_rollup(sender, instance, **kwargs):
+    rollups.record_outflow(instance, -instance.quantity, sales_count=-1)
+
+
+def invalidate_model_cache(sender, **kwargs):
+    caching.invalidate_model(sender)
+
+
+for label in caching.MODEL_NAMESPACES:
+    model = apps.get_model(label)
+    post_save.connect(
+        invalidate_model_cache,
+        sender=model,
+        dispatch_uid=f"invalidate_cache_post_save:{label}",
+    )
+    post_delete.connect(
+        invalidate_model_cache,
+        sender=model,
+        dispatch_uid=f"invalidate_cache_post_delete:{label}",
+    )
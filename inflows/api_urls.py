@@ -13,4 +13,9 @@ urlpatterns = [
         views.InflowRetrieveAPIView.as_view(),
         name="inflow_detail_api_view",
     ),
+    path(
+        "inflows/bulk/",
+        views.InflowBulkCreateAPIView.as_view(),
+        name="inflow_bulk_api_view",
+    ),
 ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inflows", "0001_initial"),
+        ("products", "0003_initial_stock_checkpoints"),
+        ("suppliers", "0002_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="inflows",
+            index=models.Index(
+                fields=["created_at", "id"], name="inflow_keyset_idx"
+            ),
+        ),
+    ]
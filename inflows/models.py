@@ -21,6 +21,12 @@ class Inflows(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Entrada"
         verbose_name_plural = "Entradas"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="inflow_keyset_idx"
+            ),
+        ]
 
     def __str__(self):
         return str(self.product)
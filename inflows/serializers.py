@@ -1,9 +1,15 @@
-from rest_framework import serializers
-
+from app.serializers import FlexFieldsSerializer
 from inflows.models import Inflows
+from products.serializers import ProductSerializer
+from suppliers.serializers import SupplierSerializer
+
 
+class InflowSerializer(FlexFieldsSerializer):
+    expandable_fields = {
+        "product": ProductSerializer,
+        "supplier": SupplierSerializer,
+    }
 
-class InflowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Inflows
         fields = "__all__"
@@ -11,6 +11,8 @@ from django.views.generic import (
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 
+from app.bulk import BulkCreateAPIView
+from app.filters import RANGE_LOOKUPS
 from app.services import metrics
 from app.views import ExportView, ImportView
 from brands.models import Brand
@@ -102,6 +104,13 @@ class InflowImportView(ImportView):
 class InflowListCreateAPIView(generics.ListCreateAPIView):
     queryset = models.Inflows.objects.all()
     serializer_class = serializers.InflowSerializer
+    filter_fields = {
+        "id": ["exact", "in"],
+        "product": ["exact", "in"],
+        "supplier": ["exact", "in"],
+        "created_at": RANGE_LOOKUPS,
+    }
+    ordering_fields = ("created_at", "id")
 
     @extend_schema(
         tags=["Inflows"],
@@ -131,3 +140,19 @@ class InflowRetrieveAPIView(generics.RetrieveAPIView):
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
+
+
+class InflowBulkCreateAPIView(BulkCreateAPIView):
+    queryset = models.Inflows.objects.all()
+    serializer_class = serializers.InflowSerializer
+
+    @extend_schema(
+        tags=["Inflows"],
+        summary="Bulk Create Inflows",
+        description=(
+            "Create many inflows from a JSON array or NDJSON body. "
+            "Use ?mode=partial to keep the valid items when others fail."
+        ),
+    )
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
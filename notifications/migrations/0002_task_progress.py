@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tasknotification",
+            name="progress",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
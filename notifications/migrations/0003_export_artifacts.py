@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0002_task_progress"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tasknotification",
+            name="content_encoding",
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name="tasknotification",
+            name="fingerprint",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name="tasknotification",
+            index=models.Index(
+                fields=["fingerprint", "status"],
+                name="notificatio_fingerp_e0db89_idx",
+            ),
+        ),
+    ]
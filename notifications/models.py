@@ -46,6 +46,11 @@ class TaskNotification(models.Model):
         blank=True,
         null=True,
     )
+    # Compressão do arquivo (valor do Content-Encoding; vazio = nenhuma)
+    content_encoding = models.CharField(max_length=10, blank=True)
+    # Impressão digital (modelo, formato, versão das tabelas) usada para
+    # reaproveitar o arquivo de uma exportação idêntica
+    fingerprint = models.CharField(max_length=64, blank=True)
 
     # Resultados
     record_count = models.IntegerField(
@@ -55,6 +60,11 @@ class TaskNotification(models.Model):
     error_message = models.TextField(
         blank=True,
     )
+    # Andamento de tarefas longas (ex: {"stage": "loading", "rows": 5000})
+    progress = models.JSONField(
+        default=dict,
+        blank=True,
+    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -72,6 +82,7 @@ class TaskNotification(models.Model):
         indexes = [
             models.Index(fields=["user", "is_read"]),
             models.Index(fields=["task_id"]),
+            models.Index(fields=["fingerprint", "status"]),
         ]
 
     def __str__(self):
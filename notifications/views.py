@@ -1,9 +1,13 @@
+import mimetypes
+
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import FileResponse, Http404
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.utils.http import content_disposition_header
 from django.views.generic import ListView
 
+from app.services import compression
 from notifications.models import TaskNotification
 
 
@@ -36,11 +40,43 @@ def download_export(request, notification_id):
     notification.is_read = True
     notification.save()
 
-    return FileResponse(
-        notification.file_path.open("rb"),
+    # Arquivos comprimidos são servidos como estão, com Content-Encoding;
+    # clientes que não aceitam o codec recebem o conteúdo descomprimido
+    codec = notification.content_encoding
+    filename = notification.file_path.name.split("/")[-1]
+    filename = filename.removesuffix(compression.suffix(codec))
+    content_type = (
+        mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+    file = notification.file_path.open("rb")
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+    if codec and not compression.accepts(accept_encoding, codec):
+        # O tamanho descomprimido não é conhecido sem ler o arquivo todo,
+        # então a resposta segue em blocos, sem Content-Length
+        response = StreamingHttpResponse(
+            _decompressed_chunks(file, codec), content_type=content_type
+        )
+        response["Content-Disposition"] = content_disposition_header(
+            as_attachment=True, filename=filename
+        )
+        return response
+
+    response = FileResponse(
+        file,
         as_attachment=True,
-        filename=notification.file_path.name.split("/")[-1],
+        filename=filename,
+        content_type=content_type,
     )
+    if codec:
+        response["Content-Encoding"] = codec
+    return response
+
+
+def _decompressed_chunks(file, codec):
+    """Descomprime `file` bloco a bloco, sem carregá-lo em memória."""
+    with file, compression.open_reader(file, codec) as reader:
+        while chunk := reader.read(FileResponse.block_size):
+            yield chunk
 
 
 @login_required
@@ -13,4 +13,9 @@ urlpatterns = [
         views.OutflowRetrieveAPIView.as_view(),
         name="outflow_detail_api_view",
     ),
+    path(
+        "outflows/bulk/",
+        views.OutflowBulkCreateAPIView.as_view(),
+        name="outflow_bulk_api_view",
+    ),
 ]
@@ -1,6 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 
+from app.services import stock
 from outflows import models
 
 
@@ -38,12 +39,14 @@ class OutflowForm(forms.ModelForm):
         product = self.cleaned_data.get("product")
         quantity = self.cleaned_data.get("quantity")
 
+        # Verificação antecipada; a garantia contra saídas simultâneas é a
+        # baixa condicional feita pelo banco ao salvar (ver a view)
         if product and quantity and quantity > product.quantity:
             raise ValidationError(
-                "A quantidade de saída não pode ser maior que "
-                "a quantidade em estoque. "
-                f"Produto: {product.title}. "
-                f"Quantidade em estoque: {product.quantity}. "
+                stock.insufficient_stock_message(
+                    product.title, product.quantity
+                ),
+                code="insufficient_stock",
             )
 
         return quantity
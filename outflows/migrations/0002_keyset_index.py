@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("outflows", "0001_initial"),
+        ("products", "0004_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="outflows",
+            index=models.Index(
+                fields=["created_at", "id"], name="outflow_keyset_idx"
+            ),
+        ),
+    ]
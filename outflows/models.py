@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 from products.models import Product
 
@@ -17,6 +17,19 @@ class Outflows(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Saída"
         verbose_name_plural = "Saídas"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="outflow_keyset_idx"
+            ),
+        ]
 
     def __str__(self):
         return str(self.product)
+
+    def save(self, *args, **kwargs):
+        # A baixa do estoque (post_save) recusa saídas sem estoque: o INSERT
+        # fica na mesma transação para que a saída recusada não seja gravada
+        # mesmo quando quem chama não abriu uma (admin, shell, comandos)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
@@ -1,9 +1,33 @@
-from rest_framework import serializers
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
 
+from app.serializers import FlexFieldsSerializer
+from app.services import stock
 from outflows.models import Outflows
+from products.serializers import ProductSerializer
 
 
-class OutflowSerializer(serializers.ModelSerializer):
+class InsufficientStockConflict(APIException):
+    """Venda recusada por falta de estoque (409 Conflict)."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Estoque insuficiente."
+    default_code = "insufficient_stock"
+
+
+class OutflowSerializer(FlexFieldsSerializer):
+    expandable_fields = {"product": ProductSerializer}
+
     class Meta:
         model = Outflows
         fields = "__all__"
+
+    def create(self, validated_data):
+        # A baixa condicional (signal) decide se há estoque; sem estoque a
+        # transação desfaz a saída já inserida
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except stock.InsufficientStockError as exc:
+            raise InsufficientStockConflict(str(exc)) from exc
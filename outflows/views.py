@@ -2,6 +2,8 @@ from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     PermissionRequiredMixin,
 )
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.urls import reverse_lazy
 from django.views.generic import (
     CreateView,
@@ -11,7 +13,9 @@ from django.views.generic import (
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 
-from app.services import metrics
+from app.bulk import BulkCreateAPIView
+from app.filters import RANGE_LOOKUPS
+from app.services import metrics, stock
 from app.views import ExportView, ImportView
 from brands.models import Brand
 from categories.models import Category
@@ -71,6 +75,25 @@ class OutflowCreateView(
     success_url = reverse_lazy("outflow_list")
     permission_required = PERMISSIONS[1]
 
+    def form_valid(self, form):
+        # Outra saída pode ter consumido o estoque depois da validação: a
+        # baixa condicional recusa a venda e a transação desfaz o registro
+        try:
+            with transaction.atomic():
+                return super().form_valid(form)
+        except stock.InsufficientStockError as exc:
+            form.add_error(
+                "quantity",
+                ValidationError(str(exc), code="insufficient_stock"),
+            )
+            return self.form_invalid(form)
+
+    def form_invalid(self, form):
+        response = super().form_invalid(form)
+        if form.has_error("quantity", "insufficient_stock"):
+            response.status_code = 409
+        return response
+
 
 class OutflowDetailView(
     LoginRequiredMixin,
@@ -97,6 +120,12 @@ class OutflowImportView(ImportView):
 class OutflowListCreateAPIView(generics.ListCreateAPIView):
     queryset = models.Outflows.objects.all()
     serializer_class = serializers.OutflowSerializer
+    filter_fields = {
+        "id": ["exact", "in"],
+        "product": ["exact", "in"],
+        "created_at": RANGE_LOOKUPS,
+    }
+    ordering_fields = ("created_at", "id")
 
     @extend_schema(
         tags=["Outflows"],
@@ -126,3 +155,32 @@ class OutflowRetrieveAPIView(generics.RetrieveAPIView):
     )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
+
+
+class OutflowBulkCreateAPIView(BulkCreateAPIView):
+    queryset = models.Outflows.objects.all()
+    serializer_class = serializers.OutflowSerializer
+
+    def split_accepted(self, objects):
+        # Saídas além do estoque são recusadas na ordem recebida
+        return stock.split_by_stock(objects)
+
+    def rejection_errors(self, obj):
+        return {
+            "quantity": [
+                stock.insufficient_stock_message(
+                    obj.product.title, obj.available
+                )
+            ]
+        }
+
+    @extend_schema(
+        tags=["Outflows"],
+        summary="Bulk Create Outflows",
+        description=(
+            "Create many outflows from a JSON array or NDJSON body. "
+            "Use ?mode=partial to keep the valid items when others fail."
+        ),
+    )
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
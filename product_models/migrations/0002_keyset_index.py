@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("brands", "0002_keyset_index"),
+        ("product_models", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productmodel",
+            index=models.Index(
+                fields=["name", "id"], name="product_model_keyset_idx"
+            ),
+        ),
+    ]
@@ -14,6 +14,12 @@ class ProductModel(models.Model):
         ordering = ["name"]
         verbose_name = "Modelo de Produto"
         verbose_name_plural = "Modelos de Produto"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(
+                fields=["name", "id"], name="product_model_keyset_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.brand}"
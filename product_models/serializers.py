@@ -1,9 +1,11 @@
-from rest_framework import serializers
-
+from app.serializers import FlexFieldsSerializer
+from brands.serializers import BrandSerializer
 from product_models.models import ProductModel
 
 
-class ProductModelSerializer(serializers.ModelSerializer):
+class ProductModelSerializer(FlexFieldsSerializer):
+    expandable_fields = {"brand": BrandSerializer}
+
     class Meta:
         model = ProductModel
         fields = "__all__"
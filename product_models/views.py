@@ -115,6 +115,12 @@ class ProductModelImportView(ImportView):
 class ProductModelListCreateAPIView(generics.ListCreateAPIView):
     queryset = models.ProductModel.objects.all()
     serializer_class = serializers.ProductModelSerializer
+    filter_fields = {
+        "id": ["exact", "in"],
+        "name": ["exact", "icontains"],
+        "brand": ["exact", "in"],
+    }
+    ordering_fields = ("name", "id")
 
     @extend_schema(
         tags=["Product Models"],
@@ -30,3 +30,30 @@ class ProductAdmin(admin.ModelAdmin):
 
 
 admin.site.register(models.Product, ProductAdmin)
+
+
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = (
+        "product",
+        "kind",
+        "quantity",
+        "balance",
+        "source_id",
+        "created_at",
+    )
+    search_fields = ("product__title", "product__serial_number")
+    list_filter = ("kind",)
+    list_select_related = ("product",)
+
+    # Gravado apenas pelas movimentações de estoque (somente inserção)
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(models.StockMovement, StockMovementAdmin)
@@ -13,4 +13,9 @@ urlpatterns = [
         views.ProductRetrieveUpdateDestroyAPIView.as_view(),
         name="product_detail_api_view",
     ),
+    path(
+        "products/bulk/",
+        views.ProductBulkAPIView.as_view(),
+        name="product_bulk_api_view",
+    ),
 ]
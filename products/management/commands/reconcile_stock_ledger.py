@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.services import ledger
+
+
+class Command(BaseCommand):
+    help = "Verifica se o estoque dos produtos bate com o livro-razão."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Corrige as divergências encontradas.",
+        )
+        parser.add_argument(
+            "--trust",
+            choices=["ledger", "product"],
+            default="ledger",
+            help=(
+                "Origem considerada correta ao corrigir: 'ledger' regrava o "
+                "estoque dos produtos; 'product' grava ajustes no "
+                "livro-razão."
+            ),
+        )
+        parser.add_argument(
+            "--checkpoint",
+            action="store_true",
+            help="Grava checkpoints após a verificação.",
+        )
+
+    def handle(self, *args, **options):
+        problems = ledger.check_ledger()
+        if not problems:
+            self.stdout.write(self.style.SUCCESS("Livro-razão consistente."))
+        else:
+            for problem in problems:
+                self.stderr.write(problem)
+            if not options["fix"]:
+                raise CommandError(
+                    f"{len(problems)} divergência(s) encontrada(s). "
+                    "Execute com --fix para corrigir."
+                )
+            fixed = ledger.repair_ledger(trust=options["trust"])
+            self.stdout.write(
+                self.style.SUCCESS(f"{fixed} divergência(s) corrigida(s).")
+            )
+
+        if options["checkpoint"]:
+            created = ledger.create_checkpoints()
+            self.stdout.write(f"{created} checkpoint(s) criado(s).")
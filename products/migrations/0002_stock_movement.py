@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:33
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockMovement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("inflow", "Entrada"),
+                            ("outflow", "Saída"),
+                            ("adjustment", "Ajuste"),
+                            ("checkpoint", "Checkpoint"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("quantity", models.IntegerField(default=0)),
+                ("balance", models.IntegerField(blank=True, null=True)),
+                (
+                    "source_id",
+                    models.PositiveBigIntegerField(blank=True, null=True),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_movements",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Movimentação de Estoque",
+                "verbose_name_plural": "Movimentações de Estoque",
+                "ordering": ["created_at", "pk"],
+                "indexes": [
+                    models.Index(
+                        fields=["product", "created_at"],
+                        name="stock_movement_product_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("kind", "checkpoint")),
+                        fields=["product", "created_at"],
+                        name="stock_checkpoint_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
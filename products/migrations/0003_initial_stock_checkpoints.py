@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def create_initial_checkpoints(apps, schema_editor):
+    """
+    Abre o livro-razão com um checkpoint por produto contendo o estoque
+    atual (o histórico anterior não é reconstruído).
+    """
+    Product = apps.get_model("products", "Product")
+    StockMovement = apps.get_model("products", "StockMovement")
+
+    now = timezone.now()
+    StockMovement.objects.bulk_create(
+        (
+            StockMovement(
+                product_id=pk,
+                kind="checkpoint",
+                quantity=0,
+                balance=quantity,
+                created_at=now,
+            )
+            for pk, quantity in Product.objects.values_list("pk", "quantity")
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0002_stock_movement"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_initial_checkpoints, migrations.RunPython.noop
+        ),
+    ]
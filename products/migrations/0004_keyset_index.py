@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categories", "0002_keyset_index"),
+        ("product_models", "0002_keyset_index"),
+        ("products", "0003_initial_stock_checkpoints"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["title", "id"], name="product_keyset_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("categories", "0002_keyset_index"),
+        ("product_models", "0002_keyset_index"),
+        ("products", "0004_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["serial_number"], name="product_serial_idx"
+            ),
+        ),
+    ]
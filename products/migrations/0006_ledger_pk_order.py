@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:43
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def bound_existing_checkpoints(apps, schema_editor):
+    """
+    Checkpoints anteriores passam a cobrir as movimentações de pk menor
+    que o seu (o limite que os novos guardam em `source_id`).
+    """
+    StockMovement = apps.get_model("products", "StockMovement")
+    StockMovement.objects.filter(
+        kind="checkpoint", source_id__isnull=True
+    ).update(source_id=F("pk"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0005_serial_number_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            bound_existing_checkpoints, migrations.RunPython.noop
+        ),
+        migrations.AlterModelOptions(
+            name="stockmovement",
+            options={
+                "ordering": ["pk"],
+                "verbose_name": "Movimentação de Estoque",
+                "verbose_name_plural": "Movimentações de Estoque",
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="stockmovement",
+            name="stock_movement_product_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="stockmovement",
+            name="stock_checkpoint_idx",
+        ),
+        migrations.AddIndex(
+            model_name="stockmovement",
+            index=models.Index(
+                fields=["product", "id"], name="stock_movement_product_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stockmovement",
+            index=models.Index(
+                condition=models.Q(("kind", "checkpoint")),
+                fields=["product", "id"],
+                name="stock_checkpoint_id_idx",
+            ),
+        ),
+    ]
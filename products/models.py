@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from categories.models import Category
 from product_models.models import ProductModel
@@ -25,6 +26,75 @@ class Product(models.Model):
         ordering = ["title"]
         verbose_name = "Produto"
         verbose_name_plural = "Produtos"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(fields=["title", "id"], name="product_keyset_idx"),
+            # Filtro ?serial_number= da API
+            models.Index(fields=["serial_number"], name="product_serial_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class StockMovement(models.Model):
+    """
+    Livro-razão do estoque (somente inserção). Cada entrada, saída ou
+    ajuste grava a variação (`quantity`, com sinal); checkpoints gravam o
+    saldo (`balance`) acumulado até a movimentação `source_id`, de modo que
+    o saldo seja o último checkpoint mais as movimentações de pk maior.
+    """
+
+    INFLOW = "inflow"
+    OUTFLOW = "outflow"
+    ADJUSTMENT = "adjustment"
+    CHECKPOINT = "checkpoint"
+    KIND_CHOICES = [
+        (INFLOW, "Entrada"),
+        (OUTFLOW, "Saída"),
+        (ADJUSTMENT, "Ajuste"),
+        (CHECKPOINT, "Checkpoint"),
+    ]
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="stock_movements"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # Variação do estoque (zero em checkpoints)
+    quantity = models.IntegerField(default=0)
+    # Saldo acumulado (apenas em checkpoints)
+    balance = models.IntegerField(null=True, blank=True)
+    # Pk da entrada/saída que originou a movimentação; em checkpoints, pk
+    # da última movimentação incluída no saldo
+    source_id = models.PositiveBigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["pk"]
+        verbose_name = "Movimentação de Estoque"
+        verbose_name_plural = "Movimentações de Estoque"
+        indexes = [
+            models.Index(
+                fields=["product", "id"],
+                name="stock_movement_product_id_idx",
+            ),
+            # Busca do último checkpoint sem percorrer as movimentações
+            models.Index(
+                fields=["product", "id"],
+                condition=models.Q(kind="checkpoint"),
+                name="stock_checkpoint_id_idx",
+            ),
+        ]
+
+    def __str__(self):
+        if self.kind == self.CHECKPOINT:
+            return f"Checkpoint: {self.balance}"
+        return f"{self.get_kind_display()} {self.quantity:+d}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Movimentações de estoque não podem ser editadas")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Movimentações de estoque não podem ser removidas")
@@ -1,9 +1,15 @@
-from rest_framework import serializers
-
+from app.serializers import FlexFieldsSerializer
+from categories.serializers import CategorySerializer
+from product_models.serializers import ProductModelSerializer
 from products.models import Product
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(FlexFieldsSerializer):
+    expandable_fields = {
+        "category": CategorySerializer,
+        "product_model": ProductModelSerializer,
+    }
+
     class Meta:
         model = Product
         fields = "__all__"
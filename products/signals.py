@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from app.services import ledger
+from products.models import Product
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_row(sender, instance, **kwargs):
+    """
+    Lê uma única vez a linha anterior do produto (None em cadastros) para
+    os handlers de post_save: o livro-razão (aqui) e a posição consolidada
+    do estoque (`dashboard.signals`).
+    """
+    instance._previous_row = None
+    if instance.pk:
+        instance._previous_row = (
+            Product.objects
+            .filter(pk=instance.pk)
+            .values_list("quantity", "cost_price", "sell_price")
+            .first()
+        )
+
+
+def previous_row(instance: Product) -> tuple:
+    """(quantidade, custo, venda) antes do save, ou () em cadastros."""
+    return getattr(instance, "_previous_row", None) or ()
+
+
+@receiver(post_save, sender=Product)
+def record_quantity_adjustment(sender, instance, **kwargs):
+    # Cadastro com estoque inicial ou edição direta da quantidade
+    previous_quantity = (previous_row(instance) or (0,))[0]
+    ledger.record_adjustments({
+        instance.pk: instance.quantity - previous_quantity
+    })
@@ -13,6 +13,7 @@ from django.views.generic import (
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 
+from app.bulk import BulkCreateAPIView, BulkUpdateMixin
 from app.services import metrics
 from app.views import ExportView, ImportView
 from categories.models import Category
@@ -128,6 +129,14 @@ class ProductImportView(ImportView):
 class ProductListCreateAPIView(generics.ListCreateAPIView):
     queryset = models.Product.objects.all()
     serializer_class = serializers.ProductSerializer
+    filter_fields = {
+        "id": ["exact", "in"],
+        "title": ["exact", "icontains"],
+        "serial_number": ["exact", "icontains"],
+        "category": ["exact", "in"],
+        "product_model": ["exact", "in"],
+    }
+    ordering_fields = ("title", "id")
 
     @extend_schema(
         tags=["Products"],
@@ -183,3 +192,30 @@ class ProductRetrieveUpdateDestroyAPIView(
     )
     def delete(self, request, *args, **kwargs):
         return super().delete(request, *args, **kwargs)
+
+
+class ProductBulkAPIView(BulkUpdateMixin, BulkCreateAPIView):
+    queryset = models.Product.objects.all()
+    serializer_class = serializers.ProductSerializer
+
+    @extend_schema(
+        tags=["Products"],
+        summary="Bulk Create Products",
+        description=(
+            "Create many products from a JSON array or NDJSON body. "
+            "Use ?mode=partial to keep the valid items when others fail."
+        ),
+    )
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
+    @extend_schema(
+        tags=["Products"],
+        summary="Bulk Update Products",
+        description=(
+            "Partially update many products; each item carries its id. "
+            "Use ?mode=partial to keep the valid items when others fail."
+        ),
+    )
+    def patch(self, request, *args, **kwargs):
+        return super().patch(request, *args, **kwargs)
@@ -12,6 +12,10 @@ class Supplier(models.Model):
         ordering = ["name"]
         verbose_name = "Fornecedor"
         verbose_name_plural = "Fornecedores"
+        # Chave da paginação da API (ordenação + id)
+        indexes = [
+            models.Index(fields=["name", "id"], name="supplier_keyset_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -1,9 +1,8 @@
-from rest_framework import serializers
-
+from app.serializers import FlexFieldsSerializer
 from suppliers.models import Supplier
 
 
-class SupplierSerializer(serializers.ModelSerializer):
+class SupplierSerializer(FlexFieldsSerializer):
     class Meta:
         model = Supplier
         fields = "__all__"
@@ -106,6 +106,8 @@ class SupplierImportView(ImportView):
 class SupplierListCreateAPIView(generics.ListCreateAPIView):
     queryset = models.Supplier.objects.all()
     serializer_class = serializers.SupplierSerializer
+    filter_fields = {"id": ["exact", "in"], "name": ["exact", "icontains"]}
+    ordering_fields = ("name", "id")
 
     @extend_schema(
         tags=["Suppliers"],
@@ -0,0 +1,169 @@
+"""Tests for export compression and fingerprint-based artifact reuse."""
+
+import csv
+import gzip
+import io
+
+import pytest
+
+from app.services import artifacts, compression
+from app.tasks import export_data_async
+from brands.models import Brand
+from notifications.models import TaskNotification
+from product_models.models import ProductModel
+from products.models import Product
+from tests.factories import (
+    BrandFactory,
+    ProductFactory,
+    UserFactory,
+)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def _export(file_format="csv", model_name="Product", task_id=None):
+    notification = TaskNotification.objects.create(
+        user=UserFactory(),
+        task_type="export",
+        task_id=task_id or f"export-{TaskNotification.objects.count()}",
+        model_name=model_name,
+        file_format=file_format,
+    )
+    result = export_data_async.apply(args=[notification.id]).get()
+    notification.refresh_from_db()
+    return notification, result
+
+
+@pytest.mark.unit
+class TestCompression:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("gzip, deflate, br", True),
+            ("br;q=1.0, gzip;q=0.5", True),
+            ("gzip;q=0", False),
+            ("identity", False),
+            ("*", True),
+            ("", False),
+        ],
+    )
+    def test_accepts(self, header, expected):
+        assert compression.accepts(header, "gzip") is expected
+
+    def test_writer_and_reader_round_trip(self):
+        buffer = io.BytesIO()
+
+        with compression.open_writer(buffer, "gzip") as stream:
+            stream.write(b"a,b\n" * 100)
+        buffer.seek(0)
+
+        assert compression.open_reader(buffer, "gzip").read() == (
+            b"a,b\n" * 100
+        )
+
+    def test_only_text_formats_are_compressed(self, settings):
+        settings.EXPORT_COMPRESSION = "gzip"
+
+        assert compression.export_codec("csv") == "gzip"
+        assert compression.export_codec("parquet") == ""
+        assert compression.export_codec("pdf") == ""
+
+    def test_compression_can_be_disabled(self, settings):
+        settings.EXPORT_COMPRESSION = ""
+
+        assert compression.export_codec("csv") == ""
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestFingerprint:
+    def test_tables_include_related_str_dependencies(self):
+        assert artifacts.export_tables(Product)[:2] == [Product, ProductModel]
+        assert Brand in artifacts.export_tables(Product)
+
+    def test_stable_while_data_is_unchanged(self):
+        ProductFactory.create_batch(2)
+
+        first = artifacts.export_fingerprint(Product, "csv", "gzip")
+
+        assert artifacts.export_fingerprint(Product, "csv", "gzip") == first
+        assert artifacts.export_fingerprint(Product, "ndjson", "gzip") != (
+            first
+        )
+        assert artifacts.export_fingerprint(Product, "csv", "") != first
+
+    @pytest.mark.parametrize("change", ["insert", "update", "delete"])
+    def test_changes_with_the_table(self, change):
+        products = ProductFactory.create_batch(2)
+        before = artifacts.export_fingerprint(Product, "csv")
+
+        if change == "insert":
+            ProductFactory(product_model=products[0].product_model)
+        elif change == "update":
+            products[0].title = "Renomeado"
+            products[0].save()
+        else:
+            products[0].delete()
+
+        assert artifacts.export_fingerprint(Product, "csv") != before
+
+    def test_changes_when_a_related_name_changes(self):
+        product = ProductFactory()
+        before = artifacts.export_fingerprint(Product, "csv")
+
+        brand = product.product_model.brand
+        brand.name = "Nova marca"
+        brand.save()
+
+        assert artifacts.export_fingerprint(Product, "csv") != before
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestArtifactReuse:
+    def test_export_is_gzip_compressed(self):
+        ProductFactory.create_batch(3)
+
+        notification, _ = _export()
+
+        with notification.file_path.open("rb") as exported:
+            content = gzip.decompress(exported.read()).decode()
+        assert notification.file_path.name.endswith(".csv.gz")
+        assert len(list(csv.reader(io.StringIO(content)))) == 4
+
+    def test_repeat_export_reuses_the_file(self):
+        ProductFactory.create_batch(3)
+        first, _ = _export()
+
+        second, result = _export()
+
+        assert result == {"status": "success", "count": 3, "reused": True}
+        assert second.status == "completed"
+        assert second.file_path.name == first.file_path.name
+        assert second.content_encoding == "gzip"
+        assert second.record_count == 3
+
+    def test_changed_data_is_exported_again(self):
+        ProductFactory.create_batch(3)
+        first, _ = _export()
+        BrandFactory(name="Não usada")  # não aparece na exportação
+        ProductFactory()
+
+        second, result = _export()
+
+        assert "reused" not in result
+        assert second.file_path.name != first.file_path.name
+        assert second.record_count == 4
+
+    def test_missing_file_is_not_reused(self):
+        ProductFactory.create_batch(3)
+        first, _ = _export()
+        first.file_path.storage.delete(first.file_path.name)
+
+        second, result = _export()
+
+        assert "reused" not in result
+        assert second.file_path.storage.exists(second.file_path.name)
@@ -0,0 +1,271 @@
+"""Tests for the bulk create/update API endpoints."""
+
+import json
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.services import ledger
+from dashboard.models import InventorySnapshot
+from inflows.models import Inflows
+from outflows.models import Outflows
+from products.models import Product, StockMovement
+from tests.factories import (
+    CategoryFactory,
+    ProductFactory,
+    ProductModelFactory,
+    SupplierFactory,
+)
+
+INFLOWS_URL = reverse("inflow_bulk_api_view")
+OUTFLOWS_URL = reverse("outflow_bulk_api_view")
+PRODUCTS_URL = reverse("product_bulk_api_view")
+
+
+def _statuses(response):
+    return [item["status"] for item in response.data["results"]]
+
+
+def _quantity(product):
+    product.refresh_from_db()
+    return product.quantity
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestBulkCreate:
+    def test_creates_all_items_in_one_transaction(self, authenticated_client):
+        product = ProductFactory(quantity=10)
+        items = [{"product": product.pk, "quantity": q} for q in (2, 3)]
+
+        response = authenticated_client.post(
+            OUTFLOWS_URL, items, format="json"
+        )
+
+        assert response.status_code == 201
+        assert response.data["created"] == 2
+        assert [item["id"] for item in response.data["results"]] == list(
+            Outflows.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        assert _quantity(product) == 5
+        assert ledger.on_hand(product.pk) == 5
+
+    def test_accepts_ndjson(self, authenticated_client):
+        product, supplier = ProductFactory(quantity=0), SupplierFactory()
+        body = "\n".join(
+            json.dumps({
+                "product": product.pk,
+                "supplier": supplier.pk,
+                "quantity": q,
+            })
+            for q in (4, 6)
+        )
+
+        response = authenticated_client.post(
+            INFLOWS_URL, body, content_type="application/x-ndjson"
+        )
+
+        assert response.status_code == 201
+        assert Inflows.objects.count() == 2
+        assert _quantity(product) == 10
+
+    def test_atomic_mode_writes_nothing_on_failure(self, authenticated_client):
+        product = ProductFactory(quantity=10)
+        items = [
+            {"product": product.pk, "quantity": 1},
+            {"product": 999999, "quantity": 1},
+        ]
+
+        response = authenticated_client.post(
+            OUTFLOWS_URL, items, format="json"
+        )
+
+        assert response.status_code == 400
+        assert _statuses(response) == ["skipped", "error"]
+        assert "product" in response.data["results"][1]["errors"]
+        assert not Outflows.objects.exists()
+        assert _quantity(product) == 10
+
+    def test_partial_mode_keeps_valid_items(self, authenticated_client):
+        product = ProductFactory(quantity=10)
+        items = [
+            {"product": product.pk, "quantity": 1},
+            {"product": product.pk, "quantity": "abc"},
+        ]
+
+        response = authenticated_client.post(
+            f"{OUTFLOWS_URL}?mode=partial", items, format="json"
+        )
+
+        assert response.status_code == 207
+        assert _statuses(response) == ["created", "error"]
+        assert _quantity(product) == 9
+
+    def test_oversold_items_are_rejected_in_order(self, authenticated_client):
+        product = ProductFactory(quantity=5)
+        items = [{"product": product.pk, "quantity": q} for q in (3, 4, 2)]
+
+        response = authenticated_client.post(
+            f"{OUTFLOWS_URL}?mode=partial", items, format="json"
+        )
+
+        assert _statuses(response) == ["created", "error", "created"]
+        assert "estoque: 2" in str(response.data["results"][1]["errors"])
+        assert _quantity(product) == 0
+
+    def test_only_stock_failures_are_a_conflict(self, authenticated_client):
+        product = ProductFactory(quantity=1)
+
+        response = authenticated_client.post(
+            OUTFLOWS_URL,
+            [{"product": product.pk, "quantity": 2}],
+            format="json",
+        )
+
+        assert response.status_code == 409
+        assert _quantity(product) == 1
+
+    def test_query_count_does_not_grow_with_the_batch(
+        self, authenticated_client
+    ):
+        products = ProductFactory.create_batch(3, quantity=1000)
+
+        def post(size):
+            items = [
+                {"product": products[i % 3].pk, "quantity": 1}
+                for i in range(size)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = authenticated_client.post(
+                    OUTFLOWS_URL, items, format="json"
+                )
+            assert response.status_code == 201
+            return len(queries)
+
+        post(1)  # creates the day's sales rollup row
+        assert post(30) == post(3)
+
+    def test_rejects_non_list_body(self, authenticated_client):
+        response = authenticated_client.post(
+            OUTFLOWS_URL, {"product": 1, "quantity": 1}, format="json"
+        )
+
+        assert response.status_code == 400
+
+    def test_rejects_oversized_batch(self, authenticated_client, settings):
+        settings.API_BULK_MAX_ITEMS = 2
+
+        response = authenticated_client.post(
+            OUTFLOWS_URL, [{}, {}, {}], format="json"
+        )
+
+        assert response.status_code == 400
+
+    def test_rejects_unknown_mode(self, authenticated_client):
+        response = authenticated_client.post(
+            f"{OUTFLOWS_URL}?mode=some", [], format="json"
+        )
+
+        assert response.status_code == 400
+        assert "mode" in response.data
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestBulkProducts:
+    def _payload(self, **overrides):
+        return {
+            "title": "Widget",
+            "product_model": ProductModelFactory().pk,
+            "category": CategoryFactory().pk,
+            "description": "d",
+            "serial_number": "SN",
+            "cost_price": "2.00",
+            "sell_price": "3.00",
+            "quantity": 4,
+            **overrides,
+        }
+
+    def test_create_records_stock_effects(
+        self, authenticated_client, django_capture_on_commit_callbacks
+    ):
+        items = [self._payload(), self._payload(quantity=6)]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_client.post(
+                PRODUCTS_URL, items, format="json"
+            )
+
+        assert response.status_code == 201
+        assert InventorySnapshot.objects.get().total_quantity == 10
+        assert list(
+            StockMovement.objects.order_by("quantity").values_list(
+                "kind", "quantity"
+            )
+        ) == [("adjustment", 4), ("adjustment", 6)]
+
+    def test_update_applies_stock_effects(
+        self, authenticated_client, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            first = ProductFactory(quantity=5, cost_price=Decimal("1.00"))
+            second = ProductFactory(quantity=5)
+        snapshot = InventorySnapshot.objects.get()
+        items = [
+            {"id": first.pk, "quantity": 8, "cost_price": "2.00"},
+            {"id": second.pk, "title": "Renomeado"},
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_client.patch(
+                PRODUCTS_URL, items, format="json"
+            )
+
+        assert response.status_code == 200
+        assert _statuses(response) == ["updated", "updated"]
+        first.refresh_from_db()
+        assert (first.quantity, first.cost_price) == (8, Decimal("2.00"))
+        assert Product.objects.get(pk=second.pk).title == "Renomeado"
+        current = InventorySnapshot.objects.get()
+        assert current.total_quantity == snapshot.total_quantity + 3
+        assert current.total_cost_price == (
+            snapshot.total_cost_price + Decimal("11.00")
+        )
+        assert ledger.check_ledger() == []
+
+    def test_update_reports_missing_and_invalid_items(
+        self, authenticated_client
+    ):
+        product = ProductFactory(quantity=5)
+        items = [
+            {"id": product.pk, "quantity": 7},
+            {"id": 999999, "quantity": 1},
+            {"quantity": 1},
+            {"id": product.pk, "cost_price": "x"},
+        ]
+
+        response = authenticated_client.patch(
+            f"{PRODUCTS_URL}?mode=partial", items, format="json"
+        )
+
+        assert response.status_code == 207
+        assert _statuses(response) == ["updated", "error", "error", "error"]
+        assert _quantity(product) == 7
+
+    def test_atomic_update_writes_nothing_on_failure(
+        self, authenticated_client
+    ):
+        product = ProductFactory(quantity=5)
+
+        response = authenticated_client.patch(
+            PRODUCTS_URL,
+            [{"id": product.pk, "quantity": 7}, {"id": 999999}],
+            format="json",
+        )
+
+        assert response.status_code == 400
+        assert _statuses(response) == ["skipped", "error"]
+        assert _quantity(product) == 5
@@ -0,0 +1,209 @@
+"""Tests for the read-through metrics cache."""
+
+import io
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from app.services import caching, metrics
+from app.services.import_data import DataImportService
+from brands.models import Brand
+from tests.factories import BrandFactory, OutflowFactory, ProductFactory
+
+
+class Counter:
+    """Callable that records how many times it was computed."""
+
+    def __init__(self, value=None, delay=0):
+        self.calls = 0
+        self.value = value if value is not None else {}
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+@pytest.mark.unit
+class TestGetOrCompute:
+    def test_falsy_results_are_cached(self):
+        compute = Counter(value={})
+
+        assert caching.get_or_compute("k", compute) == {}
+        assert caching.get_or_compute("k", compute) == {}
+        assert compute.calls == 1
+
+    def test_stale_value_served_while_other_process_refreshes(self):
+        caching.set_cached("k", "old")
+        entry = cache.get("k")
+        entry["fresh_until"] = time.time() - 1
+        cache.set("k", entry)
+        cache.add("lock:k", "someone-else")
+        compute = Counter(value="new")
+
+        assert caching.get_or_compute("k", compute) == "old"
+        assert compute.calls == 0
+
+    def test_stale_value_refreshed_by_lock_owner(self):
+        caching.set_cached("k", "old")
+        entry = cache.get("k")
+        entry["fresh_until"] = time.time() - 1
+        cache.set("k", entry)
+        compute = Counter(value="new")
+
+        assert caching.get_or_compute("k", compute) == "new"
+        assert caching.get_or_compute("k", compute) == "new"
+        assert compute.calls == 1
+        assert cache.get("lock:k") is None
+
+    def test_miss_waits_for_lock_owner(self):
+        cache.add("lock:k", "someone-else")
+        threading.Timer(0.1, caching.set_cached, args=("k", "theirs")).start()
+        compute = Counter(value="mine")
+
+        assert caching.get_or_compute("k", compute) == "theirs"
+        assert compute.calls == 0
+
+    def test_miss_falls_back_when_lock_owner_is_too_slow(self):
+        cache.add("lock:k", "someone-else")
+        compute = Counter(value="mine")
+
+        with mock.patch.object(caching, "WAIT_TIMEOUT", 0.1):
+            assert caching.get_or_compute("k", compute) == "mine"
+        assert compute.calls == 1
+
+    def test_concurrent_misses_compute_once(self):
+        compute = Counter(value={"total": 1}, delay=0.2)
+        results = []
+
+        def worker():
+            results.append(caching.get_or_compute("k", compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert compute.calls == 1
+        assert results == [{"total": 1}] * 8
+
+    def test_ttl_is_jittered(self):
+        ttls = {caching.jittered(1000) for _ in range(50)}
+
+        assert len(ttls) > 1
+        assert all(900 <= ttl <= 1100 for ttl in ttls)
+
+
+@pytest.mark.django_db
+class TestCachedMetrics:
+    def test_metrics_wrapper_reads_through_cache(self):
+        with mock.patch.object(
+            metrics, "get_product_metrics_raw", return_value={}
+        ) as raw:
+            assert metrics.get_product_metrics() == {}
+            assert metrics.get_product_metrics() == {}
+
+        raw.assert_called_once()
+
+
+@pytest.mark.unit
+class TestNamespaces:
+    def test_key_embeds_namespace_version(self):
+        version = caching.namespace_version("brands")
+
+        assert caching.namespaced_key("brands", "list") == (
+            f"brands:v{version}:list"
+        )
+
+    def test_bump_changes_only_affected_namespace(self):
+        brands_key = caching.namespaced_key("brands", "list")
+        sales_key = caching.namespaced_key(caching.METRICS_SALES, "sales")
+
+        caching.bump_namespaces("brands")
+
+        assert caching.namespaced_key("brands", "list") != brands_key
+        assert caching.namespaced_key(caching.METRICS_SALES, "sales") == (
+            sales_key
+        )
+
+    def test_bump_survives_evicted_version(self):
+        caching.bump_namespaces("brands")
+
+        assert caching.namespace_version("brands") is not None
+
+    def test_deferred_bumps_are_applied_once(self):
+        version = caching.namespace_version("brands")
+
+        with mock.patch.object(cache, "incr", wraps=cache.incr) as incr:
+            with caching.defer_invalidation():
+                for _ in range(100):
+                    caching.bump_namespaces("brands")
+                assert caching.namespace_version("brands") == version
+
+        incr.assert_called_once()
+        assert caching.namespace_version("brands") == version + 1
+
+    def test_unrelated_keys_survive_invalidation(self):
+        cache.set("session:abc", "keep")
+
+        caching.bump_namespaces(*caching.MODEL_NAMESPACES["products.Product"])
+
+        assert cache.get("session:abc") == "keep"
+
+
+@pytest.mark.django_db
+class TestModelInvalidation:
+    def test_saving_a_model_invalidates_its_metrics(
+        self, django_capture_on_commit_callbacks
+    ):
+        stale = Counter({"total_products": 0})
+        metrics_key = metrics.cache_key(*metrics.PRODUCT_METRICS_KEY)
+        caching.get_or_compute(metrics_key, stale)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductFactory(quantity=4)
+
+        assert metrics.cache_key(*metrics.PRODUCT_METRICS_KEY) != metrics_key
+        assert metrics.get_product_metrics()["total_products"] == 4
+
+    def test_reads_before_commit_do_not_cache_stale_rollups(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            OutflowFactory(product=ProductFactory(quantity=10), quantity=1)
+            # Leitura entre o save e o commit: ainda vê o consolidado antigo
+            assert metrics.get_sales_metrics()["total_sales"] == 0
+
+        for callback in callbacks:
+            callback()
+
+        assert metrics.get_sales_metrics()["total_sales"] == 1
+        assert metrics.get_sales_metrics_raw()["total_sales"] == 1
+
+    def test_saving_a_brand_keeps_sales_metrics(self):
+        sales_key = metrics.cache_key(*metrics.SALES_METRICS_KEY)
+
+        BrandFactory()
+
+        assert metrics.cache_key(*metrics.SALES_METRICS_KEY) == sales_key
+
+    def test_import_bumps_once_without_clearing_cache(
+        self, django_capture_on_commit_callbacks
+    ):
+        cache.set("session:abc", "keep")
+        version = caching.namespace_version("brands")
+        csv = io.BytesIO(b"name,description\nAcme,a\nGlobex,b\nInitech,c\n")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            created = DataImportService(csv, "csv").transform_and_load(Brand)
+
+        assert created == 3
+        assert caching.namespace_version("brands") == version + 1
+        assert cache.get("session:abc") == "keep"
@@ -0,0 +1,125 @@
+"""Tests for the Parquet / Arrow IPC export and import formats."""
+
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.services import columnar
+from app.services.export_data import DataExportService
+from app.services.import_data import DataImportService
+from brands.models import Brand
+from outflows.models import Outflows
+from products.models import Product
+from tests.factories import BrandFactory, OutflowFactory, ProductFactory
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _export(queryset, file_format, chunk_size=2000):
+    buffer = io.BytesIO()
+    count = DataExportService.write_columnar(
+        queryset, buffer, file_format, chunk_size
+    )
+    buffer.seek(0)
+    return buffer, count
+
+
+@pytest.mark.unit
+class TestArrowSchema:
+    def test_columns_are_typed_from_the_model(self):
+        schema = columnar.arrow_schema(Product._meta.fields)
+
+        assert schema.field("id").type == pa.int64()
+        assert schema.field("cost_price").type == pa.decimal128(10, 2)
+        assert schema.field("created_at").type == pa.timestamp("us", "UTC")
+        assert schema.field("category").type == pa.string()
+        assert schema.field("quantity").type == pa.int64()
+
+    def test_nullability_follows_the_model(self):
+        schema = columnar.arrow_schema(Brand._meta.fields)
+
+        assert schema.field("description").nullable
+        assert not schema.field("name").nullable
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestColumnarExport:
+    @pytest.mark.parametrize("file_format", columnar.COLUMNAR_FORMATS)
+    def test_writes_typed_batches(self, file_format):
+        product = ProductFactory(title="Widget", quantity=100)
+        for _ in range(5):
+            OutflowFactory(product=product, quantity=2)
+
+        buffer, count = _export(
+            Outflows.objects.order_by("pk"), file_format, chunk_size=2
+        )
+
+        records = list(columnar.iter_records(buffer, file_format, 2))
+        outflow = Outflows.objects.order_by("pk").first()
+        assert count == len(records) == 5
+        assert records[0]["product"] == "Widget"
+        assert records[0]["quantity"] == 2
+        assert records[0]["created_at"] == outflow.created_at
+        assert records[0]["created_at"].tzinfo is not None
+        if file_format == "arrow":
+            buffer.seek(0)
+            assert pa.ipc.open_file(buffer).num_record_batches == 3
+
+    def test_decimals_keep_their_scale(self):
+        ProductFactory(cost_price=Decimal("10.50"))
+
+        buffer, _ = _export(Product.objects.all(), "parquet")
+
+        record = next(columnar.iter_records(buffer, "parquet", 10))
+        assert record["cost_price"] == Decimal("10.50")
+        assert str(record["cost_price"]) == "10.50"
+
+    def test_parquet_is_smaller_than_csv(self):
+        product = ProductFactory(quantity=10_000)
+        Outflows.objects.bulk_create(
+            Outflows(product=product, quantity=1, description="saída")
+            for _ in range(500)
+        )
+        csv_buffer = io.StringIO()
+        DataExportService.write_csv(Outflows.objects.all(), csv_buffer)
+
+        parquet, _ = _export(Outflows.objects.all(), "parquet")
+
+        assert len(parquet.getvalue()) < len(csv_buffer.getvalue().encode())
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestColumnarImport:
+    @pytest.mark.parametrize("file_format", columnar.COLUMNAR_FORMATS)
+    def test_round_trip(self, file_format):
+        BrandFactory(name="Acme", description=None)
+        BrandFactory(name="Ação", description="Marca nacional")
+        fields = ("pk", "name", "description")
+        expected = list(Brand.objects.order_by("pk").values(*fields))
+        buffer, _ = _export(Brand.objects.all(), file_format)
+        Brand.objects.all().delete()
+
+        service = DataImportService(buffer, file_format)
+        created = service.transform_and_load(Brand, chunk_size=1)
+
+        assert created == 2
+        assert list(Brand.objects.order_by("pk").values(*fields)) == expected
+
+    @pytest.mark.parametrize("file_format", columnar.COLUMNAR_FORMATS)
+    def test_reads_in_chunks(self, file_format):
+        BrandFactory.create_batch(5)
+        buffer, _ = _export(Brand.objects.all(), file_format, chunk_size=2)
+
+        service = DataImportService(buffer, file_format)
+        chunks = list(service.extract_chunks(chunk_size=2))
+
+        assert [list(chunk.index) for chunk in chunks] == [
+            [0, 1],
+            [2, 3],
+            [4],
+        ]
+        assert chunks[0]["created_at"][0].utcoffset() == timedelta(0)
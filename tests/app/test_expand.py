@@ -0,0 +1,88 @@
+"""Tests for ?expand= nested representations."""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.factories import InflowFactory, OutflowFactory, ProductFactory
+
+OUTFLOWS_URL = reverse("outflow_list_create_api_view")
+INFLOWS_URL = reverse("inflow_list_create_api_view")
+EXPAND = "product,product.category,product.product_model.brand"
+
+
+def _query_count(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, response.data
+    return len(queries)
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestExpand:
+    def test_inlines_nested_objects(self, authenticated_client):
+        outflow = OutflowFactory()
+        product = outflow.product
+
+        response = authenticated_client.get(f"{OUTFLOWS_URL}?expand={EXPAND}")
+
+        item = response.data["results"][0]
+        assert item["product"]["id"] == product.pk
+        assert item["product"]["category"]["name"] == product.category.name
+        brand = item["product"]["product_model"]["brand"]
+        assert brand["id"] == product.product_model.brand_id
+
+    def test_unexpanded_relations_stay_ids(self, authenticated_client):
+        inflow = InflowFactory()
+
+        response = authenticated_client.get(f"{INFLOWS_URL}?expand=supplier")
+
+        item = response.data["results"][0]
+        assert item["supplier"]["name"] == inflow.supplier.name
+        assert item["product"] == inflow.product_id
+
+    def test_query_count_does_not_grow_with_the_page(
+        self, authenticated_client
+    ):
+        OutflowFactory.create_batch(2)
+        small = _query_count(
+            authenticated_client, f"{OUTFLOWS_URL}?expand={EXPAND}"
+        )
+        OutflowFactory.create_batch(20)
+
+        large = _query_count(
+            authenticated_client, f"{OUTFLOWS_URL}?expand={EXPAND}"
+        )
+
+        assert large == small
+
+    def test_combines_with_sparse_fieldsets(self, authenticated_client):
+        OutflowFactory()
+
+        response = authenticated_client.get(
+            f"{OUTFLOWS_URL}?fields=id,product&expand=product.category"
+        )
+
+        item = response.data["results"][0]
+        assert list(item) == ["id", "product"]
+        assert "name" in item["product"]["category"]
+
+    def test_detail_view_expands(self, authenticated_client):
+        product = ProductFactory()
+
+        response = authenticated_client.get(
+            reverse("product_detail_api_view", kwargs={"pk": product.pk})
+            + "?expand=category"
+        )
+
+        assert response.data["category"]["id"] == product.category_id
+
+    def test_unknown_relation_is_rejected(self, authenticated_client):
+        response = authenticated_client.get(
+            f"{OUTFLOWS_URL}?expand=product.supplier"
+        )
+
+        assert response.status_code == 400
+        assert "product.supplier" in str(response.data["expand"])
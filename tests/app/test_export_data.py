@@ -0,0 +1,189 @@
+"""Tests for the streaming export service."""
+
+import csv
+import io
+import json
+import tracemalloc
+from decimal import Decimal
+
+import pytest
+
+from app.services.export_data import (
+    DataExportService,
+    export_select_related,
+    str_dependencies,
+)
+from app.tasks import export_data_async
+from inflows.models import Inflows
+from notifications.models import TaskNotification
+from outflows.models import Outflows
+from product_models.models import ProductModel
+from products.models import Product
+from tests.factories import (
+    BrandFactory,
+    CategoryFactory,
+    InflowFactory,
+    OutflowFactory,
+    ProductFactory,
+    ProductModelFactory,
+    SupplierFactory,
+    UserFactory,
+)
+
+
+class NullWriter:
+    """Text sink that discards everything written to it."""
+
+    def write(self, data):
+        return len(data)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestStreamingWriters:
+    def test_csv_has_header_and_related_names(self):
+        product = ProductFactory(title="Widget", quantity=10)
+        OutflowFactory(product=product, quantity=2, description="a,b")
+        buffer = io.StringIO()
+
+        count = DataExportService.write_csv(Outflows.objects.all(), buffer)
+
+        rows = list(csv.DictReader(io.StringIO(buffer.getvalue())))
+        assert count == 1
+        assert list(rows[0]) == [f.name for f in Outflows._meta.fields]
+        assert rows[0]["product"] == "Widget"
+        assert rows[0]["description"] == "a,b"
+
+    def test_ndjson_writes_one_object_per_line(self):
+        ProductFactory.create_batch(3, cost_price=Decimal("10.50"))
+        buffer = io.StringIO()
+
+        count = DataExportService.write_ndjson(Product.objects.all(), buffer)
+
+        lines = buffer.getvalue().splitlines()
+        assert count == len(lines) == 3
+        record = json.loads(lines[0])
+        assert record["cost_price"] == "10.50"
+        assert isinstance(record["category"], str)
+
+    def test_export_to_storage_saves_file(self):
+        ProductFactory.create_batch(5)
+        notification = TaskNotification(
+            user=UserFactory(), task_type="export", task_id="t1"
+        )
+
+        count = DataExportService.export_to_storage(
+            Product.objects.all(),
+            "ndjson",
+            notification.file_path,
+            "products.ndjson",
+            chunk_size=2,
+        )
+
+        assert count == 5
+        with notification.file_path.open("rb") as exported:
+            assert len(exported.read().splitlines()) == 5
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestExportTask:
+    @pytest.mark.parametrize("file_format", ["csv", "ndjson"])
+    def test_streaming_formats(self, file_format):
+        ProductFactory.create_batch(4)
+        notification = TaskNotification.objects.create(
+            user=UserFactory(),
+            task_type="export",
+            task_id=f"stream-{file_format}",
+            model_name="Product",
+            file_format=file_format,
+        )
+
+        result = export_data_async.apply(args=[notification.id]).get()
+
+        notification.refresh_from_db()
+        assert result == {"status": "success", "count": 4}
+        assert notification.status == "completed"
+        assert notification.record_count == 4
+        assert notification.file_path.name.endswith(f".{file_format}.gz")
+        assert notification.content_encoding == "gzip"
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestStreamingMemory:
+    @staticmethod
+    def _peak_memory():
+        tracemalloc.start()
+        try:
+            DataExportService.write_csv(
+                Outflows.objects.all(), NullWriter(), chunk_size=100
+            )
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_peak_memory_is_flat(self):
+        """Peak memory depends on the chunk size, not on the row count."""
+        product = ProductFactory(quantity=10_000)
+        Outflows.objects.bulk_create(
+            Outflows(product=product, quantity=1, description="x" * 100)
+            for _ in range(300)
+        )
+        self._peak_memory()  # warm up
+        small_peak = self._peak_memory()
+
+        Outflows.objects.bulk_create(
+            Outflows(product=product, quantity=1, description="x" * 100)
+            for _ in range(3000)
+        )
+        large_peak = self._peak_memory()
+
+        assert large_peak < small_peak * 1.5
+
+
+EXPORTABLE_FACTORIES = {
+    "Brand": BrandFactory,
+    "Category": CategoryFactory,
+    "Supplier": SupplierFactory,
+    "ProductModel": ProductModelFactory,
+    "Product": ProductFactory,
+    "Inflows": InflowFactory,
+    "Outflows": OutflowFactory,
+}
+
+
+@pytest.mark.unit
+class TestSelectRelated:
+    def test_str_dependencies_follow_nested_relations(self):
+        assert str_dependencies(ProductModel) == ("brand",)
+        assert str_dependencies(Inflows) == ("product",)
+        assert str_dependencies(Product) == ()
+
+    def test_export_joins_include_str_dependencies(self):
+        assert export_select_related(Product) == (
+            "product_model",
+            "product_model__brand",
+            "category",
+        )
+        assert export_select_related(Inflows) == ("supplier", "product")
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestExportQueryCount:
+    @pytest.mark.parametrize("name", EXPORTABLE_FACTORIES)
+    def test_single_query_per_export(self, name, django_assert_num_queries):
+        factory = EXPORTABLE_FACTORIES[name]
+        factory.create_batch(5)
+        queryset = factory._meta.model.objects.all()
+
+        with django_assert_num_queries(1):
+            rows = list(DataExportService.iter_rows(queryset))
+
+        assert len(rows) == 5
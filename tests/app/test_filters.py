@@ -0,0 +1,179 @@
+"""Tests for query-param filtering, ordering and sparse fieldsets."""
+
+from datetime import datetime
+
+import pytest
+import time_machine
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from brands.views import BrandListCreateAPIView
+from categories.views import CategoryListCreateAPIView
+from inflows.views import InflowListCreateAPIView
+from outflows.views import OutflowListCreateAPIView
+from product_models.views import ProductModelListCreateAPIView
+from products.views import ProductListCreateAPIView
+from suppliers.views import SupplierListCreateAPIView
+from tests.factories import (
+    CategoryFactory,
+    InflowFactory,
+    ProductFactory,
+)
+
+PRODUCTS_URL = reverse("product_list_create_api_view")
+INFLOWS_URL = reverse("inflow_list_create_api_view")
+LIST_VIEWS = (
+    BrandListCreateAPIView,
+    CategoryListCreateAPIView,
+    SupplierListCreateAPIView,
+    ProductModelListCreateAPIView,
+    ProductListCreateAPIView,
+    InflowListCreateAPIView,
+    OutflowListCreateAPIView,
+)
+
+
+def _ids(response):
+    assert response.status_code == 200, response.data
+    return [item["id"] for item in response.data["results"]]
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestQueryParamFilter:
+    def test_exact_and_icontains(self, authenticated_client):
+        notebook = ProductFactory(title="Notebook Dell", serial_number="A1")
+        ProductFactory(title="Mouse", serial_number="B2")
+
+        by_title = authenticated_client.get(
+            f"{PRODUCTS_URL}?title__icontains=note"
+        )
+        by_serial = authenticated_client.get(
+            f"{PRODUCTS_URL}?serial_number=A1"
+        )
+
+        assert _ids(by_title) == [notebook.pk]
+        assert _ids(by_serial) == [notebook.pk]
+
+    def test_foreign_key_in(self, authenticated_client):
+        first, second = CategoryFactory(), CategoryFactory()
+        a = ProductFactory(category=first, title="a")
+        b = ProductFactory(category=second, title="b")
+        ProductFactory()
+
+        response = authenticated_client.get(
+            f"{PRODUCTS_URL}?category__in={first.pk},{second.pk}"
+        )
+
+        assert _ids(response) == [a.pk, b.pk]
+
+    def test_datetime_range(self, authenticated_client):
+        for day in (1, 10, 20):
+            with time_machine.travel(
+                timezone.make_aware(datetime(2026, 5, day)), tick=False
+            ):
+                InflowFactory(description=f"day {day}")
+
+        response = authenticated_client.get(
+            f"{INFLOWS_URL}?created_at__gte=2026-05-05&created_at__lt=2026-05-20"
+        )
+
+        assert [i["description"] for i in response.data["results"]] == [
+            "day 10"
+        ]
+
+    def test_unsupported_lookup_is_rejected(self, authenticated_client):
+        response = authenticated_client.get(f"{PRODUCTS_URL}?title__regex=.*")
+
+        assert response.status_code == 400
+        assert "title__regex" in response.data
+
+    def test_invalid_value_is_rejected(self, authenticated_client):
+        response = authenticated_client.get(f"{INFLOWS_URL}?product=abc")
+
+        assert response.status_code == 400
+        assert "product" in response.data
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestOrdering:
+    def test_whitelisted_ordering_with_cursor(self, authenticated_client):
+        products = [ProductFactory(title=t) for t in ("b", "a", "b", "c")]
+        expected = [
+            p.pk for p in sorted(products, key=lambda p: (p.title, p.pk))
+        ][::-1]
+
+        ids, url = [], f"{PRODUCTS_URL}?ordering=-title&page_size=3"
+        while url:
+            response = authenticated_client.get(url)
+            ids += _ids(response)
+            url = response.data["next"]
+
+        assert ids == expected
+
+    @pytest.mark.parametrize("ordering", ["-description", "-quantity"])
+    def test_unknown_ordering_falls_back_to_default(
+        self, authenticated_client, ordering
+    ):
+        b = ProductFactory(title="b", description="2", quantity=2)
+        a = ProductFactory(title="a", description="1", quantity=1)
+
+        response = authenticated_client.get(
+            f"{PRODUCTS_URL}?ordering={ordering}"
+        )
+
+        assert _ids(response) == [a.pk, b.pk]
+
+    @pytest.mark.parametrize("view", LIST_VIEWS, ids=lambda v: v.__name__)
+    def test_ordering_fields_have_a_keyset_index(self, view):
+        model = view.queryset.model
+        indexed = {tuple(index.fields[:2]) for index in model._meta.indexes}
+        for field in view.ordering_fields:
+            assert field == "id" or (field, "id") in indexed, field
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestSparseFieldset:
+    def test_returns_only_requested_fields(self, authenticated_client):
+        ProductFactory()
+
+        response = authenticated_client.get(f"{PRODUCTS_URL}?fields=id,title")
+
+        assert list(response.data["results"][0]) == ["id", "title"]
+
+    def test_selects_only_the_needed_columns(self, authenticated_client):
+        ProductFactory()
+
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.get(f"{PRODUCTS_URL}?fields=id,quantity")
+
+        select = next(
+            q["sql"] for q in queries if 'FROM "products_product"' in q["sql"]
+        )
+        assert '"products_product"."description"' not in select
+        assert '"products_product"."quantity"' in select
+
+    def test_unknown_field_is_rejected(self, authenticated_client):
+        ProductFactory()
+
+        response = authenticated_client.get(f"{PRODUCTS_URL}?fields=id,nope")
+
+        assert response.status_code == 400
+        assert "fields" in response.data
+
+    def test_writes_ignore_fields(self, authenticated_client):
+        product = ProductFactory()
+
+        response = authenticated_client.patch(
+            reverse("product_detail_api_view", kwargs={"pk": product.pk})
+            + "?fields=id",
+            {"title": "Novo"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["title"] == "Novo"
@@ -0,0 +1,419 @@
+"""Tests for the data import service load paths."""
+
+import io
+import re
+import tracemalloc
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from app.services.import_data import DataImportService, ForeignKeyIndex
+from app.services.stock import InsufficientStockError
+from brands.models import Brand
+from categories.models import Category
+from dashboard.models import DailySalesRollup, InventorySnapshot
+from inflows.models import Inflows
+from outflows.models import Outflows
+from products.models import Product
+from tests.factories import (
+    CategoryFactory,
+    ProductFactory,
+    SupplierFactory,
+)
+
+
+def _csv(header, rows):
+    lines = [header, *(",".join(map(str, row)) for row in rows)]
+    return io.BytesIO("\n".join(lines).encode())
+
+
+def _state():
+    """Everything the stock signals touch, minus timestamps."""
+    return {
+        "products": list(
+            Product.objects.order_by("pk").values_list("pk", "quantity")
+        ),
+        "snapshot": list(
+            InventorySnapshot.objects.values_list(
+                "total_quantity", "total_cost_price", "total_sell_price"
+            )
+        ),
+        "sales": list(
+            DailySalesRollup.objects.order_by("date").values_list(
+                "date",
+                "sales_count",
+                "quantity",
+                "total_cost_price",
+                "total_sell_price",
+            )
+        ),
+        "inflows": sorted(
+            Inflows.objects.values_list("product_id", "quantity")
+        ),
+        "outflows": sorted(
+            Outflows.objects.values_list("product_id", "quantity")
+        ),
+    }
+
+
+def _load(model_class, csv, **kwargs):
+    """Import inside a rolled-back savepoint and return the resulting state."""
+    with transaction.atomic():
+        with TestCase.captureOnCommitCallbacks() as callbacks:
+            count = DataImportService(csv(), "csv").transform_and_load(
+                model_class, **kwargs
+            )
+        # Os consolidados só são aplicados no commit, que nunca acontece aqui
+        for callback in callbacks:
+            callback()
+        state = _state()
+        transaction.set_rollback(True)
+    return count, state
+
+
+@pytest.fixture
+def products():
+    return [
+        ProductFactory(
+            title=f"Widget {i}",
+            quantity=100,
+            cost_price=Decimal("10.00") + i,
+            sell_price=Decimal("15.50") + i,
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestBulkLoadMatchesSignals:
+    def test_inflows(self, products):
+        supplier = SupplierFactory(name="Acme")
+        rows = [
+            (supplier.name, products[i % 3].title, i + 1, "lote")
+            for i in range(10)
+        ]
+
+        def csv():
+            return _csv("supplier,product,quantity,description", rows)
+
+        expected = _load(Inflows, csv, bulk=False)
+        actual = _load(Inflows, csv, batch_size=3)
+
+        assert actual == expected
+        assert expected[0] == 10
+
+    def test_outflows(self, products):
+        rows = [(products[i % 3].title, i % 4, "venda") for i in range(10)]
+
+        def csv():
+            return _csv("product,quantity,description", rows)
+
+        expected = _load(Outflows, csv, bulk=False)
+        actual = _load(Outflows, csv, batch_size=4)
+
+        assert actual == expected
+        assert expected[1]["sales"][0][1] == 10
+
+    def test_products(self, products):
+        product = products[0]
+        rows = [
+            (
+                f"Novo {i}",
+                product.product_model.name,
+                product.category.name,
+                "desc",
+                f"SN{i}",
+                9,
+                12,
+                i,
+            )
+            for i in range(5)
+        ]
+
+        def csv():
+            return _csv(
+                "title,product_model,category,description,serial_number,"
+                "cost_price,sell_price,quantity",
+                rows,
+            )
+
+        expected = _load(Product, csv, bulk=False)
+        actual = _load(Product, csv, batch_size=2)
+
+        # Os pks de produtos novos diferem entre as execuções
+        assert actual[1]["snapshot"] == expected[1]["snapshot"]
+        assert actual[0] == expected[0] == 5
+
+    def test_bulk_path_batches_writes(self, products):
+        rows = [(products[0].title, 1, "venda") for _ in range(100)]
+
+        with CaptureQueriesContext(connection) as queries:
+            DataImportService(
+                _csv("product,quantity,description", rows), "csv"
+            ).transform_and_load(Outflows, batch_size=50)
+
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("INSERT", "UPDATE"))
+        ]
+        inserts = [sql for sql in writes if Outflows._meta.db_table in sql]
+        stock_updates = [
+            sql for sql in writes if Product._meta.db_table in sql
+        ]
+        assert len(inserts) == 2
+        assert len(stock_updates) == 2
+        products[0].refresh_from_db()
+        assert products[0].quantity == 0
+
+    def test_stock_rows_are_locked_in_pk_order(self, products):
+        rows = [(product.title, 1, "venda") for product in reversed(products)]
+
+        with CaptureQueriesContext(connection) as queries:
+            DataImportService(
+                _csv("product,quantity,description", rows), "csv"
+            ).transform_and_load(Outflows)
+
+        table = Product._meta.db_table
+        updated = [
+            int(re.search(rf'"{table}"."id" = (\d+)', query["sql"])[1])
+            for query in queries.captured_queries
+            if query["sql"].startswith(f'UPDATE "{table}"')
+        ]
+        assert updated == sorted(product.pk for product in products)
+
+    @pytest.mark.parametrize("bulk", [True, False])
+    def test_oversold_import_is_rolled_back(self, products, bulk):
+        rows = [(products[0].title, 60, "venda"), (products[1].title, 1, "x")]
+        rows.append((products[0].title, 60, "venda"))
+
+        with pytest.raises(InsufficientStockError):
+            DataImportService(
+                _csv("product,quantity,description", rows), "csv"
+            ).transform_and_load(Outflows, bulk=bulk)
+
+        assert not Outflows.objects.exists()
+        assert list(Product.objects.values_list("quantity", flat=True)) == [
+            100,
+            100,
+            100,
+        ]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestForeignKeyIndex:
+    def test_resolves_names_case_insensitively(self):
+        category = CategoryFactory(name="Eletrônicos")
+        index = ForeignKeyIndex(Category)
+
+        assert index.resolve("  eletrÔNICOS ") == category.pk
+
+    def test_resolves_pks_and_falls_back_to_title(self, products):
+        index = ForeignKeyIndex(Product)
+
+        assert index.resolve(str(products[1].pk)) == products[1].pk
+        assert index.resolve("widget 2") == products[2].pk
+
+    def test_loads_once_for_all_rows(
+        self, products, django_assert_num_queries
+    ):
+        rows = [(products[i % 3].title, 1, "venda") for i in range(30)]
+        service = DataImportService(
+            _csv("product,quantity,description", rows), "csv"
+        )
+
+        with django_assert_num_queries(1):
+            for title, quantity, description in rows:
+                service._prepare_row_data(
+                    Outflows,
+                    {
+                        "product": title,
+                        "quantity": quantity,
+                        "description": description,
+                    },
+                    None,
+                )
+
+    def test_reports_missing_and_ambiguous_names_in_one_pass(self, products):
+        ProductFactory(title="Duplicado")
+        ProductFactory(title="duplicado")
+        rows = [
+            (products[0].title, 1, "ok"),
+            ("Inexistente", 1, "falta"),
+            ("Duplicado", 1, "ambíguo"),
+        ]
+
+        with pytest.raises(ValidationError) as exc:
+            DataImportService(
+                _csv("product,quantity,description", rows), "csv"
+            ).transform_and_load(Outflows)
+
+        messages = exc.value.messages
+        assert len(messages) == 2
+        assert messages[0].startswith("Linha 2:")
+        assert "'Inexistente' não encontrado" in messages[0]
+        assert messages[1].startswith("Linha 3:")
+        assert "ambíguo" in messages[1]
+        assert not Outflows.objects.exists()
+
+
+def _xlsx(header, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+STREAMING_SOURCES = {
+    "csv": lambda: _csv(
+        "name,description", [(f"B{i}", "d") for i in range(7)]
+    ),
+    "ndjson": lambda: io.BytesIO(
+        "\n".join(
+            f'{{"name": "B{i}", "description": "d"}}' for i in range(7)
+        ).encode()
+    ),
+    "xlsx": lambda: _xlsx(
+        ["name", "description"], [(f"B{i}", "d") for i in range(7)]
+    ),
+    "xml": lambda: io.BytesIO(
+        (
+            "<?xml version='1.0'?><data>"
+            + "".join(
+                f"<row><name>B{i}</name><description>d</description></row>"
+                for i in range(7)
+            )
+            + "</data>"
+        ).encode()
+    ),
+}
+
+
+@pytest.mark.unit
+class TestStreamingExtraction:
+    @pytest.mark.parametrize("file_type", STREAMING_SOURCES)
+    def test_reads_in_chunks_with_continuous_index(self, file_type):
+        service = DataImportService(STREAMING_SOURCES[file_type](), file_type)
+
+        chunks = list(service.extract_chunks(chunk_size=3))
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+        assert [list(chunk.index) for chunk in chunks] == [
+            [0, 1, 2],
+            [3, 4, 5],
+            [6],
+        ]
+        assert list(chunks[2]["name"]) == ["B6"]
+
+    def test_json_arrays_are_sliced(self):
+        data = io.BytesIO(
+            b'[{"name": "A", "description": "d"},'
+            b' {"name": "B", "description": "d"}]'
+        )
+        service = DataImportService(data, "json")
+
+        chunks = list(service.extract_chunks(chunk_size=1))
+
+        assert [list(chunk["name"]) for chunk in chunks] == [["A"], ["B"]]
+
+    def test_unreadable_file_raises_validation_error(self):
+        service = DataImportService(io.BytesIO(b"<data><row>"), "xml")
+
+        with pytest.raises(ValidationError, match="Erro ao ler arquivo"):
+            list(service.extract_chunks())
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestChunkedLoad:
+    @pytest.mark.parametrize("file_type", STREAMING_SOURCES)
+    def test_loads_every_chunk(self, file_type):
+        service = DataImportService(STREAMING_SOURCES[file_type](), file_type)
+
+        created = service.transform_and_load(Brand, chunk_size=3)
+
+        assert created == 7
+        assert Brand.objects.count() == 7
+
+    def test_reports_progress_per_chunk(self):
+        calls = []
+        service = DataImportService(STREAMING_SOURCES["csv"](), "csv")
+
+        service.transform_and_load(
+            Brand,
+            chunk_size=3,
+            progress=lambda stage, rows: calls.append((stage, rows)),
+        )
+
+        assert calls == [
+            ("validating", 3),
+            ("validating", 6),
+            ("validating", 7),
+            ("loading", 3),
+            ("loading", 6),
+            ("loading", 7),
+        ]
+
+    def test_errors_in_later_chunks_keep_file_line_numbers(self, products):
+        rows = [(products[0].title, 1, "ok")] * 4 + [("Nope", 1, "x")]
+
+        with pytest.raises(ValidationError) as exc:
+            DataImportService(
+                _csv("product,quantity,description", rows), "csv"
+            ).transform_and_load(Outflows, chunk_size=2)
+
+        assert exc.value.messages[0].startswith("Linha 5:")
+        assert not Outflows.objects.exists()
+
+    def test_xml_values_are_converted_before_loading(self, products):
+        data = io.BytesIO(
+            b"<data><row><product>Widget 0</product>"
+            b"<quantity>4</quantity></row></data>"
+        )
+
+        DataImportService(data, "xml").transform_and_load(Outflows)
+
+        products[0].refresh_from_db()
+        assert products[0].quantity == 96
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.slow
+class TestStreamingMemory:
+    def test_peak_memory_is_bounded_by_chunk(self):
+        """Streaming holds one chunk; the full read holds the whole file."""
+        payload = _csv(
+            "name,description",
+            [(f"Brand {i}", "x" * 50) for i in range(50_000)],
+        ).getvalue()
+
+        def stream():
+            service = DataImportService(io.BytesIO(payload), "csv")
+            for _ in service.extract_chunks(chunk_size=500):
+                pass
+
+        def full_read():
+            DataImportService(io.BytesIO(payload), "csv").extract()
+
+        stream()  # warm up
+        assert _peak_memory(stream) * 4 < _peak_memory(full_read)
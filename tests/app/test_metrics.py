@@ -0,0 +1,317 @@
+"""Tests for dashboard metrics services."""
+
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import time_machine
+from django.utils import timezone
+
+from app.services import metrics, rollups
+from products.models import Product
+from tests.factories import (
+    BrandFactory,
+    CategoryFactory,
+    OutflowFactory,
+    ProductFactory,
+    ProductModelFactory,
+)
+
+
+def _bulk_products(count, quantity=2):
+    """Create products in bulk (bypassing signals) for volume tests."""
+    category = CategoryFactory()
+    product_model = ProductModelFactory()
+    Product.objects.bulk_create([
+        Product(
+            title=f"Bulk {i}",
+            product_model=product_model,
+            category=category,
+            description="bulk",
+            serial_number=f"BULK{i:06d}",
+            cost_price=Decimal("10.00"),
+            sell_price=Decimal("15.50"),
+            quantity=quantity,
+        )
+        for i in range(count)
+    ])
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestProductMetrics:
+    def test_empty_table_returns_zero(self):
+        result = metrics.get_product_metrics_raw()
+
+        assert result["total_products"] == 0
+        assert result["total_cost_price"] == "0,00"
+        assert result["total_sell_price"] == "0,00"
+        assert result["total_profit"] == "0,00"
+
+    def test_totals_are_weighted_by_quantity(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductFactory(
+                quantity=3,
+                cost_price=Decimal("10.00"),
+                sell_price=Decimal("25.00"),
+            )
+            ProductFactory(
+                quantity=2,
+                cost_price=Decimal("100.50"),
+                sell_price=Decimal("120.00"),
+            )
+
+        result = metrics.get_product_metrics_raw()
+
+        assert result["total_products"] == 5
+        assert result["total_cost_price"] == "231,00"
+        assert result["total_sell_price"] == "315,00"
+        assert result["total_profit"] == "84,00"
+
+    def test_uses_single_query(self, django_assert_num_queries):
+        _bulk_products(50)
+        rollups.rebuild_rollups()
+
+        with django_assert_num_queries(1):
+            result = metrics.get_product_metrics_raw()
+
+        assert result["total_products"] == 100
+        assert result["total_cost_price"] == "1.000,00"
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSalesMetrics:
+    def test_empty_table_returns_zero(self):
+        result = metrics.get_sales_metrics_raw()
+
+        assert result["total_sales"] == 0
+        assert result["total_product_sold"] == 0
+        assert result["total_sell_price"] == "0,00"
+        assert result["total_profit"] == "0,00"
+
+    def test_totals_use_product_prices(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            cheap = ProductFactory(
+                quantity=100,
+                cost_price=Decimal("10.00"),
+                sell_price=Decimal("12.50"),
+            )
+            expensive = ProductFactory(
+                quantity=100,
+                cost_price=Decimal("200.00"),
+                sell_price=Decimal("260.00"),
+            )
+            OutflowFactory(product=cheap, quantity=4)
+            OutflowFactory(product=expensive, quantity=2)
+
+        result = metrics.get_sales_metrics_raw()
+
+        assert result["total_sales"] == 2
+        assert result["total_product_sold"] == 6
+        assert result["total_cost_price"] == "440,00"
+        assert result["total_sell_price"] == "570,00"
+        assert result["total_profit"] == "130,00"
+
+    @pytest.mark.parametrize("outflow_count", [1, 25])
+    def test_query_count_is_constant(
+        self, outflow_count, django_assert_num_queries
+    ):
+        product = ProductFactory(quantity=1000)
+        OutflowFactory.create_batch(outflow_count, product=product)
+
+        with django_assert_num_queries(1):
+            metrics.get_sales_metrics_raw()
+
+
+def _outflow_on(day, product, quantity):
+    """Create an outflow as if it happened at midday of `day`."""
+    created_at = timezone.make_aware(
+        datetime(day.year, day.month, day.day, 12)
+    )
+    with time_machine.travel(created_at, tick=False):
+        return OutflowFactory(product=product, quantity=quantity)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSalesTimeSeries:
+    def test_default_window_is_zero_filled(self):
+        result = metrics.get_sales_time_series_raw()
+
+        today = timezone.localdate()
+        assert len(result["dates"]) == 31
+        assert result["dates"][0] == str(today - timedelta(days=30))
+        assert result["dates"][-1] == str(today)
+        assert result["values"] == [0.0] * 31
+        assert result["counts"] == [0] * 31
+
+    def test_daily_buckets_sum_value_and_count(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(quantity=100, sell_price=Decimal("10.00"))
+            today = timezone.localdate()
+            _outflow_on(today, product, 2)
+            _outflow_on(today, product, 3)
+            _outflow_on(today - timedelta(days=5), product, 1)
+            _outflow_on(today - timedelta(days=60), product, 7)
+
+        result = metrics.get_sales_time_series_raw(days=7)
+
+        assert len(result["dates"]) == 8
+        assert result["values"][-1] == 50.0
+        assert result["counts"][-1] == 2
+        assert result["values"][2] == 10.0
+        assert result["counts"][2] == 1
+        assert sum(result["counts"]) == 3
+
+    @pytest.mark.parametrize("granularity", ["week", "month"])
+    def test_coarser_granularities(
+        self, granularity, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(quantity=100, sell_price=Decimal("10.00"))
+            today = timezone.localdate()
+            _outflow_on(today, product, 1)
+            _outflow_on(today - timedelta(days=40), product, 1)
+
+        result = metrics.get_sales_time_series_raw(
+            days=90, granularity=granularity
+        )
+
+        if granularity == "week":
+            last_bucket = today - timedelta(days=today.weekday())
+        else:
+            last_bucket = today.replace(day=1)
+        assert result["dates"][-1] == str(last_bucket)
+        assert sum(result["counts"]) == 2
+        assert sum(result["values"]) == 20.0
+        assert len(result["dates"]) == len(set(result["dates"]))
+
+    @pytest.mark.parametrize(
+        ("granularity", "first_bucket", "first_day_sale"),
+        [
+            ("week", "2026-03-09", date(2026, 3, 9)),
+            ("month", "2026-02-01", date(2026, 2, 2)),
+        ],
+    )
+    def test_first_bucket_covers_a_whole_period(
+        self,
+        granularity,
+        first_bucket,
+        first_day_sale,
+        django_capture_on_commit_callbacks,
+    ):
+        """
+        The window starts at the start of the bucket holding its first day,
+        so a sale before `today - days` in that bucket still counts.
+        """
+        today = date(2026, 3, 18)
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(quantity=100, sell_price=Decimal("10.00"))
+            _outflow_on(first_day_sale, product, 1)
+            _outflow_on(today, product, 1)
+
+        with time_machine.travel(
+            timezone.make_aware(datetime(2026, 3, 18, 12)), tick=False
+        ):
+            result = metrics.get_sales_time_series_raw(
+                days=30 if granularity == "month" else 7,
+                granularity=granularity,
+            )
+
+        assert result["dates"][0] == first_bucket
+        assert result["counts"][0] == 1
+        assert result["values"][0] == 10.0
+        assert sum(result["counts"]) == 2
+
+    @pytest.mark.parametrize("days", metrics.SALES_PERIODS)
+    def test_uses_single_query(self, days, django_assert_num_queries):
+        product = ProductFactory(quantity=100)
+        _outflow_on(timezone.localdate(), product, 1)
+
+        with django_assert_num_queries(1):
+            metrics.get_sales_time_series_raw(days=days)
+
+    def test_invalid_granularity(self):
+        with pytest.raises(ValueError):
+            metrics.get_sales_time_series_raw(granularity="hour")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestProductDistribution:
+    def test_products_by_category_includes_empty_groups(self):
+        books = CategoryFactory(name="Books")
+        CategoryFactory(name="Empty")
+        ProductFactory.create_batch(2, category=books)
+
+        result = metrics.get_products_by_category_raw()
+
+        assert result == {"Books": 2, "Empty": 0}
+
+    def test_products_by_brand(self):
+        acme = BrandFactory(name="Acme")
+        BrandFactory(name="Unused")
+        ProductFactory.create_batch(
+            3, product_model=ProductModelFactory(brand=acme)
+        )
+        ProductFactory(product_model=ProductModelFactory(brand=acme))
+
+        result = metrics.get_products_by_brand_raw()
+
+        assert result == {"Acme": 4, "Unused": 0}
+
+    def test_top_n_buckets_remaining_groups(self):
+        for name, total in [("A", 5), ("B", 1), ("C", 3), ("D", 2)]:
+            ProductFactory.create_batch(
+                total, category=CategoryFactory(name=name)
+            )
+
+        result = metrics.get_products_by_category_raw(top_n=2)
+
+        assert result == {"A": 5, "C": 3, metrics.OTHERS_LABEL: 3}
+
+    def test_grouped_counts_use_single_query(self, django_assert_num_queries):
+        for _ in range(5):
+            ProductFactory()
+
+        with django_assert_num_queries(1):
+            metrics.get_products_by_category_raw()
+        with django_assert_num_queries(1):
+            metrics.get_products_by_brand_raw()
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestProductMetricsBenchmark:
+    def test_memory_is_constant_as_table_grows(self):
+        """Peak memory must not scale with the number of products."""
+        _bulk_products(10)
+        rollups.rebuild_rollups()
+        metrics.get_product_metrics_raw()  # warm up query compilation
+        small_peak = _peak_memory(metrics.get_product_metrics_raw)
+
+        _bulk_products(2000)
+        rollups.rebuild_rollups()
+        large_peak = _peak_memory(metrics.get_product_metrics_raw)
+
+        # Loading 2000 model instances would cost megabytes; the snapshot
+        # is a single row whatever the size of the table.
+        assert large_peak - small_peak < 64 * 1024
+        assert metrics.get_product_metrics_raw()["total_products"] == 4020
@@ -0,0 +1,123 @@
+"""Tests for the keyset pagination of the list APIs."""
+
+from datetime import datetime
+
+import pytest
+import time_machine
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tests.factories import InflowFactory, ProductFactory
+
+PRODUCTS_URL = reverse("product_list_create_api_view")
+INFLOWS_URL = reverse("inflow_list_create_api_view")
+
+
+def _walk(client, url, key="id"):
+    """Follow `next` links and return every page's keys."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append([item[key] for item in response.data["results"]])
+        url = response.data["next"]
+    return pages
+
+
+@pytest.mark.api
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_pages_follow_title_then_id(self, authenticated_client):
+        # Títulos repetidos: a chave (title, id) desempata
+        products = [
+            ProductFactory(title=title) for title in ["b", "a", "b", "a", "c"]
+        ]
+        expected = [
+            p.pk for p in sorted(products, key=lambda p: (p.title, p.pk))
+        ]
+
+        pages = _walk(authenticated_client, f"{PRODUCTS_URL}?page_size=2")
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sum(pages, []) == expected
+
+    def test_movements_are_newest_first_with_id_tiebreak(
+        self, authenticated_client
+    ):
+        with time_machine.travel(
+            timezone.make_aware(datetime(2026, 5, 1)), tick=False
+        ):
+            same_instant = [InflowFactory() for _ in range(3)]
+        newest = InflowFactory()
+
+        pages = _walk(authenticated_client, f"{INFLOWS_URL}?page_size=2")
+
+        assert sum(pages, []) == [
+            newest.pk,
+            *sorted((i.pk for i in same_instant), reverse=True),
+        ]
+
+    def test_previous_link_returns_the_prior_page(self, authenticated_client):
+        for index in range(5):
+            ProductFactory(title=f"p{index}")
+        first = authenticated_client.get(f"{PRODUCTS_URL}?page_size=2")
+        second = authenticated_client.get(first.data["next"])
+
+        previous = authenticated_client.get(second.data["previous"])
+
+        assert first.data["previous"] is None
+        assert previous.data["results"] == first.data["results"]
+        assert previous.data["previous"] is None
+
+    def test_page_size_is_capped(self, authenticated_client, settings):
+        settings.API_MAX_PAGE_SIZE = 3
+        ProductFactory.create_batch(5)
+
+        response = authenticated_client.get(f"{PRODUCTS_URL}?page_size=100")
+
+        assert len(response.data["results"]) == 3
+
+    def test_default_page_size(self, authenticated_client, settings):
+        settings.API_PAGE_SIZE = 2
+        ProductFactory.create_batch(3)
+
+        response = authenticated_client.get(PRODUCTS_URL)
+
+        assert len(response.data["results"]) == 2
+        assert response.data["next"]
+
+    def test_later_pages_seek_instead_of_offset(self, authenticated_client):
+        ProductFactory.create_batch(4)
+        first = authenticated_client.get(f"{PRODUCTS_URL}?page_size=2")
+
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.get(first.data["next"])
+
+        selects = [q["sql"] for q in queries if "products_product" in q["sql"]]
+        assert selects
+        assert all("OFFSET" not in sql for sql in selects)
+        # Limite isolado na primeira coluna da chave, fora do OR
+        assert any('"products_product"."title" >=' in sql for sql in selects)
+
+    def test_descending_key_bounds_leading_column(self, authenticated_client):
+        ProductFactory.create_batch(4)
+        first = authenticated_client.get(
+            f"{PRODUCTS_URL}?page_size=2&ordering=-title"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            second = authenticated_client.get(first.data["next"])
+
+        titles = [item["title"] for item in first.data["results"]]
+        titles += [item["title"] for item in second.data["results"]]
+        assert titles == sorted(titles, reverse=True)
+        assert any(
+            '"products_product"."title" <=' in q["sql"] for q in queries
+        )
+
+    def test_invalid_cursor_is_not_found(self, authenticated_client):
+        response = authenticated_client.get(f"{PRODUCTS_URL}?cursor=bogus")
+
+        assert response.status_code == 404
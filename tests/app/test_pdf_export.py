@@ -0,0 +1,202 @@
+"""Tests for the sectioned PDF export."""
+
+import io
+import time
+import tracemalloc
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from app.services import export_data
+from app.services.export_data import DataExportService, ExportRowLimitError
+from app.tasks import export_data_async
+from notifications.models import TaskNotification
+from outflows.models import Outflows
+from products.models import Product
+from tests.factories import ProductFactory, UserFactory
+
+
+def _one_page_pdf(width):
+    """A real single blank page PDF, told apart by its width."""
+    writer = PdfWriter()
+    writer.add_blank_page(width=width, height=100)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _page_widths(data):
+    return [
+        int(page.mediabox.width) for page in PdfReader(io.BytesIO(data)).pages
+    ]
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Replace WeasyPrint with a fake that records each rendered section."""
+    sections = []
+
+    class FakeHTML:
+        def __init__(self, string):
+            self.string = string
+
+        def write_pdf(self):
+            sections.append(self.string)
+            return _one_page_pdf(100 + len(sections))
+
+    monkeypatch.setattr(export_data, "HTML", FakeHTML)
+    return sections
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _weasyprint_available():
+    try:
+        from weasyprint import HTML
+
+        HTML(string="<p>ok</p>").write_pdf()
+    except Exception:
+        return False
+    return True
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSectionedPdf:
+    def test_renders_one_section_per_block_and_merges_pages(self, rendered):
+        ProductFactory.create_batch(5)
+        buffer = io.BytesIO()
+
+        count = DataExportService.write_pdf(
+            Product.objects.all(), buffer, section_rows=2
+        )
+
+        assert count == 5
+        assert len(rendered) == 3
+        assert _page_widths(buffer.getvalue()) == [101, 102, 103]
+        for title in Product.objects.values_list("title", flat=True):
+            assert sum(title in section for section in rendered) == 1
+
+    def test_title_and_footer_are_rendered_once(self, rendered):
+        ProductFactory.create_batch(3)
+
+        DataExportService.write_pdf(
+            Product.objects.all(), io.BytesIO(), section_rows=1
+        )
+
+        assert ["Lista de Produtos" in s for s in rendered] == [
+            True,
+            False,
+            False,
+        ]
+        assert ["Gerado em" in s for s in rendered] == [False, False, True]
+        assert all("<th>Cost_price</th>" in s for s in rendered)
+
+    def test_empty_queryset_renders_headers(self, rendered):
+        count = DataExportService.write_pdf(
+            Product.objects.all(), io.BytesIO()
+        )
+
+        assert count == 0
+        assert len(rendered) == 1
+        assert "<th>Title</th>" in rendered[0]
+
+    def test_row_cap_fails_before_rendering(self, rendered):
+        ProductFactory.create_batch(3)
+
+        with pytest.raises(ExportRowLimitError, match="limitada a 2"):
+            DataExportService.write_pdf(
+                Product.objects.all(), io.BytesIO(), max_rows=2
+            )
+
+        assert rendered == []
+
+    def test_task_fails_with_clear_message_over_the_cap(
+        self, rendered, settings
+    ):
+        settings.PDF_EXPORT_MAX_ROWS = 2
+        ProductFactory.create_batch(3)
+        notification = TaskNotification.objects.create(
+            user=UserFactory(),
+            task_type="export",
+            task_id="pdf-cap",
+            model_name="Product",
+            file_format="pdf",
+        )
+
+        with pytest.raises(ExportRowLimitError):
+            export_data_async.apply(args=[notification.id]).get()
+
+        notification.refresh_from_db()
+        assert notification.status == "failed"
+        assert "limitada a 2 registros (3 encontrados)" in (
+            notification.error_message
+        )
+        assert rendered == []
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    not _weasyprint_available(), reason="WeasyPrint indisponível"
+)
+class TestPdfThroughput:
+    ROWS = 2000
+
+    def _create_outflows(self, rows):
+        product = ProductFactory(quantity=rows)
+        Outflows.objects.bulk_create(
+            Outflows(product=product, quantity=1, description="saída")
+            for _ in range(rows)
+        )
+
+    def _write(self, queryset, section_rows):
+        buffer = io.BytesIO()
+        DataExportService.write_pdf(
+            queryset, buffer, section_rows=section_rows
+        )
+        assert buffer.getvalue().startswith(b"%PDF")
+
+    def _rows_per_second(self, section_rows):
+        start = time.perf_counter()
+        self._write(Outflows.objects.all(), section_rows)
+        elapsed = time.perf_counter() - start
+        return self.ROWS / elapsed
+
+    def test_sectioned_rendering_throughput(self):
+        """Rows/second of the sectioned PDF versus a single document."""
+        self._create_outflows(self.ROWS)
+
+        single = self._rows_per_second(section_rows=self.ROWS)
+        sectioned = self._rows_per_second(section_rows=250)
+
+        assert sectioned > single * 0.8
+
+    def test_sectioned_rendering_peak_memory(self):
+        """
+        Peak memory stays near one section's layout: twice the rows in
+        sections costs less than a single document with half of them.
+        """
+        self._create_outflows(self.ROWS * 2)
+        half = Outflows.objects.filter(
+            pk__in=Outflows.objects.order_by("pk")[: self.ROWS]
+        )
+
+        single = _peak_memory(lambda: self._write(half, self.ROWS))
+        sectioned = _peak_memory(
+            lambda: self._write(Outflows.objects.all(), 250)
+        )
+
+        assert sectioned < single
@@ -0,0 +1,184 @@
+"""Tests for the retention / cleanup job."""
+
+import os
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from django_celery_results.models import TaskResult
+
+from app.services import retention
+from app.tasks import cleanup_expired_data
+from notifications.models import TaskNotification
+from tests.factories import UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def _notification(age_days, status="completed", content=None, name=None):
+    notification = TaskNotification.objects.create(
+        user=UserFactory(),
+        task_type="export",
+        task_id=f"task-{TaskNotification.objects.count()}",
+        model_name="Product",
+        file_format="csv",
+        status=status,
+    )
+    if content is not None:
+        notification.file_path.save(
+            name or "export.csv", ContentFile(content), save=False
+        )
+    completed_at = timezone.now() - timedelta(days=age_days)
+    TaskNotification.objects.filter(pk=notification.pk).update(
+        file_path=notification.file_path.name or "",
+        completed_at=completed_at
+        if status in ("completed", "failed")
+        else None,
+        created_at=completed_at,
+    )
+    notification.refresh_from_db()
+    return notification
+
+
+def _exists(notification_or_name):
+    name = getattr(notification_or_name, "file_path", notification_or_name)
+    name = getattr(name, "name", name)
+    storage = TaskNotification._meta.get_field("file_path").storage
+    return storage.exists(name)
+
+
+def _touch(path, content=b"x", age_hours=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+    mtime = time.time() - age_hours * 3600
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestExpiredExports:
+    def test_removes_old_files_and_reports_bytes(self):
+        old = _notification(10, content=b"a" * 100)
+        recent = _notification(1, content=b"b" * 50)
+        old_name = old.file_path.name
+
+        result = retention.delete_expired_exports(days=7)
+
+        assert result == {"files": 1, "bytes": 100}
+        assert not _exists(old_name)
+        assert _exists(recent)
+        old.refresh_from_db()
+        assert not old.file_path
+        assert TaskNotification.objects.filter(pk=old.pk).exists()
+
+    def test_keeps_a_file_shared_with_a_recent_export(self):
+        old = _notification(10, content=b"a" * 100)
+        reused = _notification(1)
+        TaskNotification.objects.filter(pk=reused.pk).update(
+            file_path=old.file_path.name
+        )
+
+        result = retention.delete_expired_exports(days=7)
+
+        assert result == {"files": 0, "bytes": 0}
+        assert _exists(old.file_path.name)
+        reused.refresh_from_db()
+        assert reused.file_path.name == old.file_path.name
+
+    def test_deletes_in_batches(self):
+        for index in range(5):
+            _notification(10, content=b"abc", name=f"export{index}.csv")
+
+        result = retention.delete_expired_exports(days=7, batch_size=2)
+
+        assert result == {"files": 5, "bytes": 15}
+        assert not TaskNotification.objects.exclude(file_path="").exists()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestPruneRows:
+    def test_deletes_old_finished_notifications(self):
+        old = _notification(40, content=b"a" * 10)
+        failed = _notification(40, status="failed")
+        stuck = _notification(40, status="processing")
+        recent = _notification(5)
+        old_name = old.file_path.name
+
+        result = retention.prune_notifications(days=30, batch_size=2)
+
+        assert result == {"rows": 3, "files": 1, "bytes": 10}
+        assert list(TaskNotification.objects.all()) == [recent]
+        assert not _exists(old_name)
+        assert {failed.pk, stuck.pk}.isdisjoint(
+            TaskNotification.objects.values_list("pk", flat=True)
+        )
+
+    def test_deletes_old_task_results(self):
+        old = TaskResult.objects.create(task_id="old", status="SUCCESS")
+        TaskResult.objects.create(task_id="new", status="SUCCESS")
+        TaskResult.objects.filter(pk=old.pk).update(
+            date_done=timezone.now() - timedelta(days=10)
+        )
+
+        result = retention.prune_task_results(days=7, batch_size=1)
+
+        assert result == {"rows": 1}
+        assert list(TaskResult.objects.values_list("task_id", flat=True)) == [
+            "new"
+        ]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrphanTempFiles:
+    def test_removes_old_files_and_empty_directories(self, tmp_path):
+        temp = tmp_path / "temp"
+        _touch(temp / "old_upload.csv", b"a" * 20, age_hours=48)
+        _touch(temp / "new_upload.csv", b"b", age_hours=1)
+        _touch(temp / "exports" / "dead" / "part-0000.csv", b"c", 48)
+
+        result = retention.remove_orphan_temp_files(hours=24)
+
+        assert result == {"files": 2, "bytes": 21}
+        assert os.listdir(temp) == ["new_upload.csv"]
+
+    def test_keeps_shards_of_running_exports(self, tmp_path):
+        running = _notification(0, status="processing")
+        shard = tmp_path / "temp" / "exports" / running.task_id / "part.csv"
+        _touch(shard, age_hours=48)
+
+        result = retention.remove_orphan_temp_files(hours=24)
+
+        assert result == {"files": 0, "bytes": 0}
+        assert shard.exists()
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestCleanupTask:
+    def test_reports_totals(self, settings, tmp_path):
+        settings.EXPORT_RETENTION_DAYS = 7
+        settings.NOTIFICATION_RETENTION_DAYS = 30
+        _notification(10, content=b"a" * 100)
+        _notification(40, content=b"b" * 30)
+        _touch(tmp_path / "temp" / "orphan.csv", b"c" * 5, age_hours=48)
+
+        report = cleanup_expired_data.apply().get()
+
+        assert report["exports"] == {"files": 2, "bytes": 130}
+        assert report["temp_files"] == {"files": 1, "bytes": 5}
+        assert report["notifications"]["rows"] == 1
+        assert report["bytes_reclaimed"] == 135
+        assert report["rows_deleted"] == 1
+
+    def test_is_scheduled_in_beat(self, settings):
+        schedule = settings.CELERY_BEAT_SCHEDULE["cleanup-expired-data"]
+
+        assert schedule["task"] == cleanup_expired_data.name
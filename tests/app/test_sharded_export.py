@@ -0,0 +1,144 @@
+"""Tests for the sharded (parallel) CSV/NDJSON export."""
+
+import csv
+import gzip
+import io
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.celery import app as celery_app
+from app.services import sharded_export
+from app.services.export_data import DataExportService
+from app.tasks import export_data_async
+from notifications.models import TaskNotification
+from outflows.models import Outflows
+from products.models import Product
+from tests.factories import OutflowFactory, ProductFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def eager(monkeypatch):
+    """Run the chord (shards + callback) synchronously."""
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+
+def _notification(file_format, model_name="Product"):
+    return TaskNotification.objects.create(
+        user=UserFactory(),
+        task_type="export",
+        task_id=f"sharded-{file_format}",
+        model_name=model_name,
+        file_format=file_format,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestShardRanges:
+    def test_small_tables_are_not_split(self):
+        ProductFactory.create_batch(3)
+
+        ranges = sharded_export.shard_ranges(
+            Product.objects.all(), shard_rows=10
+        )
+
+        assert ranges == [(None, None)]
+
+    def test_ranges_cover_every_row_once(self):
+        ProductFactory.create_batch(10)
+        queryset = Product.objects.all()
+
+        ranges = sharded_export.shard_ranges(queryset, shard_rows=3)
+
+        sizes = [
+            sharded_export.shard_queryset(queryset, start, end).count()
+            for start, end in ranges
+        ]
+        assert len(ranges) == 4
+        assert sum(sizes) == 10
+        assert max(sizes) - min(sizes) <= 1
+
+    def test_shard_count_is_capped(self):
+        ProductFactory.create_batch(10)
+
+        ranges = sharded_export.shard_ranges(
+            Product.objects.all(), shard_rows=1, max_shards=3
+        )
+
+        assert len(ranges) == 3
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestShardedExportTask:
+    @pytest.fixture(autouse=True)
+    def shard_settings(self, settings):
+        settings.EXPORT_SHARD_ROWS = 3
+        settings.EXPORT_MAX_SHARDS = 4
+
+    def test_csv_matches_single_file_export(self, eager):
+        product = ProductFactory(title="Widget", quantity=100)
+        for _ in range(10):
+            OutflowFactory(product=product, quantity=1)
+        notification = _notification("csv", "Outflows")
+
+        result = export_data_async.apply(args=[notification.id]).get()
+
+        notification.refresh_from_db()
+        assert result == {"status": "sharded", "shards": 4}
+        assert notification.status == "completed"
+        assert notification.record_count == 10
+        with notification.file_path.open("rb") as exported:
+            sharded = gzip.decompress(exported.read()).decode()
+        single = io.StringIO(newline="")
+        DataExportService.write_csv(Outflows.objects.order_by("pk"), single)
+        assert sharded == single.getvalue()
+        assert len(list(csv.DictReader(io.StringIO(sharded)))) == 10
+
+    def test_ndjson_tracks_progress_per_shard(self, eager):
+        ProductFactory.create_batch(7)
+        notification = _notification("ndjson")
+
+        export_data_async.apply(args=[notification.id]).get()
+
+        notification.refresh_from_db()
+        with notification.file_path.open("rb") as exported:
+            lines = gzip.decompress(exported.read()).splitlines()
+        records = [json.loads(line) for line in lines]
+        assert [r["id"] for r in records] == sorted(
+            Product.objects.values_list("pk", flat=True)
+        )
+        assert notification.progress["stage"] == "completed"
+        assert notification.progress["shards"] == [
+            {"status": "completed", "rows": rows} for rows in (2, 2, 3)
+        ]
+        assert not os.path.exists(
+            sharded_export.shard_dir(notification.task_id)
+        )
+
+    def test_failed_shard_fails_notification(self, eager):
+        ProductFactory.create_batch(7)
+        notification = _notification("csv")
+
+        with (
+            patch.object(
+                sharded_export,
+                "write_shard",
+                side_effect=OSError("disco cheio"),
+            ),
+            pytest.raises(OSError),
+        ):
+            export_data_async.apply(args=[notification.id]).get()
+
+        notification.refresh_from_db()
+        assert notification.status == "failed"
+        assert notification.error_message == "disco cheio"
+        assert notification.progress["shards"][0]["status"] == "failed"
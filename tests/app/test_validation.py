@@ -0,0 +1,167 @@
+"""Tests for column-wise import validation."""
+
+import io
+import time
+from decimal import Decimal
+from unittest import mock
+
+import pandas as pd
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.validators import RegexValidator
+from django.db import models
+
+from app.services.import_data import DataImportService
+from app.services.validation import ColumnValidator, map_distinct
+from brands.models import Brand
+from outflows.models import Outflows
+from product_models.models import ProductModel
+from products.models import Product
+from tests.factories import BrandFactory, CategoryFactory, ProductFactory
+
+PRODUCT_HEADER = (
+    "title,product_model,category,description,serial_number,"
+    "cost_price,sell_price,quantity"
+)
+
+
+def _import(model_class, payload, row_by_row=False):
+    """Return the error messages of an import (and roll nothing back)."""
+    service = DataImportService(io.BytesIO(payload.encode()), "csv")
+    with mock.patch.object(
+        ColumnValidator, "supported", return_value=not row_by_row
+    ):
+        try:
+            service.transform_and_load(model_class)
+        except ValidationError as e:
+            return e.messages
+    return []
+
+
+@pytest.fixture
+def product():
+    return ProductFactory(
+        title="Widget", cost_price=Decimal("10.00"), quantity=100
+    )
+
+
+@pytest.mark.unit
+class TestMapDistinct:
+    def test_calls_once_per_distinct_value(self):
+        calls = []
+
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        result = map_distinct(
+            pd.Series([1, 2, 1, 1.0, 2], dtype=object), double
+        )
+
+        assert list(result) == [2, 4, 2, 2.0, 4]
+        assert calls == [1, 2, 1.0]
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestMessagesMatchFullClean:
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            pytest.param(["Widget,5,ok", "Widget,-1,neg"], id="positive"),
+            pytest.param(["Widget,abc,x", "Widget,,x"], id="integer"),
+            pytest.param(["Nope,1,x", "Widget,1,x"], id="missing-fk"),
+            pytest.param([",1,x"], id="null-fk"),
+        ],
+    )
+    def test_outflows(self, product, rows):
+        payload = "\n".join(["product,quantity,description", *rows])
+
+        expected = _import(Outflows, payload, row_by_row=True)
+
+        assert expected
+        assert _import(Outflows, payload) == expected
+
+    @pytest.mark.parametrize(
+        "row",
+        [
+            pytest.param(f"{'x' * 501},M,C,d,SN,1.00,2.00,1", id="max-length"),
+            pytest.param("T,M,C,d,SN,9.999,2.00,1", id="decimal-places"),
+            pytest.param("T,M,C,d,SN,123456789.00,2.00,1", id="whole-digits"),
+            pytest.param("T,M,C,,SN,abc,,1", id="blank-and-invalid"),
+            pytest.param("T,Nope,Nope,d,SN,1,2,1", id="first-fk-wins"),
+        ],
+    )
+    def test_products(self, row):
+        CategoryFactory(name="C")
+        ProductModel.objects.create(
+            name="M", brand=BrandFactory(), description="d"
+        )
+        payload = f"{PRODUCT_HEADER}\n{row}"
+
+        expected = _import(Product, payload, row_by_row=True)
+
+        assert expected
+        assert _import(Product, payload) == expected
+
+    def test_unknown_column(self):
+        payload = "name,colour\nAcme,red"
+
+        expected = _import(Brand, payload, row_by_row=True)
+
+        assert expected == ["Linha 1: Brand has no field named 'colour'"]
+        assert _import(Brand, payload) == expected
+
+    def test_valid_rows_skip_full_clean(self, product):
+        payload = "product,quantity,description\nWidget,2,ok\nWidget,3,ok"
+
+        with mock.patch.object(models.Model, "full_clean") as full_clean:
+            created = DataImportService(
+                io.BytesIO(payload.encode()), "csv"
+            ).transform_and_load(Outflows)
+
+        assert created == 2
+        full_clean.assert_not_called()
+        product.refresh_from_db()
+        assert product.quantity == 95
+
+
+@pytest.mark.unit
+class TestSupported:
+    def test_plain_models_are_supported(self):
+        for model_class in (Brand, Product, Outflows):
+            assert ColumnValidator(model_class).supported()
+
+    def test_custom_validators_fall_back_to_full_clean(self):
+        field = Brand._meta.get_field("name")
+        custom = RegexValidator(r"^[A-Z]")
+
+        with mock.patch.object(field, "validators", [custom]):
+            assert not ColumnValidator(Brand).supported()
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestValidationBenchmark:
+    def test_column_validation_is_faster_than_full_clean(self, product):
+        payload = "\n".join(
+            ["product,quantity,description"]
+            + [f"Widget,{i % 7},linha {i}" for i in range(3000)]
+        ).encode()
+
+        def elapsed(row_by_row):
+            service = DataImportService(io.BytesIO(payload), "csv")
+            errors = []
+            with mock.patch.object(
+                ColumnValidator, "supported", return_value=not row_by_row
+            ):
+                start = time.perf_counter()
+                for df in service.extract_chunks():
+                    service._build_objects(
+                        Outflows, df, None, errors, validate=True
+                    )
+                return time.perf_counter() - start
+
+        # Sem o full_clean() por linha, a validação deve ser várias vezes
+        # mais rápida (ele também consulta o banco para cada FK)
+        assert elapsed(row_by_row=False) * 3 < elapsed(row_by_row=True)
@@ -1,6 +1,9 @@
 import pytest
 from django.urls import reverse
 
+from app.services import columnar
+from notifications.models import TaskNotification
+
 
 @pytest.mark.django_db
 class TestAppViews:
@@ -13,6 +16,26 @@ class TestAppViews:
         assert "product_metrics" in response.context
         assert "sales_metrics" in response.context
 
+    def test_home_view_sales_chart_options(self, client, authenticated_user):
+        client.force_login(authenticated_user)
+        response = client.get(
+            reverse("home"), {"period": "90", "granularity": "week"}
+        )
+        assert response.status_code == 200
+        assert response.context["sales_period"] == 90
+        assert response.context["sales_granularity"] == "week"
+
+    def test_home_view_invalid_chart_options_fallback(
+        self, client, authenticated_user
+    ):
+        client.force_login(authenticated_user)
+        response = client.get(
+            reverse("home"), {"period": "abc", "granularity": "hour"}
+        )
+        assert response.status_code == 200
+        assert response.context["sales_period"] == 30
+        assert response.context["sales_granularity"] == "day"
+
     def test_home_view_anonymous(self, client):
         url = reverse("home")
         response = client.get(url)
@@ -25,3 +48,34 @@ class TestAppViews:
         response = client.get(url)
         assert response.status_code == 200
         assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.django_db
+class TestColumnarAvailability:
+    @pytest.fixture
+    def without_pyarrow(self, monkeypatch):
+        monkeypatch.setattr(columnar, "is_available", lambda: False)
+
+    def test_list_shows_parquet_button_with_pyarrow(
+        self, client, authenticated_user, monkeypatch
+    ):
+        monkeypatch.setattr(columnar, "is_available", lambda: True)
+        client.force_login(authenticated_user)
+        response = client.get(reverse("brand_list"))
+        assert b"format=parquet" in response.content
+
+    def test_list_hides_parquet_button_without_pyarrow(
+        self, client, authenticated_user, without_pyarrow
+    ):
+        client.force_login(authenticated_user)
+        response = client.get(reverse("brand_list"))
+        assert b"format=parquet" not in response.content
+        assert b"format=csv" in response.content
+
+    def test_export_rejects_columnar_without_pyarrow(
+        self, client, authenticated_user, without_pyarrow
+    ):
+        client.force_login(authenticated_user)
+        response = client.get(reverse("brand_export"), {"format": "parquet"})
+        assert response.status_code == 302
+        assert not TaskNotification.objects.exists()
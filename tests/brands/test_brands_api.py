@@ -32,7 +32,7 @@ class TestBrandListCreateAPIView:
         response = authenticated_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 5
+        assert len(response.data["results"]) == 5
 
     def test_create_brand_with_valid_data(
         self,
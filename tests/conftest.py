@@ -2,10 +2,17 @@
 
 import pytest
 from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Isolate tests from values cached by previous tests."""
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     """Return an API client instance."""
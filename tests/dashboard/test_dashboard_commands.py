@@ -0,0 +1,56 @@
+"""Tests for the dashboard rollup management commands."""
+
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from dashboard.models import DailySalesRollup, InventorySnapshot
+from tests.factories import OutflowFactory, ProductFactory
+
+
+@pytest.fixture
+def drifted_rollups():
+    """Sales and stock history whose rollups were tampered with."""
+    product = ProductFactory(
+        quantity=50,
+        cost_price=Decimal("10.00"),
+        sell_price=Decimal("12.00"),
+    )
+    OutflowFactory(product=product, quantity=5)
+    DailySalesRollup.objects.all().delete()
+    InventorySnapshot.objects.update(total_quantity=0)
+    return product
+
+
+@pytest.mark.django_db
+class TestRebuildMetricsRollups:
+    def test_rebuild_restores_rollups(self, drifted_rollups):
+        call_command("rebuild_metrics_rollups")
+
+        rollup = DailySalesRollup.objects.get(date=timezone.localdate())
+        assert rollup.sales_count == 1
+        assert rollup.quantity == 5
+        assert rollup.total_sell_price == Decimal("60.00")
+        snapshot = InventorySnapshot.objects.get()
+        assert snapshot.total_quantity == 45
+        assert snapshot.total_cost_price == Decimal("450.00")
+
+
+@pytest.mark.django_db
+class TestCheckMetricsRollups:
+    def test_consistent_rollups_pass(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            OutflowFactory(product=ProductFactory(quantity=10), quantity=1)
+
+        call_command("check_metrics_rollups")
+
+    def test_drift_is_reported(self, drifted_rollups):
+        with pytest.raises(CommandError):
+            call_command("check_metrics_rollups")
+
+    def test_fix_rebuilds_rollups(self, drifted_rollups):
+        call_command("check_metrics_rollups", "--fix")
+
+        call_command("check_metrics_rollups")
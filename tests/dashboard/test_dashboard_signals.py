@@ -0,0 +1,156 @@
+"""Tests for the incrementally maintained dashboard rollups."""
+
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from app.services import rollups
+from dashboard.models import DailySalesRollup, InventorySnapshot
+from tests.factories import InflowFactory, OutflowFactory, ProductFactory
+
+
+def _snapshot():
+    return InventorySnapshot.objects.get(pk=InventorySnapshot.SINGLETON_PK)
+
+
+@pytest.mark.signals
+@pytest.mark.django_db
+class TestInventorySnapshotSignals:
+    def test_product_creation_adds_to_snapshot(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductFactory(
+                quantity=4,
+                cost_price=Decimal("10.00"),
+                sell_price=Decimal("15.00"),
+            )
+
+        snapshot = _snapshot()
+        assert snapshot.total_quantity == 4
+        assert snapshot.total_cost_price == Decimal("40.00")
+        assert snapshot.total_sell_price == Decimal("60.00")
+
+    def test_stock_movements_update_snapshot(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(
+                quantity=0,
+                cost_price=Decimal("10.00"),
+                sell_price=Decimal("15.00"),
+            )
+
+            InflowFactory(product=product, quantity=10)
+            OutflowFactory(product=product, quantity=3)
+
+        snapshot = _snapshot()
+        assert snapshot.total_quantity == 7
+        assert snapshot.total_cost_price == Decimal("70.00")
+        assert snapshot.total_sell_price == Decimal("105.00")
+
+    def test_price_change_revalues_stock(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(
+                quantity=5,
+                cost_price=Decimal("10.00"),
+                sell_price=Decimal("15.00"),
+            )
+
+            product.sell_price = Decimal("20.00")
+            product.save()
+
+        snapshot = _snapshot()
+        assert snapshot.total_quantity == 5
+        assert snapshot.total_sell_price == Decimal("100.00")
+
+    def test_product_deletion_removes_from_snapshot(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            keep = ProductFactory(quantity=2)
+            drop = ProductFactory(quantity=3)
+
+            drop.delete()
+
+        snapshot = _snapshot()
+        assert snapshot.total_quantity == keep.quantity
+
+
+@pytest.mark.signals
+@pytest.mark.django_db
+class TestDailySalesRollupSignals:
+    def test_outflow_creation_increments_rollup(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(
+                quantity=100,
+                cost_price=Decimal("10.00"),
+                sell_price=Decimal("15.00"),
+            )
+
+            OutflowFactory(product=product, quantity=2)
+            OutflowFactory(product=product, quantity=3)
+
+        rollup = DailySalesRollup.objects.get(date=timezone.localdate())
+        assert rollup.sales_count == 2
+        assert rollup.quantity == 5
+        assert rollup.total_cost_price == Decimal("50.00")
+        assert rollup.total_sell_price == Decimal("75.00")
+
+    def test_outflow_update_adjusts_quantity_only(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            outflow = OutflowFactory(product=ProductFactory(quantity=100))
+
+            outflow.quantity = 8
+            outflow.save()
+
+        rollup = DailySalesRollup.objects.get(date=timezone.localdate())
+        assert rollup.sales_count == 1
+        assert rollup.quantity == 8
+
+    def test_outflow_deletion_decrements_rollup(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(quantity=100)
+            OutflowFactory(product=product, quantity=2)
+            outflow = OutflowFactory(product=product, quantity=3)
+
+            outflow.delete()
+
+        rollup = DailySalesRollup.objects.get(date=timezone.localdate())
+        assert rollup.sales_count == 1
+        assert rollup.quantity == 2
+
+    def test_rollups_stay_consistent_with_history(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(quantity=10)
+            InflowFactory(product=product, quantity=20)
+            OutflowFactory(product=product, quantity=4)
+            OutflowFactory(product=ProductFactory(quantity=50), quantity=1)
+
+        assert rollups.check_rollups() == []
+
+    def test_rollups_are_applied_after_commit(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks() as callbacks:
+            OutflowFactory(product=ProductFactory(quantity=10), quantity=2)
+
+        assert not DailySalesRollup.objects.exists()
+        assert not InventorySnapshot.objects.exists()
+
+        for callback in callbacks:
+            callback()
+
+        assert DailySalesRollup.objects.get().quantity == 2
+        assert _snapshot().total_quantity == 8
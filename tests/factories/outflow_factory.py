@@ -12,6 +12,7 @@ class OutflowFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = Outflows
 
-    product = factory.SubFactory(ProductFactory)
+    # Enough stock for the default outflow (overselling is rejected)
+    product = factory.SubFactory(ProductFactory, quantity=100)
     quantity = 5
     description = factory.Faker("text", max_nb_chars=200)
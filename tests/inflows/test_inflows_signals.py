@@ -2,6 +2,7 @@
 
 import pytest
 
+from products.models import Product
 from tests.factories import InflowFactory, ProductFactory, SupplierFactory
 
 
@@ -105,3 +106,33 @@ class TestInflowSignals:
         product2.refresh_from_db()
         assert product1.quantity == 15
         assert product2.quantity == 30
+
+    def test_stale_product_instances_do_not_lose_updates(self):
+        """Test inflows made through stale product copies all count."""
+        # Arrange: two copies loaded before either inflow
+        product = ProductFactory(quantity=10)
+        stale = Product.objects.get(pk=product.pk)
+        supplier = SupplierFactory()
+
+        # Act
+        InflowFactory(product=product, supplier=supplier, quantity=5)
+        InflowFactory(product=stale, supplier=supplier, quantity=7)
+
+        # Assert: the second inflow does not overwrite the first
+        product.refresh_from_db()
+        assert product.quantity == 22
+        assert stale.quantity == 22
+
+    def test_inflow_does_not_rewrite_other_product_columns(self):
+        """Test the stock update touches only quantity and updated_at."""
+        # Arrange
+        product = ProductFactory(quantity=10, title="Original")
+        Product.objects.filter(pk=product.pk).update(title="Renomeado")
+
+        # Act: the in-memory product still has the old title
+        InflowFactory(product=product, quantity=5)
+
+        # Assert
+        product.refresh_from_db()
+        assert product.title == "Renomeado"
+        assert product.quantity == 15
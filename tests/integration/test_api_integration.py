@@ -132,7 +132,7 @@ class TestAPIIntegration:
         # Read (List)
         list_response = authenticated_client.get(base_url)
         assert list_response.status_code == status.HTTP_200_OK
-        assert any(b["id"] == brand_id for b in list_response.data)
+        assert any(b["id"] == brand_id for b in list_response.data["results"])
 
         # Read (Detail)
         detail_url = reverse("brand_detail_api_view", kwargs={"pk": brand_id})
@@ -0,0 +1,169 @@
+"""Concurrency tests for stock updates (threaded ones need PostgreSQL)."""
+
+import threading
+import time
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.models import InventorySnapshot
+from inflows.models import Inflows
+from outflows.models import Outflows
+from outflows.serializers import InsufficientStockConflict, OutflowSerializer
+from products.models import Product
+from tests.factories import OutflowFactory, ProductFactory, SupplierFactory
+
+THREADS = 8
+MOVEMENTS_PER_THREAD = 25
+
+pytestmark = pytest.mark.integration
+requires_postgresql = pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="SQLite serializa as escritas; rode com POSTGRES_* definidos",
+)
+
+
+def _run_concurrently(worker):
+    """Run `worker(index)` in THREADS threads, starting them together."""
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def target(index):
+        try:
+            barrier.wait()
+            worker(index)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [
+        threading.Thread(target=target, args=(i,)) for i in range(THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+@pytest.mark.django_db
+class TestStaleStockRead:
+    def test_sale_validated_on_a_stale_stock_gets_409(self):
+        """
+        The race without threads: a sale is validated, another one empties
+        the stock, then the first is saved. The conditional UPDATE matches
+        no row and the sale is rejected with 409, keeping the stock.
+        """
+        product = ProductFactory(quantity=5)
+        serializer = OutflowSerializer(
+            data={"product": product.pk, "quantity": 5}
+        )
+        serializer.is_valid(raise_exception=True)
+        assert serializer.validated_data["product"].quantity == 5
+
+        OutflowFactory(product=product, quantity=4)
+
+        with CaptureQueriesContext(connection) as queries:
+            with pytest.raises(InsufficientStockConflict) as exc:
+                serializer.save()
+
+        assert exc.value.status_code == 409
+        product.refresh_from_db()
+        assert product.quantity == 1
+        assert Outflows.objects.filter(product=product).count() == 1
+        stock_updates = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith(f'UPDATE "{Product._meta.db_table}"')
+        ]
+        assert len(stock_updates) == 1
+        assert '"quantity" >= 5' in stock_updates[0]
+
+
+@requires_postgresql
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentStockUpdates:
+    def test_no_lost_updates_on_a_hot_product(self):
+        """Concurrent inflows and outflows on one SKU all reach the stock."""
+        product = ProductFactory(quantity=1000)
+        supplier = SupplierFactory()
+        snapshot = InventorySnapshot.objects.get().total_quantity
+
+        def worker(index):
+            # Cada thread usa sua própria cópia (desatualizada) do produto
+            copy = Product.objects.get(pk=product.pk)
+            for _ in range(MOVEMENTS_PER_THREAD):
+                if index % 2:
+                    Inflows.objects.create(
+                        product=copy, supplier=supplier, quantity=3
+                    )
+                else:
+                    Outflows.objects.create(product=copy, quantity=2)
+
+        _run_concurrently(worker)
+
+        half = THREADS // 2 * MOVEMENTS_PER_THREAD
+        expected = 1000 + half * 3 - half * 2
+        product.refresh_from_db()
+        assert product.quantity == expected
+        assert InventorySnapshot.objects.get().total_quantity == (
+            snapshot + expected - 1000
+        )
+
+
+@requires_postgresql
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestHotSkuOversell:
+    STOCK = 100
+
+    def _sell_concurrently(self, product):
+        sold = []
+        rejected = []
+
+        def worker(index):
+            for _ in range(MOVEMENTS_PER_THREAD):
+                serializer = OutflowSerializer(
+                    data={
+                        "product": product.pk,
+                        "quantity": 1,
+                        "description": f"venda {index}",
+                    }
+                )
+                serializer.is_valid(raise_exception=True)
+                try:
+                    serializer.save()
+                    sold.append(1)
+                except InsufficientStockConflict:
+                    rejected.append(1)
+
+        start = time.perf_counter()
+        _run_concurrently(worker)
+        return len(sold), len(rejected), time.perf_counter() - start
+
+    def test_concurrent_sales_never_oversell(self):
+        """Only the available units are sold; every other sale gets 409."""
+        product = ProductFactory(quantity=self.STOCK)
+
+        sold, rejected, _ = self._sell_concurrently(product)
+
+        product.refresh_from_db()
+        assert sold == self.STOCK
+        assert rejected == THREADS * MOVEMENTS_PER_THREAD - self.STOCK
+        assert product.quantity == 0
+        assert Outflows.objects.filter(product=product).count() == self.STOCK
+
+    def test_hot_sku_throughput(self):
+        """Sales/second on a single contended SKU (accepted + rejected)."""
+        product = ProductFactory(quantity=THREADS * MOVEMENTS_PER_THREAD)
+
+        sold, rejected, elapsed = self._sell_concurrently(product)
+
+        assert sold + rejected == THREADS * MOVEMENTS_PER_THREAD
+        assert elapsed > 0
+        assert rejected == 0
+        product.refresh_from_db()
+        assert product.quantity == 0
@@ -1,5 +1,8 @@
+import gzip
+
 import pytest
 from django.core.files.base import ContentFile
+from django.http import FileResponse
 from django.urls import reverse
 
 from notifications.models import TaskNotification
@@ -64,3 +67,80 @@ class TestNotificationViews:
         # Should mark as read after download
         notification.refresh_from_db()
         assert notification.is_read is True
+
+    def _compressed_export(self, user):
+        notification = TaskNotification(
+            user=user,
+            task_type="export",
+            task_id="gz",
+            model_name="Brand",
+            content_encoding="gzip",
+        )
+        notification.file_path.save(
+            "brand.csv.gz", ContentFile(gzip.compress(b"id,name\n"))
+        )
+        notification.save()
+        return reverse(
+            "notifications:notifications_download",
+            kwargs={"notification_id": notification.id},
+        )
+
+    def test_compressed_download_keeps_content_encoding(
+        self, client, authenticated_user, settings, tmp_path
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        client.force_login(authenticated_user)
+        url = self._compressed_export(authenticated_user)
+
+        response = client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+
+        body = b"".join(response.streaming_content)
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"].startswith("text/csv")
+        assert 'filename="brand.csv"' in response["Content-Disposition"]
+        assert gzip.decompress(body) == b"id,name\n"
+
+    def test_compressed_download_without_gzip_support(
+        self, client, authenticated_user, settings, tmp_path
+    ):
+        settings.MEDIA_ROOT = tmp_path
+        client.force_login(authenticated_user)
+        url = self._compressed_export(authenticated_user)
+
+        response = client.get(url, HTTP_ACCEPT_ENCODING="identity")
+
+        assert "Content-Encoding" not in response
+        assert "Content-Length" not in response
+        assert response["Content-Type"].startswith("text/csv")
+        assert 'filename="brand.csv"' in response["Content-Disposition"]
+        assert b"".join(response.streaming_content) == b"id,name\n"
+
+    def test_decompressed_download_is_streamed_in_blocks(
+        self, client, authenticated_user, settings, tmp_path
+    ):
+        """A large export reaches the client in blocks, not in one read."""
+        settings.MEDIA_ROOT = tmp_path
+        client.force_login(authenticated_user)
+        content = b"id,name\n" + b"1,Acme\n" * 50_000
+        notification = TaskNotification(
+            user=authenticated_user,
+            task_type="export",
+            task_id="gz-large",
+            model_name="Brand",
+            content_encoding="gzip",
+        )
+        notification.file_path.save(
+            "brand.csv.gz", ContentFile(gzip.compress(content))
+        )
+        notification.save()
+        url = reverse(
+            "notifications:notifications_download",
+            kwargs={"notification_id": notification.id},
+        )
+
+        response = client.get(url, HTTP_ACCEPT_ENCODING="identity")
+
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 1
+        assert max(map(len, chunks)) <= FileResponse.block_size
+        assert b"".join(chunks) == content
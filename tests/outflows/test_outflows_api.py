@@ -40,3 +40,25 @@ class TestOutflowAPI:
         response = api_client.get(url)
         assert response.status_code == 200
         assert response.data["id"] == outflow.id
+
+    def test_outflow_over_stock_returns_conflict(
+        self,
+        api_client,
+        authenticated_user,
+        product_with_stock,
+    ):
+        api_client.force_authenticate(user=authenticated_user)
+        url = reverse("outflow_list_create_api_view")
+        data = {
+            "product": product_with_stock.id,
+            "quantity": 101,
+            "description": "Oversold",
+        }
+
+        response = api_client.post(url, data)
+
+        assert response.status_code == 409
+        assert response.data["detail"].code == "insufficient_stock"
+        assert not Outflows.objects.exists()
+        product_with_stock.refresh_from_db()
+        assert product_with_stock.quantity == 100
@@ -28,7 +28,7 @@ class TestOutflowsModel:
 
     def test_outflow_str_representation(self):
         """Test outflow string representation."""
-        product = ProductFactory(title="Test Product")
+        product = ProductFactory(title="Test Product", quantity=10)
         outflow = OutflowFactory(product=product)
 
         assert str(outflow) == "Test Product"
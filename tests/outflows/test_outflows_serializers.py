@@ -1,6 +1,6 @@
 import pytest
 
-from outflows.serializers import OutflowSerializer
+from outflows.serializers import InsufficientStockConflict, OutflowSerializer
 
 
 @pytest.mark.django_db
@@ -21,3 +21,18 @@ class TestOutflowSerializers:
         serializer = OutflowSerializer(data=data)
         assert not serializer.is_valid()
         assert "quantity" in serializer.errors
+
+    def test_outflow_serializer_rejects_oversell(self, product_with_stock):
+        data = {
+            "product": product_with_stock.id,
+            "quantity": 150,
+            "description": "Description",
+        }
+        serializer = OutflowSerializer(data=data)
+        assert serializer.is_valid()
+
+        with pytest.raises(InsufficientStockConflict):
+            serializer.save()
+
+        product_with_stock.refresh_from_db()
+        assert product_with_stock.quantity == 100
@@ -1,7 +1,11 @@
 """Tests for Outflows signals - CRITICAL for inventory management."""
 
 import pytest
+from django.db import transaction
 
+from app.services.stock import InsufficientStockError
+from outflows.models import Outflows
+from products.models import Product
 from tests.factories import OutflowFactory, ProductFactory
 
 
@@ -72,19 +76,30 @@ class TestOutflowSignals:
         # Assert: Quantity should remain the same
         assert product.quantity == 90
 
-    def test_outflow_can_create_negative_stock(self):
-        """Test outflow allows negative stock
-        (business logic may need validation)."""
-        # Arrange:
-        # This tests current behavior - may need business logic to prevent
+    def test_outflow_larger_than_stock_is_rejected(self):
+        """Test outflow cannot drive stock negative."""
+        # Arrange
         product = ProductFactory(quantity=10)
 
         # Act: Create outflow larger than stock
-        OutflowFactory(product=product, quantity=30)
+        with pytest.raises(InsufficientStockError), transaction.atomic():
+            OutflowFactory(product=product, quantity=30)
 
-        # Assert: Currently allows negative (might want to add validation)
+        # Assert: Nothing was recorded
         product.refresh_from_db()
-        assert product.quantity == -20
+        assert product.quantity == 10
+        assert not Outflows.objects.filter(product=product).exists()
+
+    def test_rejected_outflow_is_not_kept_without_caller_transaction(self):
+        """An oversold create outside atomic() leaves no orphan outflow."""
+        product = ProductFactory(quantity=10)
+
+        with pytest.raises(InsufficientStockError):
+            Outflows.objects.create(product=product, quantity=30)
+
+        product.refresh_from_db()
+        assert product.quantity == 10
+        assert not Outflows.objects.filter(product=product).exists()
 
     def test_outflow_different_products_independent(self):
         """Test outflows for different products are independent."""
@@ -108,3 +123,18 @@ class TestOutflowSignals:
         # Assert
         product.refresh_from_db()
         assert product.quantity == 5000
+
+    def test_stale_product_instances_do_not_lose_updates(self):
+        """Test outflows made through stale product copies all count."""
+        # Arrange: two copies loaded before either outflow
+        product = ProductFactory(quantity=100)
+        stale = Product.objects.get(pk=product.pk)
+
+        # Act
+        OutflowFactory(product=product, quantity=10)
+        OutflowFactory(product=stale, quantity=20)
+
+        # Assert: the second outflow does not overwrite the first
+        product.refresh_from_db()
+        assert product.quantity == 70
+        assert stale.quantity == 70
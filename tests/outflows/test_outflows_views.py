@@ -3,6 +3,7 @@ from unittest.mock import patch
 import pytest
 from django.urls import reverse
 
+from outflows.forms import OutflowForm
 from outflows.models import Outflows
 
 
@@ -60,6 +61,55 @@ class TestOutflowViews:
         assert response.status_code == 302
         assert Outflows.objects.filter(description="Test Outflow").exists()
 
+    def test_outflow_create_view_over_stock_is_conflict(
+        self,
+        client,
+        authenticated_user,
+        product_with_stock,
+    ):
+        client.force_login(authenticated_user)
+        data = {
+            "product": product_with_stock.id,
+            "quantity": 101,
+            "description": "Oversold",
+        }
+
+        response = client.post(reverse("outflow_create"), data)
+
+        assert response.status_code == 409
+        assert "quantity" in response.context["form"].errors
+        assert not Outflows.objects.exists()
+
+    def test_outflow_create_view_race_is_conflict(
+        self,
+        client,
+        authenticated_user,
+        product_with_stock,
+        monkeypatch,
+    ):
+        """Stock consumed after form validation is caught by the database."""
+        client.force_login(authenticated_user)
+        monkeypatch.setattr(
+            OutflowForm,
+            "clean_quantity",
+            lambda form: form.cleaned_data["quantity"],
+        )
+        data = {
+            "product": product_with_stock.id,
+            "quantity": 101,
+            "description": "Oversold",
+        }
+
+        response = client.post(reverse("outflow_create"), data)
+
+        assert response.status_code == 409
+        assert "Quantidade em estoque: 100" in str(
+            response.context["form"].errors["quantity"]
+        )
+        assert not Outflows.objects.exists()
+        product_with_stock.refresh_from_db()
+        assert product_with_stock.quantity == 100
+
     def test_outflow_detail_view(
         self,
         client,
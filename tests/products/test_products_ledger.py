@@ -0,0 +1,252 @@
+"""Tests for the append-only stock ledger."""
+
+import io
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.services import ledger
+from app.services.import_data import DataImportService
+from app.services.stock import InsufficientStockError
+from app.tasks import create_stock_checkpoints
+from dashboard.models import InventorySnapshot
+from outflows.models import Outflows
+from products.models import Product, StockMovement
+from tests.factories import InflowFactory, OutflowFactory, ProductFactory
+
+START = timezone.make_aware(datetime(2026, 3, 1, 12, 0))
+
+
+def _kinds(product):
+    return list(
+        StockMovement.objects.filter(product=product).values_list(
+            "kind", "quantity"
+        )
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestLedgerRecording:
+    def test_every_stock_change_is_recorded(self):
+        product = ProductFactory(quantity=10)
+        InflowFactory(product=product, quantity=5)
+        outflow = OutflowFactory(product=product, quantity=3)
+
+        assert _kinds(product) == [
+            ("adjustment", 10),
+            ("inflow", 5),
+            ("outflow", -3),
+        ]
+        assert StockMovement.objects.last().source_id == outflow.pk
+        product.refresh_from_db()
+        assert ledger.on_hand(product.pk) == product.quantity == 12
+
+    def test_direct_quantity_edit_is_an_adjustment(self):
+        product = ProductFactory(quantity=10)
+
+        product.quantity = 4
+        product.save()
+        product.title = "Renomeado"
+        product.save()
+
+        assert _kinds(product) == [("adjustment", 10), ("adjustment", -6)]
+
+    def test_rejected_outflow_leaves_no_movement(self):
+        product = ProductFactory(quantity=1)
+
+        with pytest.raises(InsufficientStockError), transaction.atomic():
+            OutflowFactory(product=product, quantity=5)
+
+        assert _kinds(product) == [("adjustment", 1)]
+
+    def test_save_reads_the_previous_row_once(self):
+        product = ProductFactory(quantity=10)
+        product.quantity = 4
+
+        with CaptureQueriesContext(connection) as queries:
+            product.save()
+
+        table = Product._meta.db_table
+        selects = [
+            q["sql"]
+            for q in queries
+            if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"]
+        ]
+        assert len(selects) == 1
+        assert _kinds(product)[-1] == ("adjustment", -6)
+
+    def test_bulk_import_is_recorded(self):
+        product = ProductFactory(title="Widget", quantity=10)
+        csv = "product,quantity,description\nWidget,2,a\nWidget,3,b\n"
+
+        DataImportService(io.BytesIO(csv.encode()), "csv").transform_and_load(
+            Outflows
+        )
+
+        outflow_pks = set(Outflows.objects.values_list("pk", flat=True))
+        movements = StockMovement.objects.filter(kind="outflow")
+        assert sorted(movements.values_list("quantity", flat=True)) == [-3, -2]
+        assert set(movements.values_list("source_id", flat=True)) == (
+            outflow_pks
+        )
+        assert ledger.on_hand(product.pk) == 5
+
+    def test_movements_are_append_only(self):
+        movement = StockMovement.objects.get(
+            product=ProductFactory(quantity=1)
+        )
+
+        with pytest.raises(ValueError, match="editadas"):
+            movement.save()
+        with pytest.raises(ValueError, match="removidas"):
+            movement.delete()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestCheckpoints:
+    @staticmethod
+    def _stamp(at):
+        """Backdate the movements not stamped yet (stamps are DB time)."""
+        StockMovement.objects.filter(
+            created_at__gt=at + timedelta(days=7)
+        ).update(created_at=at)
+
+    def _history(self):
+        """Stock 10 on day 0, +5 on day 1, checkpoint, -3 on day 2."""
+        product = ProductFactory(quantity=10)
+        self._stamp(START)
+        InflowFactory(product=product, quantity=5)
+        assert ledger.create_checkpoints() == 1
+        self._stamp(START + timedelta(days=1))
+        OutflowFactory(product=product, quantity=3)
+        self._stamp(START + timedelta(days=2))
+        return product
+
+    def test_checkpoint_holds_the_balance(self):
+        product = self._history()
+
+        checkpoint = StockMovement.objects.get(kind="checkpoint")
+        assert checkpoint.balance == 15
+        assert checkpoint.product == product
+
+    def test_on_hand_at_any_time(self):
+        product = self._history()
+
+        assert ledger.on_hand(product.pk, START - timedelta(hours=1)) == 0
+        assert ledger.on_hand(product.pk, START) == 10
+        assert ledger.on_hand(product.pk, START + timedelta(days=1)) == 15
+        assert ledger.on_hand(product.pk, START + timedelta(days=3)) == 12
+
+    def test_on_hand_reads_from_the_last_checkpoint(self):
+        product = self._history()
+
+        with CaptureQueriesContext(connection) as queries:
+            ledger.on_hand(product.pk)
+
+        assert len(queries) == 2
+        assert "checkpoint" in queries[0]["sql"]
+
+    def test_only_products_with_new_movements_get_checkpoints(self):
+        product = self._history()
+        idle = ProductFactory(quantity=0)
+
+        created = ledger.create_checkpoints()
+
+        assert created == 1
+        assert list(
+            StockMovement.objects.filter(kind="checkpoint").values_list(
+                "product", "balance"
+            )
+        ) == [(product.pk, 15), (product.pk, 12)]
+        assert not StockMovement.objects.filter(product=idle).exists()
+        assert ledger.create_checkpoints() == 0
+
+    def test_late_commit_before_the_checkpoint_time_is_counted(self):
+        product = ProductFactory(quantity=10)
+        ledger.create_checkpoints()
+        checkpoint = StockMovement.objects.get(kind="checkpoint")
+
+        InflowFactory(product=product, quantity=5)
+        # Gravada antes do checkpoint, mas visível só depois (commit tardio
+        # ou relógio adiantado): o pk maior garante que ela seja somada
+        StockMovement.objects.filter(kind="inflow").update(
+            created_at=checkpoint.created_at - timedelta(seconds=1)
+        )
+
+        assert ledger.on_hand(product.pk) == 15
+        assert ledger.check_ledger() == []
+        assert ledger.create_checkpoints() == 1
+        assert (
+            StockMovement.objects.filter(kind="checkpoint").last().balance
+            == 15
+        )
+
+    def test_checkpoint_task(self):
+        ProductFactory.create_batch(2, quantity=3)
+
+        assert create_stock_checkpoints.apply().get() == {"checkpoints": 2}
+
+
+@pytest.mark.django_db
+class TestReconcileStockLedger:
+    @pytest.fixture
+    def drifted(self, django_capture_on_commit_callbacks):
+        """A product whose quantity was changed behind the ledger's back."""
+        with django_capture_on_commit_callbacks(execute=True):
+            product = ProductFactory(
+                quantity=10,
+                cost_price=Decimal("2.00"),
+                sell_price=Decimal("3.00"),
+            )
+            OutflowFactory(product=product, quantity=4)
+        Product.objects.filter(pk=product.pk).update(quantity=1)
+        return product
+
+    def test_consistent_ledger_passes(self):
+        InflowFactory(product=ProductFactory(quantity=2), quantity=3)
+
+        call_command("reconcile_stock_ledger")
+
+    def test_drift_is_reported(self, drifted):
+        stderr = io.StringIO()
+
+        with pytest.raises(CommandError, match="1 divergência"):
+            call_command("reconcile_stock_ledger", stderr=stderr)
+
+        assert "estoque 1, livro-razão 6" in stderr.getvalue()
+
+    def test_fix_restores_quantity_from_the_ledger(
+        self, drifted, django_capture_on_commit_callbacks
+    ):
+        snapshot = InventorySnapshot.objects.get().total_quantity
+
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("reconcile_stock_ledger", "--fix")
+
+        drifted.refresh_from_db()
+        assert drifted.quantity == 6
+        assert InventorySnapshot.objects.get().total_quantity == snapshot + 5
+        assert ledger.check_ledger() == []
+
+    def test_fix_trusting_products_appends_an_adjustment(self, drifted):
+        call_command("reconcile_stock_ledger", "--fix", "--trust", "product")
+
+        drifted.refresh_from_db()
+        assert drifted.quantity == 1
+        assert _kinds(drifted)[-1] == ("adjustment", -5)
+        assert ledger.check_ledger() == []
+
+    def test_checkpoint_option(self):
+        ProductFactory(quantity=2)
+        stdout = io.StringIO()
+
+        call_command("reconcile_stock_ledger", "--checkpoint", stdout=stdout)
+
+        assert "1 checkpoint(s)" in stdout.getvalue()